@@ -8,12 +8,343 @@ import random
 from pathlib import Path
 import re
 
+from .emergency import EMERGENCY_KEYWORDS, EMERGENCY_MESSAGE
+from .fragments import FragmentCache
+from .fuzzy_index import EntityResolver
+from .keyword_matcher import KeywordMatcher
+from .knowledge_store import get_knowledge_store
+from .tracing import traced_action
+
+# Shared across every action; parses medical_knowledge.json once per change
+knowledge_store = get_knowledge_store()
+
+# Every keyword list used for routing, compiled into one automaton below
+KEYWORD_TABLES = {
+    'info.rash': ['rash', 'itching', 'skin'],
+    'info.antibiotic': ['antibiotic', 'medicine', 'medication'],
+    'vaccine.covid': ['covid', 'corona', 'sars'],
+    'vaccine.flu': ['flu', 'influenza'],
+    'vaccine.hepatitis': ['hepatitis', 'hep b'],
+    'diet.diabetes': ['diabet', 'blood sugar', 'sugar'],
+    'diet.heart': ['heart', 'cardio', 'cholesterol', 'blood pressure'],
+    'diet.weight': ['weight', 'obesity', 'overweight', 'bmi'],
+    'diet.celiac': ['celiac', 'gluten'],
+    'prevention.diabetes': ['diabet', 'blood sugar'],
+    'prevention.heart': ['heart', 'cardio', 'cholesterol'],
+    'prevention.cancer': ['cancer'],
+    'prevention.infection': ['infection', 'virus', 'bacteria'],
+    'emergency': EMERGENCY_KEYWORDS,
+}
+
+keyword_matcher = KeywordMatcher(KEYWORD_TABLES)
+
+DISCLAIMER_INFO = "⚠️ *This is general health information. Always consult healthcare professionals for medical advice.*"
+
+ANTIBIOTIC_INFO = (
+    "**Antibiotics**:\n"
+    "• Must be prescribed by a healthcare professional\n"
+    "• Complete the full course as directed\n"
+    "• Don't share antibiotics with others\n"
+    "• Report any side effects to your doctor\n\n"
+)
+
+DESCRIBE_CONCERNS = (
+    "I understand you have health concerns. Please describe:\n\n"
+    "• Your specific symptoms\n"
+    "• How long you've had them\n"
+    "• Any other relevant details\n\n"
+    "This will help me provide more accurate information."
+)
+
+VACCINE_MENU = (
+    "**Available Vaccine Information**:\n"
+    "• **COVID-19** - mRNA and protein-based options\n"
+    "• **Influenza (Flu)** - Annual seasonal protection\n"
+    "• **Hepatitis B** - 3-dose series for liver protection\n"
+    "• **Other routine vaccines** (MMR, Tdap, etc.)\n\n"
+    "Which specific vaccine would you like detailed information about?"
+)
+
+VACCINE_GUIDANCE = (
+    "📋 **General Vaccine Guidance**:\n"
+    "• Discuss with your healthcare provider about recommended vaccines\n"
+    "• Keep a vaccination record\n"
+    "• Report any adverse reactions\n"
+    "• Stay informed about booster recommendations\n\n"
+    "⚠️ *Vaccine recommendations may vary based on age, health conditions, and location. Consult healthcare providers for personalized advice.*"
+)
+
+SYMPTOM_NEXT_STEPS = (
+    "**Next Steps**:\n"
+    "• Monitor symptom severity and duration\n"
+    "• Note any new or worsening symptoms\n"
+    "• Keep a symptom diary if persistent\n"
+    "• Seek medical advice for proper evaluation\n\n"
+)
+
+SYMPTOM_PROMPT = (
+    "**Please describe your symptoms for assessment**:\n\n"
+    "📝 **Include details about**:\n"
+    "• Specific symptoms you're experiencing\n"
+    "• When they started and how long they've lasted\n"
+    "• Severity (mild, moderate, severe)\n"
+    "• Any triggers or patterns you've noticed\n"
+    "• Other symptoms occurring together\n\n"
+    "💡 **Example**: 'I've had fever and headache for 2 days, with body aches.'\n\n"
+)
+
+SYMPTOM_RED_FLAGS = (
+    "🚨 **RED FLAG - Seek IMMEDIATE Medical Attention for**:\n"
+    "• Chest pain or pressure\n• Difficulty breathing\n• Severe bleeding\n• Sudden weakness or numbness\n"
+    "• Confusion or loss of consciousness\n• Severe pain anywhere\n• High fever with stiff neck\n"
+    "• Suicidal or homicidal thoughts\n\n"
+    "⚠️ *This symptom checker provides general guidance only. It is not a substitute for professional medical evaluation, diagnosis, or treatment.*"
+)
+
+DIET_MENU = (
+    "**Specialized Dietary Guidance Available**:\n"
+    "• **Diabetes management** - Blood sugar control\n"
+    "• **Heart health** - Cholesterol and blood pressure focus\n"
+    "• **Weight management** - Healthy weight achievement\n"
+    "• **Celiac disease** - Strict gluten-free approach\n"
+    "• **General healthy eating** - Balanced nutrition\n\n"
+    "Which specific dietary area would you like information about?"
+)
+
+DIET_PRINCIPLES = (
+    "📋 **Universal Healthy Eating Principles**:\n"
+    "• Fill half your plate with fruits and vegetables\n"
+    "• Choose whole grains over refined grains\n"
+    "• Include lean protein sources\n"
+    "• Stay well hydrated with water\n"
+    "• Limit processed foods and added sugars\n"
+    "• Practice mindful eating and portion awareness\n\n"
+    "⚠️ *For personalized dietary plans, consult a registered dietitian or nutritionist who can consider your individual health needs and preferences.*"
+)
+
+PREVENTION_MENU = (
+    "**Major Areas of Prevention**:\n"
+    "• **Diabetes** - Weight management and healthy lifestyle\n"
+    "• **Heart Disease** - Blood pressure control and exercise\n"
+    "• **Cancer** - Avoid carcinogens and regular screening\n"
+    "• **Infections** - Hygiene and immunization\n\n"
+    "Which specific prevention area interests you?"
+)
+
+PREVENTION_MAINTENANCE = (
+    "💡 **Proactive Health Maintenance**:\n"
+    "• Schedule regular health check-ups\n"
+    "• Know your family health history\n"
+    "• Stay current with age-appropriate screenings\n"
+    "• Maintain mental and emotional wellness\n"
+    "• Build healthy relationships and support systems\n\n"
+    "🌟 *Prevention is the most effective healthcare strategy. Small, consistent healthy choices create significant long-term benefits!*"
+)
+
+
+def first_field(info, *names, default=''):
+    """Return the first populated field, since symptom entries use different keys"""
+    for name in names:
+        if info.get(name):
+            return info[name]
+    return default
+
+
+def render_symptom_info(knowledge, symptom, limit):
+    """Symptom block for ActionProvideMedicalInfo"""
+    info = knowledge['symptoms'].get(symptom)
+    if info is None:
+        return None
+    causes = first_field(info, 'possible_causes', 'types', default=())
+    care = first_field(info, 'first_aid', 'relief', 'remedies', 'management', default=())
+    return "".join([
+        f"**{symptom.title()}**:\n",
+        f"• {info.get('description', '')}\n",
+        f"• Possible causes: {', '.join(causes[:limit])}\n",
+        f"• Immediate care: {', '.join(care[:limit])}\n",
+        f"• When to see doctor: {first_field(info, 'when_to_see_doctor', 'emergency_signs', 'warning_signs')}\n\n",
+    ])
+
+
+def render_symptom_check(knowledge, symptom, limit):
+    """Symptom block for ActionSymptomChecker"""
+    info = knowledge['symptoms'].get(symptom)
+    if info is None:
+        return None
+    care = first_field(info, 'first_aid', 'relief', 'remedies', 'management', default=())
+    return "".join([
+        f"**{symptom.title()}**:\n",
+        f"• Description: {info.get('description', '')}\n",
+        f"• Self-care: {', '.join(care[:limit])}\n",
+        f"• Medical attention: {first_field(info, 'when_to_see_doctor', 'emergency_signs', 'warning_signs')}\n\n",
+    ])
+
+
+def render_condition_info(knowledge, disease, limit):
+    """Condition block for ActionProvideMedicalInfo"""
+    prevention_info = knowledge['disease_prevention'].get('specific', {}).get(disease)
+    if prevention_info is None:
+        return None
+    return "".join([
+        f"**{disease.title()}**:\n",
+        f"• Prevention: {prevention_info}\n",
+        "• Consultation: Please see a healthcare provider for diagnosis and treatment.\n\n",
+    ])
+
+
+def render_vaccine(knowledge, key, limit):
+    """Vaccine block for ActionVaccineInfo"""
+    vax_info = knowledge['vaccinations'].get(key)
+    if vax_info is None:
+        return None
+    if key == 'covid_19':
+        return "".join([
+            "**COVID-19 Vaccines** 🦠\n",
+            f"• **Types**: {', '.join(vax_info.get('types', ()))}\n",
+            f"• **Schedule**: {vax_info.get('schedule', '')}\n",
+            f"• **Common side effects**: {', '.join(vax_info.get('side_effects', ()))}\n",
+            f"• **Effectiveness**: {vax_info.get('effectiveness', '')}\n",
+            "• **Recommendation**: CDC recommends staying up-to-date with boosters\n\n",
+        ])
+    if key == 'influenza':
+        return "".join([
+            "**Influenza (Flu) Vaccine** 🤧\n",
+            f"• **Recommendation**: {vax_info.get('recommendation', '')}\n",
+            f"• **Types**: {', '.join(vax_info.get('types', ()))}\n",
+            f"• **Best timing**: {vax_info.get('best_time', '')}\n",
+            "• **Importance**: Reduces flu severity and prevents complications\n\n",
+        ])
+    if key == 'hepatitis_b':
+        return "".join([
+            "**Hepatitis B Vaccine** 🩺\n",
+            f"• **Schedule**: {vax_info.get('schedule', '')}\n",
+            f"• **Recommended for**: {', '.join(vax_info.get('recommended_for', ())[:3])}\n",
+            f"• **Effectiveness**: {vax_info.get('effectiveness', '')}\n",
+            "• **Protection**: Prevents liver infection and long-term complications\n\n",
+        ])
+    return None
+
+
+def render_diet(knowledge, key, limit):
+    """Diet block for ActionDietAdvice"""
+    diet_info = knowledge['diet_plans'].get(key)
+    if diet_info is None:
+        return None
+    if key == 'diabetes':
+        return "".join([
+            "**Diabetes-Friendly Diet** 🩸\n",
+            f"• **Focus**: {diet_info.get('focus', '')}\n",
+            f"• **Foods to emphasize**: {', '.join(diet_info.get('foods_to_eat', ())[:4])}\n",
+            f"• **Foods to limit**: {', '.join(diet_info.get('foods_to_limit', ())[:3])}\n",
+            f"• **Meal timing**: {diet_info.get('meal_timing', '')}\n",
+            "• **Key tips**: Balance carbohydrates, monitor portions, stay consistent\n\n",
+        ])
+    if key == 'heart_health':
+        return "".join([
+            "**Heart-Healthy Diet** ❤️\n",
+            f"• **Focus**: {diet_info.get('focus', '')}\n",
+            f"• **Beneficial foods**: {', '.join(diet_info.get('foods_to_eat', ())[:4])}\n",
+            f"• **Foods to minimize**: {', '.join(diet_info.get('foods_to_avoid', ())[:3])}\n",
+            f"• **Lifestyle integration**: {diet_info.get('lifestyle', '')}\n",
+            "• **Additional benefits**: Supports healthy weight and blood pressure\n\n",
+        ])
+    if key == 'weight_management':
+        return "".join([
+            "**Weight Management Nutrition** ⚖️\n",
+            f"• **Basic principle**: {diet_info.get('principle', '')}\n",
+            f"• **Key strategies**: {', '.join(diet_info.get('recommendations', ())[:3])}\n",
+            f"• **Helpful tips**: {', '.join(diet_info.get('tips', ())[:2])}\n",
+            "• **Sustainable approach**: Focus on long-term habits, not quick fixes\n\n",
+        ])
+    if key == 'celiac_disease':
+        return "".join([
+            "**Gluten-Free Diet for Celiac Disease** 🌾\n",
+            f"• **Essential focus**: {diet_info.get('focus', '')}\n",
+            f"• **Safe foods**: {', '.join(diet_info.get('foods_to_eat', ())[:4])}\n",
+            f"• **Strictly avoid**: {', '.join(diet_info.get('foods_to_avoid', ())[:3])}\n",
+            f"• **Critical consideration**: {diet_info.get('important', '')}\n",
+            "• **Additional note**: Requires careful label reading and kitchen practices\n\n",
+        ])
+    return None
+
+
+def render_prevention_general(knowledge, key, limit):
+    """Numbered general prevention tips for ActionDiseasePrevention"""
+    tips = knowledge['disease_prevention'].get('general', ())[:limit]
+    lines = ["**Essential Prevention Practices** 🌟\n"]
+    lines.extend(f"{i}. {tip}\n" for i, tip in enumerate(tips, 1))
+    return "".join(lines)
+
+
+def render_prevention(knowledge, key, limit):
+    """Condition-specific block for ActionDiseasePrevention"""
+    specific = knowledge['disease_prevention'].get('specific', {}).get(key, '')
+    if key == 'diabetes':
+        return "".join([
+            "**Diabetes Prevention** 🩸\n",
+            f"{specific}\n",
+            "• **Key focus**: Maintain healthy weight through diet and exercise\n",
+            "• **Monitoring**: Regular blood sugar checks if at risk\n",
+            "• **Lifestyle**: Balanced nutrition and physical activity\n\n",
+        ])
+    if key == 'heart_disease':
+        return "".join([
+            "**Heart Disease Prevention** ❤️\n",
+            f"{specific}\n",
+            "• **Critical factors**: Blood pressure and cholesterol management\n",
+            "• **Lifestyle**: Regular exercise and smoke-free environment\n",
+            "• **Diet**: Low sodium, healthy fats, plenty of fruits/vegetables\n\n",
+        ])
+    if key == 'cancer':
+        return "".join([
+            "**Cancer Prevention** 🎗️\n",
+            f"{specific}\n",
+            "• **Primary prevention**: Avoid tobacco and limit alcohol\n",
+            "• **Early detection**: Regular screenings as recommended\n",
+            "• **Healthy habits**: Sun protection and balanced nutrition\n\n",
+        ])
+    if key == 'infections':
+        return "".join([
+            "**Infectious Disease Prevention** 🦠\n",
+            f"{specific}\n",
+            "• **Hygiene**: Proper handwashing and food safety\n",
+            "• **Immunization**: Stay up-to-date with vaccinations\n",
+            "• **Awareness**: Avoid close contact when sick\n\n",
+        ])
+    return None
+
+
+fragment_cache = FragmentCache(knowledge_store)
+fragment_cache.register('symptom_info', render_symptom_info, lambda k: k['symptoms'], limits=(2,))
+fragment_cache.register('symptom_check', render_symptom_check, lambda k: k['symptoms'], limits=(2,))
+fragment_cache.register('condition_info', render_condition_info,
+                        lambda k: k['disease_prevention'].get('specific', {}))
+fragment_cache.register('vaccine', render_vaccine, lambda k: k['vaccinations'])
+fragment_cache.register('diet', render_diet, lambda k: k['diet_plans'])
+fragment_cache.register('prevention_general', render_prevention_general, lambda k: ('general',), limits=(8,))
+fragment_cache.register('prevention', render_prevention,
+                        lambda k: ('diabetes', 'heart_disease', 'cancer', 'infections'))
+
+# Resolves misspelled or inflected entity values to knowledge keys
+entity_resolver = EntityResolver(knowledge_store)
+
+
+def resolve_entities(values, resolve):
+    """Map raw entity values to knowledge keys, keeping unknown values and order"""
+    resolved = []
+    for value in values:
+        key = resolve(value) or value
+        if key not in resolved:
+            resolved.append(key)
+    return resolved
+
 class ActionSessionStart(Action):
     """Action to handle session start"""
     
     def name(self) -> Text:
         return "action_session_start"
 
+    @traced_action
     async def run(
         self, dispatcher: CollectingDispatcher, tracker: Tracker, domain: Dict[Text, Any]
     ) -> List[Dict[Text, Any]]:
@@ -33,388 +364,229 @@ class ActionSessionStart(Action):
 
 class ActionProvideMedicalInfo(Action):
     """Provide general medical information with enhanced responses"""
-    
+
     def name(self) -> Text:
         return "action_provide_medical_info"
 
-    def run(self, dispatcher: CollectingDispatcher,
-            tracker: Tracker,
-            domain: Dict[Text, Any]) -> List[Dict[Text, Any]]:
-        
-        # Load medical knowledge
-        knowledge = self.load_medical_knowledge()
-        
+    @traced_action
+    async def run(self, dispatcher: CollectingDispatcher,
+                  tracker: Tracker,
+                  domain: Dict[Text, Any]) -> List[Dict[Text, Any]]:
+
+        await fragment_cache.arefresh()
+        await entity_resolver.arefresh()
+
         # Get entities from the message
-        symptoms = list(tracker.get_latest_entity_values("symptom") or [])
-        diseases = list(tracker.get_latest_entity_values("disease") or [])
+        symptoms = resolve_entities(tracker.get_latest_entity_values("symptom") or [], entity_resolver.symptom)
+        diseases = resolve_entities(tracker.get_latest_entity_values("disease") or [], entity_resolver.disease)
         body_parts = list(tracker.get_latest_entity_values("body_part") or [])
         treatments = list(tracker.get_latest_entity_values("treatment") or [])
-        
-        user_message = tracker.latest_message.get('text', '').lower()
-        
+
+        matches = keyword_matcher.match(tracker.latest_message.get('text', ''))
+
         # Check for specific conditions in the message
-        if any(word in user_message for word in ['rash', 'itching', 'skin']):
+        if 'info.rash' in matches and 'rash' not in symptoms:
             symptoms.append('rash')
-        if any(word in user_message for word in ['antibiotic', 'medicine', 'medication']):
+        if 'info.antibiotic' in matches:
             treatments.append('antibiotic')
-        
-        response = ""
-        
+
+        parts = []
+
         if symptoms:
-            response += "🔍 **Symptom Information**\n\n"
+            parts.append("🔍 **Symptom Information**\n\n")
             for symptom in symptoms[:3]:  # Limit to 3 symptoms
-                if symptom in knowledge['symptoms']:
-                    info = knowledge['symptoms'][symptom]
-                    response += f"**{symptom.title()}**:\n"
-                    response += f"• {info['description']}\n"
-                    response += f"• Possible causes: {', '.join(info['possible_causes'][:2])}\n"
-                    response += f"• Immediate care: {', '.join(info['first_aid'][:2])}\n"
-                    response += f"• When to see doctor: {info['when_to_see_doctor']}\n\n"
-                else:
-                    response += f"**{symptom.title()}**: General symptom information - monitor and consult a doctor if persistent.\n\n"
-        
+                fragment = fragment_cache.get('symptom_info', symptom, 2)
+                if fragment is None:
+                    fragment = f"**{symptom.title()}**: General symptom information - monitor and consult a doctor if persistent.\n\n"
+                parts.append(fragment)
+
         if diseases:
-            response += "\n🏥 **Condition Information**\n\n"
+            parts.append("\n🏥 **Condition Information**\n\n")
             for disease in diseases[:2]:
-                if disease in knowledge.get('disease_prevention', {}).get('specific', {}):
-                    prevention_info = knowledge['disease_prevention']['specific'][disease]
-                    response += f"**{disease.title()}**:\n"
-                    response += f"• Prevention: {prevention_info}\n"
-                    response += "• Consultation: Please see a healthcare provider for diagnosis and treatment.\n\n"
-        
+                fragment = fragment_cache.get('condition_info', disease)
+                if fragment is not None:
+                    parts.append(fragment)
+
         if treatments:
-            response += "\n💊 **Treatment Information**\n\n"
+            parts.append("\n💊 **Treatment Information**\n\n")
             if 'antibiotic' in treatments:
-                response += "**Antibiotics**:\n"
-                response += "• Must be prescribed by a healthcare professional\n"
-                response += "• Complete the full course as directed\n"
-                response += "• Don't share antibiotics with others\n"
-                response += "• Report any side effects to your doctor\n\n"
-        
-        if not response:
-            response = (
-                "I understand you have health concerns. Please describe:\n\n"
-                "• Your specific symptoms\n" 
-                "• How long you've had them\n"
-                "• Any other relevant details\n\n"
-                "This will help me provide more accurate information."
-            )
+                parts.append(ANTIBIOTIC_INFO)
+
+        if not parts:
+            response = DESCRIBE_CONCERNS
         else:
-            response += "⚠️ *This is general health information. Always consult healthcare professionals for medical advice.*"
-        
+            parts.append(DISCLAIMER_INFO)
+            response = "".join(parts)
+
         dispatcher.utter_message(text=response)
-        
+
         # Set slots for future context
         slots = []
         if symptoms:
             slots.append(SlotSet("symptom_slot", symptoms[0]))
         if diseases:
             slots.append(SlotSet("disease_slot", diseases[0]))
-            
+
         return slots
 
 class ActionVaccineInfo(Action):
     """Provide comprehensive vaccine information"""
-    
+
     def name(self) -> Text:
         return "action_vaccine_info"
 
-    def run(self, dispatcher: CollectingDispatcher,
-            tracker: Tracker,
-            domain: Dict[Text, Any]) -> List[Dict[Text, Any]]:
-        
-        knowledge = self.load_medical_knowledge()
-        vaccines = knowledge['vaccinations']
-        
-        message = tracker.latest_message.get('text', '').lower()
-        response = "💉 **Vaccine Information Center**\n\n"
-        
+    @traced_action
+    async def run(self, dispatcher: CollectingDispatcher,
+                  tracker: Tracker,
+                  domain: Dict[Text, Any]) -> List[Dict[Text, Any]]:
+
+        await fragment_cache.arefresh()
+
+        matches = keyword_matcher.match(tracker.latest_message.get('text', ''))
+        parts = ["💉 **Vaccine Information Center**\n\n"]
+
         # Check for specific vaccine mentions with better matching
-        if any(word in message for word in ['covid', 'corona', 'sars']):
-            vax_info = vaccines['covid_19']
-            response += "**COVID-19 Vaccines** 🦠\n"
-            response += f"• **Types**: {', '.join(vax_info['types'])}\n"
-            response += f"• **Schedule**: {vax_info['schedule']}\n"
-            response += f"• **Common side effects**: {', '.join(vax_info['side_effects'])}\n"
-            response += f"• **Effectiveness**: {vax_info['effectiveness']}\n"
-            response += "• **Recommendation**: CDC recommends staying up-to-date with boosters\n\n"
-        
-        elif any(word in message for word in ['flu', 'influenza']):
-            vax_info = vaccines['influenza']
-            response += "**Influenza (Flu) Vaccine** 🤧\n"
-            response += f"• **Recommendation**: {vax_info['recommendation']}\n"
-            response += f"• **Types**: {', '.join(vax_info['types'])}\n"
-            response += f"• **Best timing**: {vax_info['best_time']}\n"
-            response += "• **Importance**: Reduces flu severity and prevents complications\n\n"
-        
-        elif any(word in message for word in ['hepatitis', 'hep b']):
-            vax_info = vaccines['hepatitis_b']
-            response += "**Hepatitis B Vaccine** 🩺\n"
-            response += f"• **Schedule**: {vax_info['schedule']}\n"
-            response += f"• **Recommended for**: {', '.join(vax_info['recommended_for'][:3])}\n"
-            response += f"• **Effectiveness**: {vax_info['effectiveness']}\n"
-            response += "• **Protection**: Prevents liver infection and long-term complications\n\n"
-        
+        if 'vaccine.covid' in matches:
+            parts.append(fragment_cache.get('vaccine', 'covid_19') or "")
+        elif 'vaccine.flu' in matches:
+            parts.append(fragment_cache.get('vaccine', 'influenza') or "")
+        elif 'vaccine.hepatitis' in matches:
+            parts.append(fragment_cache.get('vaccine', 'hepatitis_b') or "")
         else:
-            response += "**Available Vaccine Information**:\n"
-            response += "• **COVID-19** - mRNA and protein-based options\n"
-            response += "• **Influenza (Flu)** - Annual seasonal protection\n" 
-            response += "• **Hepatitis B** - 3-dose series for liver protection\n"
-            response += "• **Other routine vaccines** (MMR, Tdap, etc.)\n\n"
-            response += "Which specific vaccine would you like detailed information about?"
-        
-        response += "📋 **General Vaccine Guidance**:\n"
-        response += "• Discuss with your healthcare provider about recommended vaccines\n"
-        response += "• Keep a vaccination record\n"
-        response += "• Report any adverse reactions\n"
-        response += "• Stay informed about booster recommendations\n\n"
-        
-        response += "⚠️ *Vaccine recommendations may vary based on age, health conditions, and location. Consult healthcare providers for personalized advice.*"
-        
-        dispatcher.utter_message(text=response)
+            parts.append(VACCINE_MENU)
+
+        parts.append(VACCINE_GUIDANCE)
+
+        dispatcher.utter_message(text="".join(parts))
         return [SlotSet("last_topic", "vaccines")]
 
 class ActionSymptomChecker(Action):
     """Provide comprehensive symptom checking guidance"""
-    
+
     def name(self) -> Text:
         return "action_symptom_checker"
 
-    def run(self, dispatcher: CollectingDispatcher,
-            tracker: Tracker,
-            domain: Dict[Text, Any]) -> List[Dict[Text, Any]]:
-        
-        knowledge = self.load_medical_knowledge()
-        symptoms = list(tracker.get_latest_entity_values("symptom") or [])
-        
-        response = "🔍 **Symptom Assessment Guide**\n\n"
-        
+    @traced_action
+    async def run(self, dispatcher: CollectingDispatcher,
+                  tracker: Tracker,
+                  domain: Dict[Text, Any]) -> List[Dict[Text, Any]]:
+
+        await fragment_cache.arefresh()
+        await entity_resolver.arefresh()
+
+        symptoms = resolve_entities(tracker.get_latest_entity_values("symptom") or [], entity_resolver.symptom)
+
+        parts = ["🔍 **Symptom Assessment Guide**\n\n"]
+
         if symptoms:
-            response += "**Based on your reported symptoms**:\n\n"
+            parts.append("**Based on your reported symptoms**:\n\n")
             for symptom in symptoms[:4]:  # Limit to 4 symptoms
-                if symptom in knowledge['symptoms']:
-                    info = knowledge['symptoms'][symptom]
-                    response += f"**{symptom.title()}**:\n"
-                    response += f"• Description: {info['description']}\n"
-                    response += f"• Self-care: {', '.join(info['first_aid'][:2])}\n"
-                    response += f"• Medical attention: {info['when_to_see_doctor']}\n\n"
-                else:
-                    response += f"**{symptom.title()}**: Monitor and track this symptom. Note any changes.\n\n"
-            
-            response += "**Next Steps**:\n"
-            response += "• Monitor symptom severity and duration\n"
-            response += "• Note any new or worsening symptoms\n"
-            response += "• Keep a symptom diary if persistent\n"
-            response += "• Seek medical advice for proper evaluation\n\n"
+                fragment = fragment_cache.get('symptom_check', symptom, 2)
+                if fragment is None:
+                    fragment = f"**{symptom.title()}**: Monitor and track this symptom. Note any changes.\n\n"
+                parts.append(fragment)
+            parts.append(SYMPTOM_NEXT_STEPS)
         else:
-            response += "**Please describe your symptoms for assessment**:\n\n"
-            response += "📝 **Include details about**:\n"
-            response += "• Specific symptoms you're experiencing\n"
-            response += "• When they started and how long they've lasted\n"
-            response += "• Severity (mild, moderate, severe)\n"
-            response += "• Any triggers or patterns you've noticed\n"
-            response += "• Other symptoms occurring together\n\n"
-            response += "💡 **Example**: 'I've had fever and headache for 2 days, with body aches.'\n\n"
-        
-        response += "🚨 **RED FLAG - Seek IMMEDIATE Medical Attention for**:\n"
-        response += "• Chest pain or pressure\n• Difficulty breathing\n• Severe bleeding\n• Sudden weakness or numbness\n"
-        response += "• Confusion or loss of consciousness\n• Severe pain anywhere\n• High fever with stiff neck\n"
-        response += "• Suicidal or homicidal thoughts\n\n"
-        
-        response += "⚠️ *This symptom checker provides general guidance only. It is not a substitute for professional medical evaluation, diagnosis, or treatment.*"
-        
-        dispatcher.utter_message(text=response)
+            parts.append(SYMPTOM_PROMPT)
+
+        parts.append(SYMPTOM_RED_FLAGS)
+
+        dispatcher.utter_message(text="".join(parts))
         return [SlotSet("symptom_slot", symptoms[0] if symptoms else None)]
 
 class ActionDietAdvice(Action):
     """Provide comprehensive diet and nutrition advice"""
-    
+
     def name(self) -> Text:
         return "action_diet_advice"
 
-    def run(self, dispatcher: CollectingDispatcher,
-            tracker: Tracker,
-            domain: Dict[Text, Any]) -> List[Dict[Text, Any]]:
-        
-        knowledge = self.load_medical_knowledge()
-        diets = knowledge['diet_plans']
-        message = tracker.latest_message.get('text', '').lower()
-        
-        response = "🥗 **Nutrition & Dietary Guidance**\n\n"
-        
-        if any(word in message for word in ['diabet', 'blood sugar', 'sugar']):
-            diet_info = diets['diabetes']
-            response += "**Diabetes-Friendly Diet** 🩸\n"
-            response += f"• **Focus**: {diet_info['focus']}\n"
-            response += f"• **Foods to emphasize**: {', '.join(diet_info['foods_to_eat'][:4])}\n"
-            response += f"• **Foods to limit**: {', '.join(diet_info['foods_to_limit'][:3])}\n"
-            response += f"• **Meal timing**: {diet_info['meal_timing']}\n"
-            response += "• **Key tips**: Balance carbohydrates, monitor portions, stay consistent\n\n"
-        
-        elif any(word in message for word in ['heart', 'cardio', 'cholesterol', 'blood pressure']):
-            diet_info = diets['heart_health']
-            response += "**Heart-Healthy Diet** ❤️\n"
-            response += f"• **Focus**: {diet_info['focus']}\n"
-            response += f"• **Beneficial foods**: {', '.join(diet_info['foods_to_eat'][:4])}\n"
-            response += f"• **Foods to minimize**: {', '.join(diet_info['foods_to_avoid'][:3])}\n"
-            response += f"• **Lifestyle integration**: {diet_info['lifestyle']}\n"
-            response += "• **Additional benefits**: Supports healthy weight and blood pressure\n\n"
-        
-        elif any(word in message for word in ['weight', 'obesity', 'overweight', 'bmi']):
-            diet_info = diets['weight_management']
-            response += "**Weight Management Nutrition** ⚖️\n"
-            response += f"• **Basic principle**: {diet_info['principle']}\n"
-            response += f"• **Key strategies**: {', '.join(diet_info['recommendations'][:3])}\n"
-            response += f"• **Helpful tips**: {', '.join(diet_info['tips'][:2])}\n"
-            response += "• **Sustainable approach**: Focus on long-term habits, not quick fixes\n\n"
-        
-        elif any(word in message for word in ['celiac', 'gluten']):
-            diet_info = diets['celiac_disease']
-            response += "**Gluten-Free Diet for Celiac Disease** 🌾\n"
-            response += f"• **Essential focus**: {diet_info['focus']}\n"
-            response += f"• **Safe foods**: {', '.join(diet_info['foods_to_eat'][:4])}\n"
-            response += f"• **Strictly avoid**: {', '.join(diet_info['foods_to_avoid'][:3])}\n"
-            response += f"• **Critical consideration**: {diet_info['important']}\n"
-            response += "• **Additional note**: Requires careful label reading and kitchen practices\n\n"
-        
+    @traced_action
+    async def run(self, dispatcher: CollectingDispatcher,
+                  tracker: Tracker,
+                  domain: Dict[Text, Any]) -> List[Dict[Text, Any]]:
+
+        await fragment_cache.arefresh()
+
+        matches = keyword_matcher.match(tracker.latest_message.get('text', ''))
+        parts = ["🥗 **Nutrition & Dietary Guidance**\n\n"]
+
+        if 'diet.diabetes' in matches:
+            parts.append(fragment_cache.get('diet', 'diabetes') or "")
+        elif 'diet.heart' in matches:
+            parts.append(fragment_cache.get('diet', 'heart_health') or "")
+        elif 'diet.weight' in matches:
+            parts.append(fragment_cache.get('diet', 'weight_management') or "")
+        elif 'diet.celiac' in matches:
+            parts.append(fragment_cache.get('diet', 'celiac_disease') or "")
         else:
-            response += "**Specialized Dietary Guidance Available**:\n"
-            response += "• **Diabetes management** - Blood sugar control\n"
-            response += "• **Heart health** - Cholesterol and blood pressure focus\n"
-            response += "• **Weight management** - Healthy weight achievement\n"
-            response += "• **Celiac disease** - Strict gluten-free approach\n"
-            response += "• **General healthy eating** - Balanced nutrition\n\n"
-            response += "Which specific dietary area would you like information about?"
-        
-        response += "📋 **Universal Healthy Eating Principles**:\n"
-        response += "• Fill half your plate with fruits and vegetables\n"
-        response += "• Choose whole grains over refined grains\n"
-        response += "• Include lean protein sources\n"
-        response += "• Stay well hydrated with water\n"
-        response += "• Limit processed foods and added sugars\n"
-        response += "• Practice mindful eating and portion awareness\n\n"
-        
-        response += "⚠️ *For personalized dietary plans, consult a registered dietitian or nutritionist who can consider your individual health needs and preferences.*"
-        
-        dispatcher.utter_message(text=response)
+            parts.append(DIET_MENU)
+
+        parts.append(DIET_PRINCIPLES)
+
+        dispatcher.utter_message(text="".join(parts))
         return [SlotSet("last_topic", "diet")]
 
 class ActionDiseasePrevention(Action):
     """Provide comprehensive disease prevention information"""
-    
+
     def name(self) -> Text:
         return "action_disease_prevention"
 
-    def run(self, dispatcher: CollectingDispatcher,
-            tracker: Tracker,
-            domain: Dict[Text, Any]) -> List[Dict[Text, Any]]:
-        
-        knowledge = self.load_medical_knowledge()
-        prevention = knowledge['disease_prevention']
-        message = tracker.latest_message.get('text', '').lower()
-        
-        response = "🛡️ **Disease Prevention & Wellness Strategies**\n\n"
-        
-        response += "**Essential Prevention Practices** 🌟\n"
-        for i, tip in enumerate(prevention['general'][:8], 1):
-            response += f"{i}. {tip}\n"
-        
-        response += "\n**Condition-Specific Prevention**\n\n"
-        
-        if any(word in message for word in ['diabet', 'blood sugar']):
-            response += "**Diabetes Prevention** 🩸\n"
-            response += f"{prevention['specific']['diabetes']}\n"
-            response += "• **Key focus**: Maintain healthy weight through diet and exercise\n"
-            response += "• **Monitoring**: Regular blood sugar checks if at risk\n"
-            response += "• **Lifestyle**: Balanced nutrition and physical activity\n\n"
-        
-        elif any(word in message for word in ['heart', 'cardio', 'cholesterol']):
-            response += "**Heart Disease Prevention** ❤️\n"
-            response += f"{prevention['specific']['heart_disease']}\n"
-            response += "• **Critical factors**: Blood pressure and cholesterol management\n"
-            response += "• **Lifestyle**: Regular exercise and smoke-free environment\n"
-            response += "• **Diet**: Low sodium, healthy fats, plenty of fruits/vegetables\n\n"
-        
-        elif any(word in message for word in ['cancer']):
-            response += "**Cancer Prevention** 🎗️\n"
-            response += f"{prevention['specific']['cancer']}\n"
-            response += "• **Primary prevention**: Avoid tobacco and limit alcohol\n"
-            response += "• **Early detection**: Regular screenings as recommended\n"
-            response += "• **Healthy habits**: Sun protection and balanced nutrition\n\n"
-        
-        elif any(word in message for word in ['infection', 'virus', 'bacteria']):
-            response += "**Infectious Disease Prevention** 🦠\n"
-            response += f"{prevention['specific']['infections']}\n"
-            response += "• **Hygiene**: Proper handwashing and food safety\n"
-            response += "• **Immunization**: Stay up-to-date with vaccinations\n"
-            response += "• **Awareness**: Avoid close contact when sick\n\n"
-        
+    @traced_action
+    async def run(self, dispatcher: CollectingDispatcher,
+                  tracker: Tracker,
+                  domain: Dict[Text, Any]) -> List[Dict[Text, Any]]:
+
+        await fragment_cache.arefresh()
+
+        matches = keyword_matcher.match(tracker.latest_message.get('text', ''))
+
+        parts = [
+            "🛡️ **Disease Prevention & Wellness Strategies**\n\n",
+            fragment_cache.get('prevention_general', 'general', 8),
+            "\n**Condition-Specific Prevention**\n\n",
+        ]
+
+        if 'prevention.diabetes' in matches:
+            parts.append(fragment_cache.get('prevention', 'diabetes'))
+        elif 'prevention.heart' in matches:
+            parts.append(fragment_cache.get('prevention', 'heart_disease'))
+        elif 'prevention.cancer' in matches:
+            parts.append(fragment_cache.get('prevention', 'cancer'))
+        elif 'prevention.infection' in matches:
+            parts.append(fragment_cache.get('prevention', 'infections'))
         else:
-            response += "**Major Areas of Prevention**:\n"
-            response += "• **Diabetes** - Weight management and healthy lifestyle\n"
-            response += "• **Heart Disease** - Blood pressure control and exercise\n"
-            response += "• **Cancer** - Avoid carcinogens and regular screening\n"
-            response += "• **Infections** - Hygiene and immunization\n\n"
-            response += "Which specific prevention area interests you?"
-        
-        response += "💡 **Proactive Health Maintenance**:\n"
-        response += "• Schedule regular health check-ups\n"
-        response += "• Know your family health history\n"
-        response += "• Stay current with age-appropriate screenings\n"
-        response += "• Maintain mental and emotional wellness\n"
-        response += "• Build healthy relationships and support systems\n\n"
-        
-        response += "🌟 *Prevention is the most effective healthcare strategy. Small, consistent healthy choices create significant long-term benefits!*"
-        
-        dispatcher.utter_message(text=response)
+            parts.append(PREVENTION_MENU)
+
+        parts.append(PREVENTION_MAINTENANCE)
+
+        dispatcher.utter_message(text="".join(parts))
         return [SlotSet("last_topic", "prevention")]
 
 class ActionEmergencyCheck(Action):
     """Enhanced emergency situation detection and response"""
-    
+
     def name(self) -> Text:
         return "action_emergency_check"
 
-    def run(self, dispatcher: CollectingDispatcher,
-            tracker: Tracker,
-            domain: Dict[Text, Any]) -> List[Dict[Text, Any]]:
-        
-        emergency_keywords = [
-            'emergency', 'urgent', 'critical', 'immediate', '911', 'hospital now',
-            'chest pain', 'difficulty breathing', 'severe bleeding', 'unconscious',
-            'stroke', 'heart attack', 'choking', 'seizure', 'poisoning',
-            'can\'t breathe', 'dying', 'suicide', 'kill myself', 'severe pain'
-        ]
-        
-        message = tracker.latest_message.get('text', '').lower()
-        
-        emergency_detected = any(keyword in message for keyword in emergency_keywords)
-        
+    @traced_action
+    async def run(self, dispatcher: CollectingDispatcher,
+                  tracker: Tracker,
+                  domain: Dict[Text, Any]) -> List[Dict[Text, Any]]:
+
+        matches = keyword_matcher.match(tracker.latest_message.get('text', ''))
+
+        emergency_detected = 'emergency' in matches
+
         if emergency_detected:
-            dispatcher.utter_message(
-                text="🚨 **MEDICAL EMERGENCY ALERT** 🚨\n\n"
-                     "**IMMEDIATE ACTION REQUIRED**:\n\n"
-                     "📞 **Call Emergency Services Now**:\n"
-                     "• Dial 911 (US) or your local emergency number\n"
-                     "• Clearly state your emergency and location\n"
-                     "• Follow dispatcher instructions\n\n"
-                     "🏥 **Go to Nearest Hospital**:\n"
-                     "• Do not drive yourself if impaired\n"
-                     "• Have someone take you or call ambulance\n"
-                     "• Bring identification and insurance information\n\n"
-                     "⚠️ **Do Not Delay**:\n"
-                     "• Every minute counts in emergencies\n"
-                     "• Your health and safety are paramount\n"
-                     "• Professional medical care is essential\n\n"
-                     "**You are not alone - help is available immediately!**"
-            )
+            dispatcher.utter_message(text=EMERGENCY_MESSAGE)
         else:
             # Regular health guidance
             dispatcher.utter_message(
                 text="For non-emergency health concerns, I'm here to provide information and guidance. "
                      "If your situation becomes urgent, don't hesitate to seek immediate medical care."
             )
-        
+
         return [SlotSet("emergency_detected", emergency_detected)]
 
 class ActionFallback(Action):
@@ -423,9 +595,10 @@ class ActionFallback(Action):
     def name(self) -> Text:
         return "action_fallback"
 
-    def run(self, dispatcher: CollectingDispatcher,
-            tracker: Tracker,
-            domain: Dict[Text, Any]) -> List[Dict[Text, Any]]:
+    @traced_action
+    async def run(self, dispatcher: CollectingDispatcher,
+                  tracker: Tracker,
+                  domain: Dict[Text, Any]) -> List[Dict[Text, Any]]:
         
         dispatcher.utter_message(
             text="I'm not sure I understand. As your medical assistant, I can help with:\n\n"
@@ -438,68 +611,3 @@ class ActionFallback(Action):
         )
         
         return []
-
-    def load_medical_knowledge(self):
-        """Load medical knowledge from JSON file with enhanced error handling"""
-        knowledge_file = Path("medical_knowledge.json")
-        try:
-            if knowledge_file.exists():
-                with open(knowledge_file, 'r', encoding='utf-8') as f:
-                    knowledge = json.load(f)
-                    # Ensure all required sections exist
-                    if 'symptoms' not in knowledge:
-                        knowledge['symptoms'] = {}
-                    if 'vaccinations' not in knowledge:
-                        knowledge['vaccinations'] = {}
-                    if 'diet_plans' not in knowledge:
-                        knowledge['diet_plans'] = {}
-                    if 'disease_prevention' not in knowledge:
-                        knowledge['disease_prevention'] = {'general': [], 'specific': {}}
-                    return knowledge
-            else:
-                # Create basic structure if file doesn't exist
-                return self.create_basic_knowledge_base()
-        except Exception as e:
-            print(f"Error loading medical knowledge: {e}")
-            return self.create_basic_knowledge_base()
-
-    def create_basic_knowledge_base(self):
-        """Create a basic medical knowledge base as fallback"""
-        return {
-            'symptoms': {
-                'fever': {
-                    'description': 'Elevated body temperature above normal',
-                    'possible_causes': ['Infection', 'Inflammation'],
-                    'first_aid': ['Rest', 'Hydration', 'Cool compresses'],
-                    'when_to_see_doctor': 'If above 104°F or lasting more than 3 days'
-                }
-            },
-            'vaccinations': {
-                'covid_19': {
-                    'types': ['mRNA vaccines', 'Protein subunit'],
-                    'schedule': 'Primary series + boosters',
-                    'side_effects': ['Pain at injection site', 'Fatigue'],
-                    'effectiveness': 'High effectiveness against severe disease'
-                }
-            },
-            'diet_plans': {
-                'diabetes': {
-                    'focus': 'Blood sugar control',
-                    'foods_to_eat': ['Non-starchy vegetables', 'Lean proteins'],
-                    'foods_to_limit': ['Sugary drinks', 'Refined carbs'],
-                    'meal_timing': 'Regular meals throughout day'
-                }
-            },
-            'disease_prevention': {
-                'general': [
-                    'Regular hand washing',
-                    'Balanced diet',
-                    'Regular exercise',
-                    'Adequate sleep'
-                ],
-                'specific': {
-                    'diabetes': 'Maintain healthy weight and exercise regularly',
-                    'heart_disease': 'No smoking and control blood pressure'
-                }
-            }
-        }
\ No newline at end of file
@@ -0,0 +1,199 @@
+"""
+Bulk execution of custom actions over synthetic tracker states.
+
+Input is JSONL, one turn per line:
+    {"action": "action_vaccine_info", "text": "covid vaccine side effects",
+     "entities": [], "slots": {}, "id": "optional-correlation-id"}
+
+Output is JSONL in input order:
+    {"line": 1, "id": ..., "action": ..., "messages": [...], "events": [...]}
+or, for a turn that failed, the same record with an "error" field.
+
+Usage (from the healthbot directory):
+    python -m actions.batch run turns.jsonl -o replies.jsonl --workers 4
+    python -m actions.batch run turns.jsonl --knowledge new_medical_knowledge.json
+    python -m actions.batch serve --port 5056    # POST JSONL to /batch
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Text, Tuple
+
+DEFAULT_CHUNK_SIZE = 64
+
+
+def parse_lines(lines: Iterable[Text]) -> Iterator[Tuple[int, Any]]:
+    """Yield (line number, state) pairs; bad JSON or non-object lines are passed through as errors"""
+    for line_no, line in enumerate(lines, 1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            state = json.loads(line)
+        except json.JSONDecodeError as e:
+            yield line_no, {'_error': f"invalid JSON: {e}"}
+            continue
+        if not isinstance(state, dict):
+            yield line_no, {'_error': f"expected a JSON object, got {type(state).__name__}"}
+            continue
+        yield line_no, state
+
+
+def run_chunk(chunk: List[Tuple[int, Dict[Text, Any]]]) -> List[Dict[Text, Any]]:
+    """Run a chunk of turns on one event loop inside a worker process"""
+    return asyncio.run(_run_chunk(chunk))
+
+
+async def _run_chunk(chunk):
+    # Imported here so MEDICAL_KNOWLEDGE_FILE is already set in the worker
+    from .replay import ACTIONS, run_action
+
+    results = []
+    for line_no, state in chunk:
+        result = {'line': line_no, 'id': state.get('id'), 'action': state.get('action')}
+        try:
+            if '_error' in state:
+                raise ValueError(state['_error'])
+            if state.get('action') not in ACTIONS:
+                raise ValueError(f"unknown action: {state.get('action')!r}")
+            messages, events = await run_action(state['action'], state)
+            result['messages'] = messages
+            result['events'] = events
+        except Exception as e:
+            result['error'] = str(e)
+        results.append(result)
+    return results
+
+
+def _chunks(pairs: Iterable[Tuple[int, Any]], size: int) -> Iterator[List[Tuple[int, Any]]]:
+    chunk = []
+    for pair in pairs:
+        chunk.append(pair)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def run_batch(lines: Iterable[Text], workers: int = 0,
+              chunk_size: int = DEFAULT_CHUNK_SIZE,
+              executor: Optional[ProcessPoolExecutor] = None) -> Iterator[Dict[Text, Any]]:
+    """Stream results for JSONL ``lines`` in input order.
+
+    ``workers=0`` runs in-process; otherwise chunks are spread over a
+    process pool with a bounded number of chunks in flight, so memory stays
+    flat however long the input is. With a shared ``executor``, pass the
+    worker count it was created with as ``workers``.
+    """
+    chunks = _chunks(parse_lines(lines), chunk_size)
+    if not workers and executor is None:
+        for chunk in chunks:
+            yield from run_chunk(chunk)
+        return
+
+    own_executor = executor is None
+    executor = executor or ProcessPoolExecutor(max_workers=workers)
+    max_in_flight = 2 * (workers or os.cpu_count() or 1)
+    pending = deque()
+    try:
+        for chunk in chunks:
+            pending.append(executor.submit(run_chunk, chunk))
+            if len(pending) >= max_in_flight:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+    finally:
+        if own_executor:
+            executor.shutdown(cancel_futures=True)
+
+
+def write_jsonl(results: Iterable[Dict[Text, Any]], out) -> Dict[Text, int]:
+    counts = {'turns': 0, 'errors': 0}
+    for result in results:
+        counts['turns'] += 1
+        counts['errors'] += 'error' in result
+        out.write(json.dumps(result, ensure_ascii=False) + "\n")
+    return counts
+
+
+class BatchRequestHandler(BaseHTTPRequestHandler):
+    """POST /batch with a JSONL body; replies stream back as JSONL"""
+
+    executor = None
+    workers = 0
+    chunk_size = DEFAULT_CHUNK_SIZE
+
+    def do_POST(self):
+        if self.path.rstrip('/') != '/batch':
+            self.send_error(404)
+            return
+        length = int(self.headers.get('Content-Length', 0))
+        body = self.rfile.read(length).decode('utf-8')
+
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/x-ndjson')
+        self.end_headers()
+        for result in run_batch(body.splitlines(), self.workers, self.chunk_size, self.executor):
+            self.wfile.write((json.dumps(result, ensure_ascii=False) + "\n").encode('utf-8'))
+
+
+def serve(host: Text, port: int, workers: int, chunk_size: int):
+    BatchRequestHandler.workers = workers or os.cpu_count()
+    BatchRequestHandler.executor = ProcessPoolExecutor(max_workers=BatchRequestHandler.workers)
+    BatchRequestHandler.chunk_size = chunk_size
+    server = ThreadingHTTPServer((host, port), BatchRequestHandler)
+    print(f"🔧 Batch action endpoint on http://{host}:{port}/batch")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        BatchRequestHandler.executor.shutdown(cancel_futures=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--knowledge', help="medical_knowledge.json to validate against")
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE)
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    run_cmd = sub.add_parser('run', help="replay a JSONL file")
+    run_cmd.add_argument('input', help="JSONL file of turns, or - for stdin")
+    run_cmd.add_argument('-o', '--output', help="JSONL output file (default: stdout)")
+    run_cmd.add_argument('--workers', type=int, default=os.cpu_count(), help="0 runs in-process")
+
+    serve_cmd = sub.add_parser('serve', help="run the local HTTP batch endpoint")
+    serve_cmd.add_argument('--host', default='127.0.0.1')
+    serve_cmd.add_argument('--port', type=int, default=5056)
+    serve_cmd.add_argument('--workers', type=int, default=os.cpu_count())
+
+    args = parser.parse_args(argv)
+    if args.knowledge:
+        os.environ['MEDICAL_KNOWLEDGE_FILE'] = os.path.abspath(args.knowledge)
+
+    if args.command == 'serve':
+        serve(args.host, args.port, args.workers, args.chunk_size)
+        return
+
+    source = sys.stdin if args.input == '-' else open(args.input, encoding='utf-8')
+    out = open(args.output, 'w', encoding='utf-8') if args.output else sys.stdout
+    try:
+        counts = write_jsonl(run_batch(source, args.workers, args.chunk_size), out)
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if out is not sys.stdout:
+            out.close()
+    print(f"✅ {counts['turns']} turns replayed, {counts['errors']} errors", file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
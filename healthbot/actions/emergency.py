@@ -0,0 +1,130 @@
+import re
+import threading
+import time
+from collections import deque
+from typing import Dict, Iterable, Optional, Text
+
+# Used by ActionEmergencyCheck, which only runs once NLU has predicted the
+# emergency intent, so generic words like 'urgent' are safe there
+EMERGENCY_KEYWORDS = [
+    'emergency', 'urgent', 'critical', 'immediate', '911', 'hospital now',
+    'chest pain', 'difficulty breathing', 'severe bleeding', 'unconscious',
+    'stroke', 'heart attack', 'choking', 'seizure', 'poisoning',
+    'can\'t breathe', 'dying', 'suicide', 'kill myself', 'severe pain'
+]
+
+# The pre-screen runs on every message before NLU, so it only fires on
+# specific phrases, matched as whole words
+PRESCREEN_KEYWORDS = [
+    '911', 'chest pain', 'difficulty breathing', 'severe bleeding', 'unconscious',
+    'stroke', 'heart attack', 'choking', 'seizure', 'poisoning',
+    'can\'t breathe', 'can’t breathe', 'cant breathe', 'dying', 'suicide', 'kill myself',
+    'severe pain',
+]
+
+# Questions about a condition are left to NLU, but only when the word
+# qualifies the matched phrase itself: "heart attack prevention", "stroke
+# risk", "how to prevent a stroke". Elsewhere in the message it does not
+# cancel the alert ("heart attack, what is the first aid").
+QUALIFIERS_AFTER = [
+    'prevention', 'risk', 'risks', 'risk factors', 'cause', 'causes', 'diet', 'vaccine',
+]
+QUALIFIERS_BEFORE = [
+    'prevent', 'preventing', 'avoid', 'avoiding', 'risk of', 'risks of', 'cause of', 'causes of',
+]
+
+# Menu payloads the bot itself offers (quick replies, buttons, location menu)
+MENU_PAYLOADS = frozenset([
+    'emergency', 'emergency signs', 'common symptoms', 'find doctor', 'find help',
+    'find hospitals', 'find pharmacies', 'symptoms', 'vaccines', 'diet',
+    'meal plans', 'weight management', 'diet for conditions',
+    'covid vaccine', 'child vaccines', 'travel vaccines',
+    'disease prevention', 'vaccine prevention', 'healthy lifestyle',
+])
+
+EMERGENCY_MESSAGE = (
+    "🚨 **MEDICAL EMERGENCY ALERT** 🚨\n\n"
+    "**IMMEDIATE ACTION REQUIRED**:\n\n"
+    "📞 **Call Emergency Services Now**:\n"
+    "• Dial 911 (US) or your local emergency number\n"
+    "• Clearly state your emergency and location\n"
+    "• Follow dispatcher instructions\n\n"
+    "🏥 **Go to Nearest Hospital**:\n"
+    "• Do not drive yourself if impaired\n"
+    "• Have someone take you or call ambulance\n"
+    "• Bring identification and insurance information\n\n"
+    "⚠️ **Do Not Delay**:\n"
+    "• Every minute counts in emergencies\n"
+    "• Your health and safety are paramount\n"
+    "• Professional medical care is essential\n\n"
+    "**You are not alone - help is available immediately!**"
+)
+
+
+def _alternatives(phrases: Iterable[Text]) -> Text:
+    return "|".join(sorted((re.escape(p.lower()) for p in phrases), key=len, reverse=True))
+
+
+def phrase_pattern(phrases: Iterable[Text]):
+    """One regex matching any of ``phrases`` as whole words"""
+    return re.compile(r"(?<!\w)(?:" + _alternatives(phrases) + r")(?!\w)")
+
+
+class EmergencyPrescreen:
+    """Compiled emergency phrase check with its own latency metric.
+
+    Runs ahead of NLU so an emergency reply never waits on Rasa. Bot menu
+    payloads, and phrases qualified as a question about the condition, are
+    passed through to NLU. Keeps
+    the last ``window`` screening latencies for p50/p99 reporting.
+    """
+
+    def __init__(self, keywords=PRESCREEN_KEYWORDS, message: Text = EMERGENCY_MESSAGE, window: int = 1000,
+                 qualifiers_after=QUALIFIERS_AFTER, qualifiers_before=QUALIFIERS_BEFORE,
+                 payloads=MENU_PAYLOADS):
+        self.pattern = phrase_pattern(keywords)
+        # Matched right after / right before a phrase (an article may sit between)
+        self.qualified_after = re.compile(r"\s+(?:" + _alternatives(qualifiers_after) + r")(?!\w)")
+        self.qualified_before = re.compile(
+            r"(?<!\w)(?:" + _alternatives(qualifiers_before) + r")\s+(?:(?:a|an|the)\s+)?$"
+        )
+        self.payloads = payloads
+        self.message = message
+        self._latencies = deque(maxlen=window)
+        self._lock = threading.Lock()
+        self.screened = 0
+        self.detected = 0
+
+    def check(self, text: Text) -> Optional[Text]:
+        """Return the emergency reply if ``text`` is an emergency, else None"""
+        start = time.perf_counter()
+        detected = self.is_emergency(text)
+        elapsed = time.perf_counter() - start
+        with self._lock:
+            self._latencies.append(elapsed)
+            self.screened += 1
+            self.detected += detected
+        return self.message if detected else None
+
+    def is_emergency(self, text: Text) -> bool:
+        text = text.lower().strip()
+        if text.strip(' .!?') in self.payloads:
+            return False
+        for match in self.pattern.finditer(text):
+            if not (self.qualified_after.match(text, match.end())
+                    or self.qualified_before.search(text, 0, match.start())):
+                return True
+        return False
+
+    def stats(self) -> Dict[Text, float]:
+        with self._lock:
+            latencies = sorted(self._latencies)
+            screened, detected = self.screened, self.detected
+        if not latencies:
+            return {'screened': screened, 'detected': detected, 'p50_us': 0.0, 'p99_us': 0.0}
+        return {
+            'screened': screened,
+            'detected': detected,
+            'p50_us': latencies[len(latencies) // 2] * 1e6,
+            'p99_us': latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1e6,
+        }
@@ -0,0 +1,344 @@
+import csv
+import heapq
+import json
+import math
+import os
+import threading
+from collections import namedtuple
+from functools import lru_cache
+from pathlib import Path
+from typing import Iterable, List, Optional, Sequence, Text, Tuple
+
+# HEALTH_FACILITIES_FILE points the index at a full (e.g. national) facility list
+FACILITIES_FILE = Path(os.environ.get(
+    "HEALTH_FACILITIES_FILE",
+    Path(__file__).resolve().parent.parent / "datasets" / "health_facilities_sample.csv",
+))
+
+EARTH_RADIUS_KM = 6371.0088
+
+# Geohash precision of the result cache; a level-6 cell is about 1.2 x 0.6 km
+CELL_PRECISION = 6
+
+# Points per KD-tree leaf; small leaves are scanned directly
+LEAF_SIZE = 16
+
+_BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+
+Facility = namedtuple("Facility", "name kind latitude longitude address phone")
+
+
+def to_xyz(latitude: float, longitude: float) -> Tuple[float, float, float]:
+    """Point on the unit sphere; straight-line distance grows with arc length"""
+    lat, lon = math.radians(latitude), math.radians(longitude)
+    cos_lat = math.cos(lat)
+    return cos_lat * math.cos(lon), cos_lat * math.sin(lon), math.sin(lat)
+
+
+def km_to_chord(km: float) -> float:
+    return 2 * math.sin(min(km / EARTH_RADIUS_KM, math.pi) / 2)
+
+
+def chord_to_km(chord: float) -> float:
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, chord / 2))
+
+
+def distance_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """Great-circle distance"""
+    return chord_to_km(math.dist(to_xyz(lat1, lon1), to_xyz(lat2, lon2)))
+
+
+def geohash(latitude: float, longitude: float, precision: int = CELL_PRECISION) -> Text:
+    lat_range, lon_range = [-90.0, 90.0], [-180.0, 180.0]
+    cell, bits, value, even = [], 0, 0, True
+    while len(cell) < precision:
+        rng, coord = (lon_range, longitude) if even else (lat_range, latitude)
+        mid = (rng[0] + rng[1]) / 2
+        value <<= 1
+        if coord >= mid:
+            value |= 1
+            rng[0] = mid
+        else:
+            rng[1] = mid
+        even = not even
+        bits += 1
+        if bits == 5:
+            cell.append(_BASE32[value])
+            bits, value = 0, 0
+    return "".join(cell)
+
+
+def geohash_bounds(cell: Text) -> Tuple[float, float, float, float]:
+    """(min_lat, max_lat, min_lon, max_lon) of a geohash cell"""
+    lat_range, lon_range = [-90.0, 90.0], [-180.0, 180.0]
+    even = True
+    for char in cell:
+        value = _BASE32.index(char)
+        for shift in range(4, -1, -1):
+            rng = lon_range if even else lat_range
+            mid = (rng[0] + rng[1]) / 2
+            if value >> shift & 1:
+                rng[0] = mid
+            else:
+                rng[1] = mid
+            even = not even
+    return lat_range[0], lat_range[1], lon_range[0], lon_range[1]
+
+
+class KDTree:
+    """
+    Static 3-d tree over unit-sphere points. Splits on the axis with the
+    widest spread; queries take and return squared straight-line distances.
+    """
+
+    def __init__(self, points: Sequence[Tuple[float, float, float]]):
+        self.points = points
+        self.root = None
+        if points:
+            # Sort once per axis; each split then partitions the three
+            # orders in linear time instead of sorting again
+            by_axis = [sorted(range(len(points)), key=lambda i, a=a: points[i][a]) for a in range(3)]
+            self._side = bytearray(len(points))
+            self.root = self._build(by_axis)
+            del self._side
+
+    def _build(self, by_axis: List[List[int]]):
+        if len(by_axis[0]) <= LEAF_SIZE:
+            return (by_axis[0],)
+        points = self.points
+        spreads = [points[order[-1]][a] - points[order[0]][a] for a, order in enumerate(by_axis)]
+        axis = spreads.index(max(spreads))
+        order = by_axis[axis]
+        mid = len(order) // 2
+        side = self._side
+        for i in order[:mid]:
+            side[i] = 0
+        for i in order[mid:]:
+            side[i] = 1
+        left = [[i for i in ids if not side[i]] for ids in by_axis]
+        right = [[i for i in ids if side[i]] for ids in by_axis]
+        return axis, points[order[mid]][axis], self._build(left), self._build(right)
+
+    def nearest(self, point, k: int) -> List[Tuple[float, int]]:
+        """The k closest (squared distance, id) pairs, closest first"""
+        if self.root is None or k <= 0:
+            return []
+        heap = []  # max-heap of (-d2, id)
+        points = self.points
+
+        def visit(node):
+            if len(node) == 1:
+                for i in node[0]:
+                    d2 = _dist2(point, points[i])
+                    if len(heap) < k:
+                        heapq.heappush(heap, (-d2, i))
+                    elif d2 < -heap[0][0]:
+                        heapq.heapreplace(heap, (-d2, i))
+                return
+            axis, split, left, right = node
+            gap = point[axis] - split
+            near, far = (left, right) if gap < 0 else (right, left)
+            visit(near)
+            if len(heap) < k or gap * gap < -heap[0][0]:
+                visit(far)
+
+        visit(self.root)
+        return sorted((-d2, i) for d2, i in heap)
+
+    def within(self, point, radius2: float) -> List[Tuple[float, int]]:
+        """(squared distance, id) pairs within sqrt(radius2), unordered"""
+        found = []
+        points = self.points
+        stack = [self.root] if self.root is not None else []
+        while stack:
+            node = stack.pop()
+            if len(node) == 1:
+                for i in node[0]:
+                    d2 = _dist2(point, points[i])
+                    if d2 <= radius2:
+                        found.append((d2, i))
+                continue
+            axis, split, left, right = node
+            gap = point[axis] - split
+            near, far = (left, right) if gap < 0 else (right, left)
+            stack.append(near)
+            if gap * gap <= radius2:
+                stack.append(far)
+        return found
+
+
+def _dist2(a, b) -> float:
+    dx, dy, dz = a[0] - b[0], a[1] - b[1], a[2] - b[2]
+    return dx * dx + dy * dy + dz * dz
+
+
+class FacilityIndex:
+    """
+    Nearest and within-radius facility queries over a KD-tree per kind.
+
+    Candidates are cached per geohash cell: they are gathered once around
+    the cell centre with a margin of the cell's half-diagonal, which is
+    enough to contain the exact answer for any point in the cell, and then
+    ranked by the exact distance from the user's own position.
+    """
+
+    def __init__(self, facilities: Iterable[Facility], cell_precision: int = CELL_PRECISION,
+                 cache_size: int = 4096):
+        self.facilities = list(facilities)
+        self.cell_precision = cell_precision
+        self._xyz = [to_xyz(f.latitude, f.longitude) for f in self.facilities]
+        # One tree per kind plus one over everything (kind None)
+        self._ids = {None: list(range(len(self.facilities)))}
+        for i, facility in enumerate(self.facilities):
+            self._ids.setdefault(facility.kind, []).append(i)
+        self._trees = {kind: KDTree([self._xyz[i] for i in ids]) for kind, ids in self._ids.items()}
+        self._candidates = lru_cache(maxsize=cache_size)(self._cell_candidates)
+
+    @classmethod
+    def from_file(cls, path, **kwargs) -> "FacilityIndex":
+        path = Path(path)
+        if path.suffix.lower() in (".json", ".geojson"):
+            return cls(load_geojson(path), **kwargs)
+        return cls(load_csv(path), **kwargs)
+
+    @property
+    def kinds(self) -> List[Text]:
+        return sorted(kind for kind in self._ids if kind is not None)
+
+    def nearest(self, latitude: float, longitude: float, k: int = 5,
+                kind: Optional[Text] = None) -> List[Tuple[float, Facility]]:
+        """The k closest facilities as (distance_km, facility), closest first"""
+        cell = geohash(latitude, longitude, self.cell_precision)
+        return self._rank(latitude, longitude, self._candidates(cell, kind, "nearest", k))[:k]
+
+    def within(self, latitude: float, longitude: float, radius_km: float,
+               kind: Optional[Text] = None) -> List[Tuple[float, Facility]]:
+        """Facilities within radius_km as (distance_km, facility), closest first"""
+        cell = geohash(latitude, longitude, self.cell_precision)
+        ranked = self._rank(latitude, longitude, self._candidates(cell, kind, "within", radius_km))
+        return [(d, f) for d, f in ranked if d <= radius_km]
+
+    def count_within(self, latitude: float, longitude: float, radius_km: float,
+                     kind: Optional[Text] = None) -> int:
+        return len(self.within(latitude, longitude, radius_km, kind))
+
+    def cache_info(self):
+        return self._candidates.cache_info()
+
+    def _rank(self, latitude, longitude, candidates) -> List[Tuple[float, Facility]]:
+        point = to_xyz(latitude, longitude)
+        ranked = sorted((_dist2(point, self._xyz[i]), i) for i in candidates)
+        return [(chord_to_km(math.sqrt(d2)), self.facilities[i]) for d2, i in ranked]
+
+    def _cell_candidates(self, cell: Text, kind: Optional[Text], query: Text, value) -> Tuple[int, ...]:
+        tree = self._trees.get(kind)
+        if tree is None:
+            return ()
+        min_lat, max_lat, min_lon, max_lon = geohash_bounds(cell)
+        center_lat, center_lon = (min_lat + max_lat) / 2, (min_lon + max_lon) / 2
+        margin = max(distance_km(center_lat, center_lon, lat, lon)
+                     for lat in (min_lat, max_lat) for lon in (min_lon, max_lon))
+        center = to_xyz(center_lat, center_lon)
+
+        if query == "nearest":
+            # The k nearest of any point in the cell lie within the centre's
+            # k-th distance plus twice the margin
+            found = tree.nearest(center, value)
+            if len(found) < value:
+                radius_km = math.pi * EARTH_RADIUS_KM
+            else:
+                radius_km = chord_to_km(math.sqrt(found[-1][0])) + 2 * margin
+        else:
+            radius_km = value + margin
+
+        ids = self._ids[kind]
+        return tuple(ids[i] for _, i in tree.within(center, km_to_chord(radius_km) ** 2))
+
+
+def _facility(name, kind, latitude, longitude, address="", phone="") -> Facility:
+    return Facility(
+        (name or "").strip(),
+        (kind or "other").strip().lower(),
+        float(latitude),
+        float(longitude),
+        (address or "").strip(),
+        (phone or "").strip(),
+    )
+
+
+def load_csv(path) -> List[Facility]:
+    """Rows with name, type, latitude, longitude and optional address, phone"""
+    facilities = []
+    with open(path, encoding="utf-8", newline="") as f:
+        for row in csv.DictReader(f):
+            try:
+                facilities.append(_facility(row.get("name"), row.get("type"), row["latitude"],
+                                            row["longitude"], row.get("address"), row.get("phone")))
+            except (KeyError, TypeError, ValueError) as e:
+                print(f"Skipping facility row {row.get('name')!r}: {str(e)}")
+    return facilities
+
+
+def load_geojson(path) -> List[Facility]:
+    """Point features; kind from the 'type', 'amenity' or 'healthcare' property"""
+    with open(path, encoding="utf-8") as f:
+        collection = json.load(f)
+    facilities = []
+    for feature in collection.get("features", []):
+        geometry = feature.get("geometry") or {}
+        if geometry.get("type") != "Point":
+            continue
+        props = feature.get("properties") or {}
+        longitude, latitude = geometry["coordinates"][:2]
+        kind = props.get("type") or props.get("amenity") or props.get("healthcare")
+        facilities.append(_facility(props.get("name"), kind, latitude, longitude,
+                                    props.get("address"), props.get("phone")))
+    return facilities
+
+
+_index: Optional[FacilityIndex] = None
+_index_lock = threading.Lock()
+# Separate from _index_lock, which is held for the whole build
+_build_lock = threading.Lock()
+_build_thread: Optional[threading.Thread] = None
+
+
+def get_facility_index() -> FacilityIndex:
+    """Return the shared FacilityIndex for this process, built on first use"""
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                _index = FacilityIndex.from_file(FACILITIES_FILE)
+    return _index
+
+
+def build_facility_index_in_background() -> None:
+    """
+    Start building the shared index on a daemon thread and return at once;
+    a national list takes seconds, longer than a webhook may wait
+    """
+    global _build_thread
+    with _build_lock:
+        if _index is not None or _build_thread is not None:
+            return
+        _build_thread = threading.Thread(target=_build, name="facility-index", daemon=True)
+        _build_thread.start()
+
+
+def _build() -> None:
+    global _build_thread
+    try:
+        get_facility_index()
+    except Exception as e:
+        print(f"Facility index build failed: {str(e)}")
+    finally:
+        with _build_lock:
+            _build_thread = None
+
+
+def facility_index_if_ready() -> Optional[FacilityIndex]:
+    """The shared index, or None while it is still being built"""
+    if _index is None:
+        build_facility_index_in_background()
+    return _index
@@ -0,0 +1,75 @@
+import asyncio
+import threading
+from typing import Any, Callable, Dict, Iterable, Optional, Text, Tuple
+
+from .knowledge_store import KnowledgeStore
+
+# builder(knowledge, key, limit) -> rendered markdown, or None if not applicable
+Builder = Callable[[Any, Text, Optional[int]], Optional[Text]]
+# keys(knowledge) -> keys to pre-render for a section
+KeySource = Callable[[Any], Iterable[Text]]
+
+
+class FragmentCache:
+    """Pre-rendered response blocks keyed by (section, key, limit, knowledge version).
+
+    Sections are registered with a builder and the keys/limits to warm. The
+    whole cache is rebuilt when the KnowledgeStore reports a new version, so
+    a turn only has to look fragments up and join them. Call ``refresh()``
+    (or ``await arefresh()``) once per turn; ``get()`` reads the current
+    snapshot and never touches the disk.
+    """
+
+    def __init__(self, store: KnowledgeStore):
+        self.store = store
+        self._sections: Dict[Text, Tuple[Builder, KeySource, Tuple[Optional[int], ...]]] = {}
+        self._fragments: Dict[Tuple[Text, Text, Optional[int], int], Optional[Text]] = {}
+        self._knowledge = None
+        self._version = None
+        self._lock = threading.Lock()
+
+    def register(self, section: Text, builder: Builder, keys: KeySource,
+                 limits: Iterable[Optional[int]] = (None,)):
+        """Register a section builder; fragments are rendered on the next refresh"""
+        self._sections[section] = (builder, keys, tuple(limits))
+        self._version = None
+
+    def get(self, section: Text, key: Text, limit: Optional[int] = None) -> Optional[Text]:
+        """Return the pre-rendered fragment, or None when the key has no entry.
+
+        Only the registered keys and limits are served; anything else (e.g. a
+        raw entity string) is a miss and is not memoized, so user input can
+        not grow the cache.
+        """
+        if self._version is None:
+            self.refresh()
+        return self._fragments.get((section, key, limit, self._version))
+
+    def refresh(self):
+        """Rebuild every registered fragment if the knowledge version changed"""
+        knowledge = self.store.get()
+        if self._version == self.store.version:
+            return knowledge
+        with self._lock:
+            version = self.store.version
+            if self._version != version:
+                self._fragments = self._render_all(knowledge, version)
+                self._knowledge = knowledge
+                self._version = version
+        return knowledge
+
+    async def arefresh(self):
+        """Coroutine form of refresh(); reloads and re-rendering run in the default executor"""
+        knowledge = await self.store.aget()
+        if self._version != self.store.version:
+            loop = asyncio.get_running_loop()
+            knowledge = await loop.run_in_executor(None, self.refresh)
+        return knowledge
+
+    def _render_all(self, knowledge, version: int):
+        fragments = {}
+        for section, (builder, keys, limits) in self._sections.items():
+            for key in keys(knowledge):
+                for limit in limits:
+                    fragments[(section, key, limit, version)] = builder(knowledge, key, limit)
+        return fragments
@@ -0,0 +1,159 @@
+import asyncio
+import re
+import threading
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Text, Tuple
+
+from .knowledge_store import KnowledgeStore
+
+# Extra surface forms per knowledge key; the keys themselves are always indexed
+SYMPTOM_SYNONYMS = {
+    'fever': ['temperature', 'high temperature', 'feverish', 'pyrexia'],
+    'headache': ['head ache', 'head pain', 'migraine'],
+    'cough': ['coughing', 'dry cough', 'wet cough'],
+    'rash': ['skin rash', 'hives', 'itching', 'itchy skin'],
+    'pain': ['ache', 'aches', 'aching'],
+    'fatigue': ['tired', 'tiredness', 'exhaustion', 'weakness', 'low energy'],
+}
+
+DISEASE_SYNONYMS = {
+    'diabetes': ['diabetic', 'blood sugar'],
+    'heart_disease': ['heart problem', 'heart condition', 'cardiac disease', 'cardiovascular disease'],
+    'cancer': ['tumor', 'tumour'],
+    'infections': ['infection', 'infectious disease'],
+}
+
+# Words that grade a condition rather than name it; a multi-word query
+# need not match them ("severe cough" -> cough)
+MODIFIER_WORDS = frozenset([
+    'a', 'an', 'the', 'my', 'bad', 'mild', 'severe', 'slight', 'very', 'chronic', 'constant',
+    'sudden', 'high', 'low',
+])
+
+# Dice score at which two single words count as the same word (typos)
+WORD_THRESHOLD = 0.5
+
+_NON_WORD = re.compile(r"[^a-z0-9]+")
+
+
+def normalize(text: Text) -> Text:
+    return _NON_WORD.sub(' ', text.lower().replace('_', ' ')).strip()
+
+
+def trigrams(text: Text) -> frozenset:
+    padded = f"  {text} "
+    return frozenset(padded[i:i + 3] for i in range(len(padded) - 2))
+
+
+class TrigramIndex:
+    """Inverted trigram index from surface forms to canonical keys.
+
+    A lookup only visits the posting lists of the query's own trigrams, so
+    its cost depends on the query length, not on the number of entries.
+    Candidates are ranked by the Dice coefficient of their trigram sets.
+    For a multi-word query every word other than a modifier must match a
+    word of the candidate, so "chest pain" does not resolve to 'pain' and
+    "dry skin" does not resolve to 'rash' through "itchy skin".
+    """
+
+    def __init__(self, terms: Iterable[Tuple[Text, Text]]):
+        self._exact: Dict[Text, Text] = {}
+        self._keys: List[Text] = []
+        self._sizes: List[int] = []
+        self._words: List[Tuple[frozenset, ...]] = []
+        self._postings: Dict[Text, List[int]] = defaultdict(list)
+
+        for surface, key in terms:
+            surface = normalize(surface)
+            if not surface or surface in self._exact:
+                continue
+            self._exact[surface] = key
+            term_id = len(self._keys)
+            grams = trigrams(surface)
+            self._keys.append(key)
+            self._sizes.append(len(grams))
+            self._words.append(tuple(trigrams(word) for word in surface.split()))
+            for gram in grams:
+                self._postings[gram].append(term_id)
+
+    def lookup(self, text: Text, threshold: float = 0.5, limit: int = 3) -> List[Tuple[Text, float]]:
+        """Return up to ``limit`` (key, score) pairs scoring at least ``threshold``"""
+        query = normalize(text)
+        if not query:
+            return []
+        if query in self._exact:
+            return [(self._exact[query], 1.0)]
+
+        grams = trigrams(query)
+        shared: Dict[int, int] = defaultdict(int)
+        for gram in grams:
+            for term_id in self._postings.get(gram, ()):
+                shared[term_id] += 1
+
+        words = [trigrams(word) for word in query.split() if word not in MODIFIER_WORDS]
+        best: Dict[Text, float] = {}
+        for term_id, common in shared.items():
+            score = 2.0 * common / (len(grams) + self._sizes[term_id])
+            key = self._keys[term_id]
+            if score < threshold or score <= best.get(key, 0.0):
+                continue
+            if len(words) > 1 and not all(_matches_word(word, self._words[term_id]) for word in words):
+                continue
+            best[key] = score
+        return sorted(best.items(), key=lambda item: (-item[1], item[0]))[:limit]
+
+    def resolve(self, text: Text, threshold: float = 0.5) -> Optional[Text]:
+        """Best matching key for ``text`` or None"""
+        matches = self.lookup(text, threshold, limit=1)
+        return matches[0][0] if matches else None
+
+
+def _matches_word(word: frozenset, candidates: Iterable[frozenset]) -> bool:
+    return any(2.0 * len(word & other) / (len(word) + len(other)) >= WORD_THRESHOLD for other in candidates)
+
+
+class EntityResolver:
+    """Symptom and disease indexes, rebuilt when the knowledge version changes"""
+
+    def __init__(self, store: KnowledgeStore):
+        self.store = store
+        self._version = None
+        self._lock = threading.Lock()
+        self.symptoms = TrigramIndex(())
+        self.diseases = TrigramIndex(())
+
+    def refresh(self):
+        knowledge = self.store.get()
+        if self._version == self.store.version:
+            return
+        with self._lock:
+            version = self.store.version
+            if self._version != version:
+                self.symptoms = TrigramIndex(_terms(knowledge['symptoms'], SYMPTOM_SYNONYMS))
+                self.diseases = TrigramIndex(
+                    _terms(knowledge['disease_prevention'].get('specific', {}), DISEASE_SYNONYMS))
+                self._version = version
+
+    async def arefresh(self):
+        """Coroutine form of refresh(); rebuilding runs in the default executor"""
+        await self.store.aget()
+        if self._version != self.store.version:
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(None, self.refresh)
+
+    def symptom(self, value: Text) -> Optional[Text]:
+        if self._version is None:
+            self.refresh()
+        return self.symptoms.resolve(value)
+
+    def disease(self, value: Text) -> Optional[Text]:
+        if self._version is None:
+            self.refresh()
+        return self.diseases.resolve(value)
+
+
+def _terms(section, synonyms: Dict[Text, List[Text]]):
+    for key in section:
+        yield key, key
+        for synonym in synonyms.get(key, ()):
+            yield synonym, key
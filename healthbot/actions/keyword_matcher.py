@@ -0,0 +1,59 @@
+from collections import deque
+from typing import Dict, FrozenSet, Iterable, List, Text
+
+
+class KeywordMatcher:
+    """Aho-Corasick automaton mapping keyword tables to categories.
+
+    Built once from ``{category: [keywords]}``; ``match()`` walks the
+    message a single time and returns every category with a keyword that
+    occurs anywhere in it (same substring semantics as ``word in message``).
+    """
+
+    def __init__(self, tables: Dict[Text, Iterable[Text]]):
+        self._goto: List[Dict[Text, int]] = [{}]
+        self._fail: List[int] = [0]
+        outputs: List[set] = [set()]
+
+        for category, keywords in tables.items():
+            for keyword in keywords:
+                state = 0
+                for char in keyword.lower():
+                    nxt = self._goto[state].get(char)
+                    if nxt is None:
+                        nxt = len(self._goto)
+                        self._goto[state][char] = nxt
+                        self._goto.append({})
+                        self._fail.append(0)
+                        outputs.append(set())
+                    state = nxt
+                outputs[state].add(category)
+
+        # Breadth-first pass to wire failure links and merge outputs
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fail = self._fail[state]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                target = self._goto[fail].get(char, 0)
+                self._fail[nxt] = target if target != nxt else 0
+                outputs[nxt] |= outputs[self._fail[nxt]]
+
+        self._out: List[FrozenSet[Text]] = [frozenset(found) for found in outputs]
+        self.categories = frozenset(tables)
+
+    def match(self, text: Text) -> FrozenSet[Text]:
+        """Return all categories whose keywords appear in ``text``"""
+        goto, fail, out = self._goto, self._fail, self._out
+        found = set()
+        state = 0
+        for char in text.lower():
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if out[state]:
+                found |= out[state]
+        return frozenset(found)
@@ -0,0 +1,55 @@
+import hashlib
+import json
+import marshal
+import os
+from pathlib import Path
+from typing import Any, Dict, Optional, Text
+
+# Header line: magic, marshal format version, content digest
+SNAPSHOT_MAGIC = b"MEDKNOW"
+
+
+def snapshot_path_for(json_path: Path) -> Path:
+    """medical_knowledge.json -> medical_knowledge.snapshot"""
+    return Path(json_path).with_suffix(".snapshot")
+
+
+def knowledge_digest(knowledge: Dict[Text, Any]) -> Text:
+    """Stable content hash used as the knowledge version"""
+    canonical = json.dumps(knowledge, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()[:16]
+
+
+def write_snapshot(knowledge: Dict[Text, Any], path: Path, source_path: Optional[Path] = None) -> Text:
+    """Write a marshal snapshot of the knowledge base and return its digest"""
+    path = Path(path)
+    digest = knowledge_digest(knowledge)
+    source_mtime_ns = os.stat(source_path).st_mtime_ns if source_path and Path(source_path).exists() else None
+    payload = marshal.dumps({
+        "digest": digest,
+        "source_mtime_ns": source_mtime_ns,
+        "knowledge": knowledge,
+    })
+    header = b"%s %d %s\n" % (SNAPSHOT_MAGIC, marshal.version, digest.encode("ascii"))
+
+    tmp_path = path.with_suffix(path.suffix + ".tmp")
+    with open(tmp_path, "wb") as f:
+        f.write(header)
+        f.write(payload)
+    os.replace(tmp_path, path)
+    return digest
+
+
+def read_snapshot(path: Path) -> Optional[Dict[Text, Any]]:
+    """Load a snapshot written by write_snapshot(), or None if unusable"""
+    try:
+        with open(path, "rb") as f:
+            header = f.readline().split()
+            if len(header) != 3 or header[0] != SNAPSHOT_MAGIC or int(header[1]) != marshal.version:
+                return None
+            snapshot = marshal.loads(f.read())
+    except (OSError, ValueError, EOFError, TypeError):
+        return None
+    if not isinstance(snapshot, dict) or "knowledge" not in snapshot:
+        return None
+    return snapshot
@@ -0,0 +1,175 @@
+import asyncio
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any, Dict, Optional, Text, Tuple
+
+from .knowledge_snapshot import knowledge_digest, read_snapshot, snapshot_path_for
+
+# MEDICAL_KNOWLEDGE_FILE points a process (e.g. a batch replay) at another knowledge file
+KNOWLEDGE_FILE = Path(os.environ.get(
+    "MEDICAL_KNOWLEDGE_FILE",
+    Path(__file__).resolve().parent.parent / "medical_knowledge.json",
+))
+
+# Seconds between mtime checks; keeps the per-turn cost to a clock read
+STAT_INTERVAL = 1.0
+
+
+def create_basic_knowledge_base() -> Dict[Text, Any]:
+    """Create a basic medical knowledge base as fallback"""
+    return {
+        'symptoms': {
+            'fever': {
+                'description': 'Elevated body temperature above normal',
+                'possible_causes': ['Infection', 'Inflammation'],
+                'first_aid': ['Rest', 'Hydration', 'Cool compresses'],
+                'when_to_see_doctor': 'If above 104°F or lasting more than 3 days'
+            }
+        },
+        'vaccinations': {
+            'covid_19': {
+                'types': ['mRNA vaccines', 'Protein subunit'],
+                'schedule': 'Primary series + boosters',
+                'side_effects': ['Pain at injection site', 'Fatigue'],
+                'effectiveness': 'High effectiveness against severe disease'
+            }
+        },
+        'diet_plans': {
+            'diabetes': {
+                'focus': 'Blood sugar control',
+                'foods_to_eat': ['Non-starchy vegetables', 'Lean proteins'],
+                'foods_to_limit': ['Sugary drinks', 'Refined carbs'],
+                'meal_timing': 'Regular meals throughout day'
+            }
+        },
+        'disease_prevention': {
+            'general': [
+                'Regular hand washing',
+                'Balanced diet',
+                'Regular exercise',
+                'Adequate sleep'
+            ],
+            'specific': {
+                'diabetes': 'Maintain healthy weight and exercise regularly',
+                'heart_disease': 'No smoking and control blood pressure'
+            }
+        }
+    }
+
+
+def freeze(value: Any) -> Any:
+    """Recursively turn dicts into read-only mappings and lists into tuples"""
+    if isinstance(value, dict):
+        return MappingProxyType({key: freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(freeze(item) for item in value)
+    return value
+
+
+class KnowledgeStore:
+    """Process-wide, hot-reloading, read-only view of medical_knowledge.json.
+
+    Loads the precompiled ``medical_knowledge.snapshot`` written by
+    MedicalDataProcessor when it matches the JSON file, and falls back to
+    parsing the JSON otherwise.
+    """
+
+    def __init__(self, path: Path = KNOWLEDGE_FILE, stat_interval: float = STAT_INTERVAL):
+        self.path = Path(path)
+        self.snapshot_path = snapshot_path_for(self.path)
+        self.stat_interval = stat_interval
+        self._lock = threading.Lock()
+        self._knowledge = None
+        self._signature = None
+        self._next_stat = 0.0
+        self.version = 0
+        self.digest = None
+        self.source = None
+
+    def get(self):
+        """Return the current knowledge, reloading only if the files changed"""
+        if self._knowledge is None or self._stale():
+            self.reload()
+        return self._knowledge
+
+    async def aget(self):
+        """Coroutine form of get(); a reload runs in the default executor"""
+        if self._knowledge is None or self._stale():
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(None, self.reload)
+        return self._knowledge
+
+    def _stale(self) -> bool:
+        now = time.monotonic()
+        if now < self._next_stat:
+            return False
+        self._next_stat = now + self.stat_interval
+        return self._current_signature() != self._signature
+
+    def _current_signature(self) -> Tuple[Optional[int], Optional[int]]:
+        return _mtime_ns(self.path), _mtime_ns(self.snapshot_path)
+
+    def reload(self):
+        """Load the knowledge files and swap in a new frozen view"""
+        with self._lock:
+            signature = self._current_signature()
+            if self._knowledge is not None and signature == self._signature:
+                return self._knowledge
+            knowledge, digest, source = self._load(signature[0])
+            self._knowledge = freeze(knowledge)
+            self._signature = signature
+            self._next_stat = time.monotonic() + self.stat_interval
+            self.digest = digest
+            self.source = source
+            self.version += 1
+            return self._knowledge
+
+    def _load(self, json_mtime_ns: Optional[int]):
+        snapshot = read_snapshot(self.snapshot_path)
+        if snapshot is not None and (json_mtime_ns is None or snapshot.get('source_mtime_ns') == json_mtime_ns):
+            return self._with_sections(snapshot['knowledge']), snapshot['digest'], 'snapshot'
+
+        if json_mtime_ns is None:
+            knowledge = create_basic_knowledge_base()
+            return knowledge, knowledge_digest(knowledge), 'builtin'
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                knowledge = json.load(f)
+        except Exception as e:
+            print(f"Error loading medical knowledge: {e}")
+            knowledge = create_basic_knowledge_base()
+            return knowledge, knowledge_digest(knowledge), 'builtin'
+        return self._with_sections(knowledge), knowledge_digest(knowledge), 'json'
+
+    def _with_sections(self, knowledge: Dict[Text, Any]) -> Dict[Text, Any]:
+        # Ensure all required sections exist
+        knowledge.setdefault('symptoms', {})
+        knowledge.setdefault('vaccinations', {})
+        knowledge.setdefault('diet_plans', {})
+        knowledge.setdefault('disease_prevention', {'general': [], 'specific': {}})
+        return knowledge
+
+
+def _mtime_ns(path: Path) -> Optional[int]:
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_knowledge_store() -> KnowledgeStore:
+    """Return the shared KnowledgeStore for this process"""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = KnowledgeStore()
+    return _store
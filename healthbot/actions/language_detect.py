@@ -0,0 +1,125 @@
+import re
+from collections import namedtuple
+from functools import lru_cache
+from typing import Dict, Iterable, Optional, Text, Tuple
+
+Detection = namedtuple("Detection", "language confidence")
+
+# Below this confidence a message (digits, emoji, "ok") says little about
+# the sender's language, and callers keep the language they had
+MIN_CONFIDENCE = 0.6
+
+# Share of a Latin-script message's trigrams that must come from one
+# language's romanized cue words before it counts as that language
+ROMANIZED_THRESHOLD = 0.5
+
+# Trigrams of Latin text needed for full confidence (about three words)
+FULL_EVIDENCE_TRIGRAMS = 10
+
+# Common words of romanized Hindi and Odia, as typed on phone keyboards
+ROMANIZED_CUES = {
+    'hi': [
+        'hai', 'hain', 'nahi', 'nahin', 'mujhe', 'mera', 'meri', 'kya', 'kaise', 'kyon', 'kab',
+        'aap', 'haan', 'raha', 'rahi', 'bukhar', 'dard', 'khansi', 'ulti', 'dast', 'pet',
+        'dawai', 'dawa', 'bimari', 'tabiyat', 'kripya', 'bahut', 'thoda', 'chahiye', 'karna',
+    ],
+    'or': [
+        'mora', 'mote', 'mun', 'apana', 'achhi', 'achi', 'kana', 'kemiti', 'kahinki', 'jara',
+        'dehare', 'peta', 'bindha', 'kasa', 'thanda', 'heuchi', 'hauchi', 'asuchi', 'laguchi',
+        'au', 'nahin', 'bahut', 'taka', 'ausadha', 'dakta', 'kariba', 'darakar',
+    ],
+}
+
+# In the order _script_counts() returns them
+SCRIPTS = ('latin', 'devanagari', 'oriya')
+
+_ASCII_LETTERS = frozenset("abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ")
+_LATIN_WORD = re.compile(r"[a-z]+")
+_ASCII_LETTER = re.compile(r"[A-Za-z]")
+
+
+def _trigrams(word: Text) -> Iterable[Text]:
+    padded = f" {word} "
+    return (padded[i:i + 3] for i in range(len(padded) - 2))
+
+
+def _cue_trigrams(cues: Dict[Text, list]) -> Dict[Text, frozenset]:
+    return {lang: frozenset(t for word in words for t in _trigrams(word)) for lang, words in cues.items()}
+
+
+_CUE_TRIGRAMS = _cue_trigrams(ROMANIZED_CUES)
+
+
+@lru_cache(maxsize=16384)
+def _word_hits(word: Text):
+    """(trigram count, cue hits per language) of one lower-case word"""
+    trigrams = list(_trigrams(word))
+    return len(trigrams), tuple(sum(t in cue for t in trigrams) for cue in _CUE_TRIGRAMS.values())
+
+
+def romanized_scores(text: Text):
+    """
+    Share of the text's word trigrams found in each language's cue words,
+    and the number of trigrams seen
+    """
+    total = 0
+    hits = [0] * len(_CUE_TRIGRAMS)
+    for word in _LATIN_WORD.findall(text.lower()):
+        count, word_hits = _word_hits(word)
+        total += count
+        for i, n in enumerate(word_hits):
+            hits[i] += n
+    return {lang: (n / total if total else 0.0) for lang, n in zip(_CUE_TRIGRAMS, hits)}, total
+
+
+def _script_counts(message: Text) -> Tuple[int, int, int]:
+    """Letters of (Latin, Devanagari, Oriya); an ASCII message counts as one Latin letter"""
+    if message.isascii():
+        return (1, 0, 0) if _ASCII_LETTER.search(message) else (0, 0, 0)
+    latin = devanagari = oriya = 0
+    for ch in message:
+        if ch < '\u0080':
+            if ch in _ASCII_LETTERS:
+                latin += 1
+        elif '\u0900' <= ch <= '\u097f':
+            devanagari += 1
+        elif '\u0b00' <= ch <= '\u0b7f':
+            oriya += 1
+    return latin, devanagari, oriya
+
+
+def dominant_script(message: Text) -> Optional[Text]:
+    """'latin', 'devanagari' or 'oriya', whichever has the most letters; None without letters"""
+    counts = _script_counts(message)
+    if not any(counts):
+        return None
+    return SCRIPTS[counts.index(max(counts))]
+
+
+@lru_cache(maxsize=4096)
+def detect_language(message: Text) -> Detection:
+    """
+    Classify a message as 'en', 'hi' or 'or'.
+
+    One pass over the code points counts Devanagari (U+0900-097F), Oriya
+    (U+0B00-0B7F) and ASCII letters; the dominant script decides, and its
+    share of the letters is the confidence. Latin-script text is then
+    checked for romanized Hindi or Odia by character trigrams.
+    """
+    latin, devanagari, oriya = _script_counts(message)
+    letters = latin + devanagari + oriya
+    if not letters:
+        return Detection('en', 0.0)
+
+    if devanagari > latin and devanagari >= oriya:
+        return Detection('hi', devanagari / letters)
+    if oriya > latin:
+        return Detection('or', oriya / letters)
+
+    scores, seen = romanized_scores(message)
+    # A word or two ("ok", "yes") is weak evidence either way
+    share = latin / letters * min(1.0, seen / FULL_EVIDENCE_TRIGRAMS)
+    lang = max(scores, key=scores.get)
+    if scores[lang] >= ROMANIZED_THRESHOLD:
+        return Detection(lang, share * scores[lang])
+    return Detection('en', share * (1 - scores[lang]))
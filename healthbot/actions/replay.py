@@ -0,0 +1,53 @@
+import inspect
+from typing import Any, Dict, List, Optional, Text, Tuple
+
+from rasa_sdk import Action, Tracker
+from rasa_sdk.executor import CollectingDispatcher
+
+from . import actions as action_module
+
+
+def discover_actions() -> Dict[Text, Action]:
+    """Instantiate every custom action, keyed by its action name"""
+    found = {}
+    for _, cls in inspect.getmembers(action_module, inspect.isclass):
+        if issubclass(cls, Action) and cls is not Action and cls.__module__ == action_module.__name__:
+            action = cls()
+            found[action.name()] = action
+    return found
+
+
+ACTIONS = discover_actions()
+
+
+def make_tracker(state: Dict[Text, Any]) -> Tracker:
+    """Build a Tracker from a synthetic turn.
+
+    ``state`` keys: text, entities, intent, slots, sender_id, events, metadata.
+    Only ``text`` is required.
+    """
+    latest_message = {
+        'text': state.get('text', ''),
+        'entities': state.get('entities', []),
+        'intent': state.get('intent') or {},
+    }
+    if state.get('metadata'):
+        latest_message['metadata'] = state['metadata']
+    return Tracker(
+        sender_id=state.get('sender_id', 'replay'),
+        slots=state.get('slots', {}),
+        latest_message=latest_message,
+        events=state.get('events', []),
+        paused=False,
+        followup_action=None,
+        active_loop={},
+        latest_action_name=None,
+    )
+
+
+async def run_action(name: Text, state: Dict[Text, Any],
+                     dispatcher: Optional[CollectingDispatcher] = None) -> Tuple[List[Dict[Text, Any]], List[Dict[Text, Any]]]:
+    """Run one action against a synthetic turn; returns (messages, events)"""
+    dispatcher = dispatcher or CollectingDispatcher()
+    events = await ACTIONS[name].run(dispatcher, make_tracker(state), {})
+    return dispatcher.messages, events or []
@@ -0,0 +1,233 @@
+"""
+Per-turn latency spans shared by Django and the action server.
+
+Django assigns a request ID per turn and forwards it in the Rasa message
+metadata, so spans from both processes can be joined on it. Spans go to an
+in-memory window (for p50/p99 and the Prometheus text export) and, when
+HEALTHBOT_TRACE_FILE is set, are appended to that JSONL file.
+
+Report on a trace file written by one or more processes:
+    python -m actions.tracing traces.jsonl
+    python -m actions.tracing traces.jsonl --prometheus
+"""
+
+import argparse
+import functools
+import inspect
+import json
+import os
+import threading
+import time
+import uuid
+from collections import defaultdict, deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterable, List, Optional, Text
+
+# Set per request in Django and per action run, so nested spans pick it up
+request_id_var: ContextVar[Optional[Text]] = ContextVar('request_id', default=None)
+
+
+def new_request_id() -> Text:
+    return uuid.uuid4().hex
+
+
+def percentile(values: List[float], pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+class Tracer:
+    """Records timed spans per stage.
+
+    Quantiles cover the last ``window`` spans of each stage; counts, sums
+    and errors are cumulative since the process started.
+    """
+
+    def __init__(self, sink_path: Optional[Text] = None, window: int = 2048):
+        self.sink_path = sink_path
+        self._window = window
+        self._durations: Dict[Text, deque] = defaultdict(lambda: deque(maxlen=self._window))
+        self._totals: Dict[Text, List[float]] = defaultdict(lambda: [0, 0.0, 0])  # count, sum, errors
+        self._lock = threading.Lock()
+        self._sink = open(sink_path, 'a', encoding='utf-8', buffering=1) if sink_path else None
+
+    @contextmanager
+    def span(self, stage: Text, request_id: Optional[Text] = None, **attrs):
+        """Time the enclosed block; the yielded dict takes extra attributes.
+
+        Set ``span['status'] = 'error'`` for failures that are handled
+        inside the block; exceptions escaping it are recorded automatically.
+        """
+        span = {'status': 'ok', **attrs}
+        start_wall = time.time()
+        start = time.perf_counter()
+        try:
+            yield span
+        except BaseException:
+            span['status'] = 'error'
+            raise
+        finally:
+            self.record(stage, time.perf_counter() - start, request_id or request_id_var.get(),
+                        start=start_wall, **span)
+
+    def traced(self, stage: Text):
+        """Decorator form of span() for plain and async functions"""
+        def decorator(func):
+            if inspect.iscoroutinefunction(func):
+                @functools.wraps(func)
+                async def async_wrapper(*args, **kwargs):
+                    with self.span(stage):
+                        return await func(*args, **kwargs)
+                return async_wrapper
+
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                with self.span(stage):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def record(self, stage: Text, duration: float, request_id: Optional[Text] = None,
+               status: Text = 'ok', start: Optional[float] = None, **attrs):
+        with self._lock:
+            self._durations[stage].append(duration)
+            totals = self._totals[stage]
+            totals[0] += 1
+            totals[1] += duration
+            totals[2] += status != 'ok'
+            if self._sink:
+                self._sink.write(json.dumps({
+                    'ts': start if start is not None else time.time(),
+                    'request_id': request_id,
+                    'stage': stage,
+                    'duration_ms': round(duration * 1000, 3),
+                    'status': status,
+                    'pid': os.getpid(),
+                    **attrs,
+                }, default=str) + "\n")
+
+    def summary(self) -> Dict[Text, Dict[Text, float]]:
+        """Per-stage count, errors and p50/p99 in milliseconds"""
+        with self._lock:
+            windows = {stage: list(d) for stage, d in self._durations.items()}
+            totals = {stage: list(t) for stage, t in self._totals.items()}
+        return {
+            stage: {
+                'count': totals[stage][0],
+                'errors': totals[stage][2],
+                'p50_ms': percentile(durations, 50) * 1000,
+                'p99_ms': percentile(durations, 99) * 1000,
+            }
+            for stage, durations in sorted(windows.items()) if durations
+        }
+
+    def prometheus(self) -> Text:
+        """Prometheus text exposition of the per-stage latencies"""
+        with self._lock:
+            windows = {stage: list(d) for stage, d in self._durations.items()}
+            totals = {stage: list(t) for stage, t in self._totals.items()}
+        return prometheus_text(windows, totals)
+
+
+def prometheus_text(windows: Dict[Text, List[float]], totals: Dict[Text, List[float]]) -> Text:
+    lines = [
+        "# HELP healthbot_stage_duration_seconds Latency per turn stage",
+        "# TYPE healthbot_stage_duration_seconds summary",
+    ]
+    for stage in sorted(windows):
+        durations = windows[stage]
+        if not durations:
+            continue
+        for quantile, pct in (("0.5", 50), ("0.9", 90), ("0.99", 99)):
+            lines.append(f'healthbot_stage_duration_seconds{{stage="{stage}",quantile="{quantile}"}} '
+                         f'{percentile(durations, pct):.6f}')
+        lines.append(f'healthbot_stage_duration_seconds_sum{{stage="{stage}"}} {totals[stage][1]:.6f}')
+        lines.append(f'healthbot_stage_duration_seconds_count{{stage="{stage}"}} {totals[stage][0]}')
+    lines += [
+        "# HELP healthbot_stage_errors_total Spans that ended in an error",
+        "# TYPE healthbot_stage_errors_total counter",
+    ]
+    for stage in sorted(totals):
+        lines.append(f'healthbot_stage_errors_total{{stage="{stage}"}} {totals[stage][2]}')
+    return "\n".join(lines) + "\n"
+
+
+_tracer = None
+_tracer_lock = threading.Lock()
+
+
+def get_tracer() -> Tracer:
+    """Process-wide tracer; HEALTHBOT_TRACE_FILE enables the JSONL sink"""
+    global _tracer
+    if _tracer is None:
+        with _tracer_lock:
+            if _tracer is None:
+                _tracer = Tracer(os.environ.get('HEALTHBOT_TRACE_FILE'))
+    return _tracer
+
+
+def request_id_from_tracker(tracker) -> Optional[Text]:
+    """Request ID that Django put in the metadata of the latest user message"""
+    for event in reversed(tracker.events or []):
+        if event.get('event') == 'user':
+            request_id = (event.get('metadata') or {}).get('request_id')
+            if request_id:
+                return request_id
+            break
+    return (tracker.latest_message.get('metadata') or {}).get('request_id')
+
+
+def traced_action(run):
+    """Wrap an Action.run() coroutine in an ``action.<name>`` span"""
+    @functools.wraps(run)
+    async def wrapper(self, dispatcher, tracker, domain):
+        token = request_id_var.set(request_id_from_tracker(tracker))
+        try:
+            with get_tracer().span(f"action.{self.name()}"):
+                return await run(self, dispatcher, tracker, domain)
+        finally:
+            request_id_var.reset(token)
+    return wrapper
+
+
+def load_spans(paths: Iterable[Text]) -> Iterable[Dict[Text, Any]]:
+    for path in paths:
+        with open(path, encoding='utf-8') as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('paths', nargs='+', help="JSONL trace files")
+    parser.add_argument('--prometheus', action='store_true', help="print Prometheus text instead of a table")
+    args = parser.parse_args(argv)
+
+    windows: Dict[Text, List[float]] = defaultdict(list)
+    totals: Dict[Text, List[float]] = defaultdict(lambda: [0, 0.0, 0])
+    requests = set()
+    for span in load_spans(args.paths):
+        duration = span['duration_ms'] / 1000
+        windows[span['stage']].append(duration)
+        totals[span['stage']][0] += 1
+        totals[span['stage']][1] += duration
+        totals[span['stage']][2] += span.get('status') != 'ok'
+        if span.get('request_id'):
+            requests.add(span['request_id'])
+
+    if args.prometheus:
+        print(prometheus_text(windows, totals), end="")
+        return
+
+    print(f"{len(requests)} requests\n")
+    print(f"{'stage':<40} {'count':>7} {'errors':>7} {'p50 ms':>9} {'p99 ms':>9}")
+    for stage in sorted(windows):
+        durations = windows[stage]
+        print(f"{stage:<40} {len(durations):>7} {totals[stage][2]:>7} "
+              f"{percentile(durations, 50) * 1000:>9.2f} {percentile(durations, 99) * 1000:>9.2f}")
+
+
+if __name__ == '__main__':
+    main()
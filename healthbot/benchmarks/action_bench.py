@@ -0,0 +1,123 @@
+"""
+Offline micro-benchmark for the custom actions.
+
+Replays user turns from datasets/medical_conversations.csv through every
+action in actions/actions.py using synthetic Trackers and a plain
+CollectingDispatcher. No Rasa or action server is needed.
+
+Usage (from the healthbot directory):
+    python -m benchmarks.action_bench
+    python -m benchmarks.action_bench --json before.json
+    python -m benchmarks.action_bench --compare before.json
+"""
+
+import argparse
+import asyncio
+import csv
+import json
+import statistics
+import time
+import tracemalloc
+from pathlib import Path
+
+from actions.knowledge_store import get_knowledge_store
+from actions.replay import ACTIONS, run_action
+
+CORPUS_FILE = Path(__file__).resolve().parent.parent / "datasets" / "medical_conversations.csv"
+
+
+def load_user_turns(path=CORPUS_FILE, limit=None):
+    """Extract the 'User:' turns from the conversations dataset"""
+    turns = []
+    with open(path, encoding='utf-8') as f:
+        for row in csv.DictReader(f):
+            for turn in row.get('conversations', '').split('</s>'):
+                turn = turn.strip()
+                if turn.startswith('User:'):
+                    turns.append(turn[len('User:'):].strip())
+                    if limit and len(turns) >= limit:
+                        return turns
+    return turns
+
+
+def synthetic_states(turns):
+    """Attach symptom/disease entities the way the NLU would for known keys"""
+    knowledge = get_knowledge_store().get()
+    symptoms = list(knowledge['symptoms'])
+    diseases = list(knowledge['disease_prevention'].get('specific', {}))
+    states = []
+    for text in turns:
+        lowered = text.lower()
+        entities = [{'entity': 'symptom', 'value': s} for s in symptoms if s in lowered]
+        entities += [{'entity': 'disease', 'value': d} for d in diseases if d in lowered]
+        states.append({'text': text, 'entities': entities})
+    return states
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+async def bench_action(name, states, rounds):
+    latencies = []
+    for _ in range(rounds):
+        for state in states:
+            start = time.perf_counter()
+            await run_action(name, state)
+            latencies.append(time.perf_counter() - start)
+
+    # Separate pass so tracing overhead does not skew the timings
+    tracemalloc.start()
+    peaks = []
+    for state in states:
+        tracemalloc.reset_peak()
+        base = tracemalloc.get_traced_memory()[0]
+        await run_action(name, state)
+        peaks.append(tracemalloc.get_traced_memory()[1] - base)
+    tracemalloc.stop()
+
+    total = sum(latencies)
+    return {
+        'ops': len(latencies),
+        'ops_per_sec': len(latencies) / total if total else 0.0,
+        'p50_us': percentile(latencies, 50) * 1e6,
+        'p99_us': percentile(latencies, 99) * 1e6,
+        'alloc_kib_per_op': statistics.mean(peaks) / 1024,
+    }
+
+
+async def main(args):
+    states = synthetic_states(load_user_turns(limit=args.limit))
+    names = args.actions or sorted(ACTIONS)
+    # Warm the knowledge store and fragment cache before timing
+    for name in names:
+        await run_action(name, states[0])
+
+    results = {}
+    for name in names:
+        results[name] = await bench_action(name, states, args.rounds)
+
+    baseline = json.loads(Path(args.compare).read_text()) if args.compare else {}
+    print(f"Replayed {len(states)} user turns x {args.rounds} rounds\n")
+    print(f"{'action':<30} {'ops/s':>10} {'p50 us':>9} {'p99 us':>9} {'KiB/op':>8} {'vs base':>8}")
+    for name, r in results.items():
+        delta = ""
+        if name in baseline and baseline[name]['ops_per_sec']:
+            change = (r['ops_per_sec'] / baseline[name]['ops_per_sec'] - 1) * 100
+            delta = f"{change:+.1f}%"
+        print(f"{name:<30} {r['ops_per_sec']:>10.0f} {r['p50_us']:>9.1f} {r['p99_us']:>9.1f} "
+              f"{r['alloc_kib_per_op']:>8.1f} {delta:>8}")
+
+    if args.json:
+        Path(args.json).write_text(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--actions", nargs="*", help="action names to run (default: all)")
+    parser.add_argument("--rounds", type=int, default=3, help="passes over the corpus per action")
+    parser.add_argument("--limit", type=int, default=None, help="cap on replayed user turns")
+    parser.add_argument("--json", help="write results to this file")
+    parser.add_argument("--compare", help="baseline results file from an earlier --json run")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,100 @@
+"""
+Benchmark the facility index behind handle_location_message against a
+linear distance scan, on a synthetic national-scale facility list.
+
+Facilities are clustered around random "towns" inside India's bounding
+box, and queries are drawn near them. Every indexed answer is checked
+against the scan before timing. No Django setup is needed.
+
+Usage (from the healthbot directory):
+    python -m benchmarks.facility_bench
+    python -m benchmarks.facility_bench --facilities 200000 --queries 2000
+"""
+
+import argparse
+import random
+import sys
+import time
+
+from actions.facility_index import Facility, FacilityIndex, distance_km
+
+KINDS = ["hospital", "clinic", "pharmacy"]
+
+
+def synthetic_facilities(count, towns=2000, seed=7):
+    rng = random.Random(seed)
+    centres = [(rng.uniform(8.0, 35.0), rng.uniform(68.0, 97.0)) for _ in range(towns)]
+    facilities = []
+    for n in range(count):
+        lat, lon = rng.choice(centres)
+        facilities.append(Facility(f"Facility {n}", rng.choice(KINDS), lat + rng.gauss(0, 0.05),
+                                   lon + rng.gauss(0, 0.05), "", ""))
+    return facilities, centres
+
+
+def scan_nearest(facilities, lat, lon, k, kind):
+    ranked = sorted((distance_km(lat, lon, f.latitude, f.longitude), f.name)
+                    for f in facilities if kind is None or f.kind == kind)
+    return [name for _, name in ranked[:k]]
+
+
+def scan_within(facilities, lat, lon, radius_km, kind):
+    return sorted(f.name for f in facilities
+                  if (kind is None or f.kind == kind)
+                  and distance_km(lat, lon, f.latitude, f.longitude) <= radius_km)
+
+
+def timed(func, queries):
+    start = time.perf_counter()
+    for query in queries:
+        func(*query)
+    return (time.perf_counter() - start) / len(queries) * 1000
+
+
+def main(args):
+    rng = random.Random(11)
+    facilities, centres = synthetic_facilities(args.facilities)
+
+    start = time.perf_counter()
+    index = FacilityIndex(facilities)
+    print(f"Indexed {len(facilities)} facilities in {time.perf_counter() - start:.2f}s")
+
+    queries = []
+    for _ in range(args.queries):
+        lat, lon = rng.choice(centres)
+        queries.append((lat + rng.gauss(0, 0.05), lon + rng.gauss(0, 0.05), rng.choice(KINDS + [None])))
+
+    mismatches = 0
+    for lat, lon, kind in queries[:args.check]:
+        indexed = [f.name for _, f in index.nearest(lat, lon, args.k, kind)]
+        mismatches += indexed != scan_nearest(facilities, lat, lon, args.k, kind)
+        indexed = sorted(f.name for _, f in index.within(lat, lon, args.radius, kind))
+        mismatches += indexed != scan_within(facilities, lat, lon, args.radius, kind)
+    print(f"Checked {args.check} queries against a linear scan: {mismatches} mismatches")
+
+    scan_ms = timed(lambda lat, lon, kind: scan_nearest(facilities, lat, lon, args.k, kind),
+                    queries[:max(1, args.check // 4)])
+    # The parity check warmed part of the cell cache; time from a cold one
+    index = FacilityIndex(facilities)
+    cold_ms = timed(lambda lat, lon, kind: index.nearest(lat, lon, args.k, kind), queries)
+    warm_ms = timed(lambda lat, lon, kind: index.nearest(lat, lon, args.k, kind), queries)
+    radius_ms = timed(lambda lat, lon, kind: index.within(lat, lon, args.radius, kind), queries)
+
+    print(f"\n{'query':<28} {'ms/query':>9}")
+    print(f"{'linear scan, ' + str(args.k) + '-nearest':<28} {scan_ms:>9.3f}")
+    print(f"{'index, ' + str(args.k) + '-nearest (cold)':<28} {cold_ms:>9.3f}")
+    print(f"{'index, ' + str(args.k) + '-nearest (cached)':<28} {warm_ms:>9.3f}")
+    print(f"{'index, within ' + str(args.radius) + ' km':<28} {radius_ms:>9.3f}")
+    info = index.cache_info()
+    print(f"\nCell cache: {info.currsize} entries, {info.hits} hits, {info.misses} misses")
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--facilities", type=int, default=200000)
+    parser.add_argument("--queries", type=int, default=2000)
+    parser.add_argument("--check", type=int, default=100, help="queries verified against the scan")
+    parser.add_argument("--k", type=int, default=5)
+    parser.add_argument("--radius", type=float, default=5.0, help="km")
+    sys.exit(main(parser.parse_args()))
@@ -0,0 +1,82 @@
+"""
+Stand-in for the Twilio Messages API, for load testing WhatsApp broadcasts
+without sending real messages.
+
+Accepts POST /2010-04-01/Accounts/<sid>/Messages.json and answers 201 with
+a message SID after ``--latency`` seconds. ``--fail-rate`` and
+``--throttle-rate`` make that share of requests answer 503 or 429, so the
+retry path of sangibani/broadcast.py can be exercised.
+
+Usage (from the healthbot directory):
+    python -m benchmarks.fake_twilio_server --port 8089 --latency 0.2 --fail-rate 0.05
+    set TWILIO_API_BASE_URL=http://127.0.0.1:8089
+"""
+
+import argparse
+import json
+import random
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs
+
+
+class FakeTwilioHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    options = None
+    counts = {}
+    lock = threading.Lock()
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        form = parse_qs(self.rfile.read(length).decode("utf-8"))
+        time.sleep(self.options.latency)
+
+        roll = random.random()
+        if not self.path.endswith("/Messages.json"):
+            status, body = 404, {"message": "Not found"}
+        elif roll < self.options.throttle_rate:
+            status, body = 429, {"code": 20429, "message": "Too Many Requests"}
+        elif roll < self.options.throttle_rate + self.options.fail_rate:
+            status, body = 503, {"message": "Service Unavailable"}
+        else:
+            status, body = 201, {
+                "sid": "SM" + uuid.uuid4().hex,
+                "to": form.get("To", [""])[0],
+                "status": "queued",
+            }
+        with self.lock:
+            self.counts[status] = self.counts.get(status, 0) + 1
+
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8089)
+    parser.add_argument("--latency", type=float, default=0.2, help="seconds before each reply")
+    parser.add_argument("--fail-rate", type=float, default=0.0, help="share of requests answered 503")
+    parser.add_argument("--throttle-rate", type=float, default=0.0, help="share of requests answered 429")
+    FakeTwilioHandler.options = parser.parse_args()
+
+    server = ThreadingHTTPServer((FakeTwilioHandler.options.host, FakeTwilioHandler.options.port), FakeTwilioHandler)
+    print(f"Fake Twilio listening on http://{server.server_address[0]}:{server.server_address[1]}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    print(f"Responses by status: {FakeTwilioHandler.counts}")
+
+
+if __name__ == "__main__":
+    main()
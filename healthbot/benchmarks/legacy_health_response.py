@@ -0,0 +1,510 @@
+"""
+Verbatim copy of get_custom_health_response as it was before the rule
+table in sangibani/rules/health_responses.json replaced it. Kept only as
+the baseline for benchmarks.rule_engine_bench; do not use it in the app.
+"""
+
+from actions.keyword_matcher import KeywordMatcher
+
+LEGACY_HEALTH_KEYWORDS = {
+    'diet': ['diet', 'food', 'nutrition', 'eat', 'meal', 'healthy eating'],
+    'symptom': ['pain', 'hurt', 'ache', 'symptom', 'fever', 'headache', 'cough'],
+    'diet.general': ['general', 'basic', 'normal', 'regular', 'standard', 'healthy eating'],
+    'diet.weight': ['weight', 'loss', 'slimming', 'obesity', 'weight management'],
+    'diet.gluten': ['gluten', 'celiac'],
+    'diet.meal_plan': ['meal plan', 'meal plans', 'daily meal', 'weekly meal', 'diet plan'],
+    'diet.condition': ['condition', 'conditions', 'disease', 'medical'],
+    'vaccine': ['vaccine', 'vaccination', 'covid'],
+    'vaccine.covid': ['covid', 'corona'],
+    'vaccine.flu': ['flu', 'influenza'],
+    'prevention': ['prevention', 'prevent', 'avoid'],
+    'prevention.stop': ['prevent', 'avoid', 'stop', 'prevention'],
+    'heart': ['heart', 'cardio'],
+    'cancer': ['cancer'],
+    'fever': ['fever'],
+    'fever.temperature': ['fever', 'temperature'],
+    'headache': ['headache', 'migraine'],
+    'cough': ['cough', 'coughing'],
+    'pain': ['pain', 'hurt', 'ache'],
+    'emergency': ['emergency', 'urgent', '911', 'help now'],
+    'exercise': ['exercise', 'workout', 'fitness', 'gym'],
+    'sleep': ['sleep', 'insomnia', 'tired', 'fatigue'],
+    'greeting': ['hello', 'hi', 'hey', 'namaste'],
+}
+
+legacy_keyword_matcher = KeywordMatcher(LEGACY_HEALTH_KEYWORDS)
+
+
+def get_custom_health_response(message):
+    """Provide custom health responses for WhatsApp"""
+    matches = legacy_keyword_matcher.match(message)
+    
+    # Diet and Nutrition - CHECK FIRST with exclusions
+    has_diet_keyword = 'diet' in matches
+    has_symptom_keyword = 'symptom' in matches
+    
+    if has_diet_keyword and not has_symptom_keyword:
+        if 'diet.general' in matches:
+            return """🥗 *General Healthy Eating Guide*
+
+*Balanced Diet Principles:*
+• Fill half your plate with fruits & vegetables
+• Choose whole grains (brown rice, whole wheat)
+• Include lean proteins (chicken, fish, lentils)
+• Healthy fats (avocado, nuts, olive oil)
+• Limit processed foods and sugar
+• Stay hydrated with water
+
+*Daily Goals:*
+• 5+ servings of fruits/vegetables
+• Variety of colors for different nutrients
+• Moderate portion sizes
+• Regular meal timing
+
+💡 *Quick options:* Type 'meal plans', 'weight management', or 'diet for conditions'"""
+        
+        elif 'diet.weight' in matches:
+            return """⚖️ *Weight Management Diet*
+
+*Healthy Weight Loss Strategies:*
+• Calorie control with nutrient-dense foods
+• Regular physical activity (150 mins/week)
+• Portion control and mindful eating
+• High protein intake for satiety
+• Limit sugar and processed foods
+
+*Key Principles:*
+• 1-2 lbs weight loss per week is safe
+• Combine cardio and strength training
+• Stay hydrated (8-10 glasses water/day)
+• Get adequate sleep (7-9 hours)
+
+💡 *Sustainable changes work better than quick fixes*"""
+        
+        elif 'diet.gluten' in matches:
+            return """🥗 *Gluten-Free Diet Information* 🌾
+
+*For:* Celiac disease, gluten sensitivity, wheat allergy
+
+*Naturally Gluten-Free Foods:*
+• Fruits and vegetables
+• Meat, poultry, fish (unbreaded)
+• Rice, quinoa, corn
+• Potatoes, sweet potatoes
+• Legumes, nuts, seeds
+
+*Foods to Avoid:*
+• Wheat, barley, rye
+• Most breads, pasta, cereals
+• Beer and malt beverages
+• Many processed foods
+
+*Important:* Read labels carefully, watch for cross-contamination
+
+⚠️ *Consult dietitian for complete gluten-free guidance*"""
+        
+        elif 'diet.meal_plan' in matches:
+            return """📅 *Sample Healthy Meal Plan*
+
+*Breakfast Options:*
+• Oatmeal with berries and nuts
+• Whole grain toast with avocado and eggs
+• Greek yogurt with fruit and honey
+• Smoothie with spinach, banana, and protein
+
+*Lunch Options:*
+• Grilled chicken salad with mixed greens
+• Quinoa bowl with roasted vegetables
+• Whole grain wrap with hummus and veggies
+• Lentil soup with whole grain bread
+
+*Dinner Options:*
+• Baked salmon with sweet potato and broccoli
+• Stir-fried tofu with brown rice and vegetables
+• Lean beef with quinoa and asparagus
+• Chicken and vegetable skewers
+
+*Healthy Snacks:*
+• Apple slices with peanut butter
+• Carrot sticks with hummus
+• Handful of nuts and seeds
+• Greek yogurt with berries"""
+        
+        elif 'diet.condition' in matches:
+            return """🏥 *Diet for Specific Health Conditions*
+
+I can provide dietary guidance for:
+
+*Heart Conditions:*
+• Low sodium, low saturated fat
+• High fiber, omega-3 fatty acids
+• DASH diet principles
+
+*Diabetes:*
+• Carbohydrate counting
+• Glycemic index awareness
+• Regular meal timing
+
+*Digestive Issues:*
+• High fiber for constipation
+• Low FODMAP for IBS
+• Gluten-free for celiac
+
+*Kidney Disease:*
+• Protein and potassium control
+• Phosphorus management
+• Fluid balance
+
+💡 *Please specify which condition you're interested in for detailed guidance.*"""
+        
+        else:
+            return """🥗 *Diet & Nutrition Guidance*
+
+I can help you with:
+• *General healthy eating* (type 'general healthy eating')
+• *Weight management diets* (type 'weight management')
+• *Meal planning* (type 'meal plans')
+• *Condition-specific diets* (type 'diet for conditions')
+• *Gluten-free eating* (type 'gluten free')
+
+What specific dietary information do you need?"""
+    
+    # Vaccine Information
+    elif 'vaccine' in matches:
+        if 'vaccine.covid' in matches:
+            return """💉 *COVID-19 Vaccine Information* 🦠
+
+*Available Vaccines:*
+• mRNA vaccines (Pfizer, Moderna)
+• Protein subunit vaccines (Novavax)
+• Vector vaccines (Johnson & Johnson)
+
+*Common Side Effects:*
+• Pain at injection site
+• Fatigue, headache
+• Muscle pain, fever
+• Chills, nausea
+
+*Effectiveness:* High protection against severe disease (90%+)
+
+*Booster Recommendation:* Stay updated as per health authority guidelines
+
+*Precautions:* Consult doctor if immunocompromised or have history of severe allergies"""
+        
+        elif 'vaccine.flu' in matches:
+            return """💉 *Influenza (Flu) Vaccine* 🤧
+
+*Types Available:*
+• Standard quadrivalent
+• High-dose (for seniors)
+• Egg-free options
+• Nasal spray (LAIV)
+
+*When to Get:* Annually, before flu season (October-November)
+
+*Who Should Get:* Everyone 6 months and older
+
+*Effectiveness:* 40-60% effective in preventing flu
+
+*Special Groups:* Essential for pregnant women, seniors, children"""
+        
+        else:
+            return """💉 *Vaccine Information*
+
+*COVID-19 Vaccines:*
+• mRNA vaccines (Pfizer, Moderna)
+• Protein subunit (Novavax)
+• Vector vaccines (Johnson & Johnson)
+• High protection against severe disease
+
+*Other Vaccines:*
+• Flu shots (annual)
+• Childhood immunization schedule
+• Travel vaccines
+• HPV, Hepatitis, etc.
+
+💡 *Quick options:* Type 'covid vaccine', 'child vaccines', or 'travel vaccines'"""
+    
+    # Prevention - CHECK BEFORE SYMPTOMS
+    elif 'prevention' in matches:
+        if 'fever' in matches:
+            return """🛡️ *Fever Prevention Strategies*
+
+*General Prevention:*
+• Practice good hand hygiene regularly
+• Avoid close contact with sick individuals
+• Maintain a strong immune system through balanced nutrition
+• Stay hydrated throughout the day
+• Get adequate rest and sleep
+
+*Infection Prevention:*
+• Keep up with recommended vaccinations
+• Practice food safety and proper cooking
+• Avoid sharing personal items when sick
+• Clean and disinfect frequently touched surfaces
+
+*Immune Support:*
+• Eat a variety of fruits and vegetables
+• Include immune-supporting nutrients (Vitamin C, Zinc)
+• Engage in regular moderate exercise
+• Maintain healthy gut microbiome
+
+💡 *While fever itself isn't always preventable, these strategies reduce your risk of infections that commonly cause fever.*"""
+        
+        elif 'heart' in matches:
+            return """❤️ *Heart Disease Prevention*
+
+*Lifestyle Changes:*
+• No smoking, limit alcohol
+• Regular exercise (150 mins/week)
+• Healthy weight maintenance
+• Stress management
+
+*Dietary Recommendations:*
+• Limit saturated/trans fats
+• Increase fiber intake
+• Omega-3 fatty acids
+• Limit sodium, added sugars
+
+*Medical Management:*
+• Control blood pressure
+• Manage cholesterol
+• Control diabetes
+• Regular check-ups"""
+        
+        elif 'cancer' in matches:
+            return """🦀 *Cancer Prevention Strategies*
+
+*Lifestyle Factors:*
+• No tobacco in any form
+• Limit alcohol consumption
+• Maintain healthy weight
+• Regular physical activity
+
+*Dietary Recommendations:*
+• Fruits and vegetables
+• Whole grains, fiber
+• Limit processed meats
+• Balanced, varied diet
+
+*Early Detection:*
+• Regular screenings
+• Know family history
+• Self-examinations
+• Prompt medical attention"""
+        
+        else:
+            return """🛡️ *Disease Prevention*
+
+*General Prevention:*
+• Wash hands frequently
+• Balanced nutrition
+• Regular exercise
+• Adequate sleep (7-9 hours)
+• Stress management
+• Regular health check-ups
+
+*Specific Prevention:*
+• Vaccinations for preventable diseases
+• Mosquito control for dengue/malaria
+• Food safety practices
+• Personal hygiene
+
+💡 *Quick options:* Type 'disease prevention', 'vaccine prevention', or 'healthy lifestyle'"""
+    
+    # Symptom Checking - ONLY if no diet keywords
+    elif has_symptom_keyword and not has_diet_keyword:
+        # Check if it's about fever prevention specifically
+        if 'fever' in matches and 'prevention.stop' in matches:
+            return """🛡️ *Fever Prevention Strategies*
+
+*General Prevention:*
+• Practice good hand hygiene regularly
+• Avoid close contact with sick individuals
+• Maintain a strong immune system through balanced nutrition
+• Stay hydrated throughout the day
+• Get adequate rest and sleep
+
+*Infection Prevention:*
+• Keep up with recommended vaccinations
+• Practice food safety and proper cooking
+• Avoid sharing personal items when sick
+• Clean and disinfect frequently touched surfaces
+
+*Immune Support:*
+• Eat a variety of fruits and vegetables
+• Include immune-supporting nutrients (Vitamin C, Zinc)
+• Engage in regular moderate exercise
+• Maintain healthy gut microbiome
+
+💡 *While fever itself isn't always preventable, these strategies reduce your risk of infections that commonly cause fever.*"""
+        
+        elif 'fever.temperature' in matches:
+            return """🌡️ *Fever Information*
+
+*Self-Care:*
+• Rest and stay hydrated
+• Monitor temperature regularly
+• Use cool compresses
+• Over-the-counter fever reducers if needed
+
+*When to See Doctor:*
+• Fever above 102°F (39°C)
+• Lasts more than 3 days
+• Accompanied by rash, stiff neck, or confusion
+• In infants under 3 months
+
+💡 Always consult healthcare provider for persistent symptoms"""
+        
+        elif 'headache' in matches:
+            return """🤕 *Headache Relief*
+
+*Immediate Relief:*
+• Rest in quiet, dark room
+• Stay hydrated
+• Cold or warm compress
+• Gentle massage
+
+*Prevention:*
+• Regular sleep schedule
+• Stress management
+• Identify and avoid triggers
+• Regular meals
+
+🚨 Seek emergency care for sudden severe headache or with neurological symptoms"""
+        
+        elif 'cough' in matches:
+            return """🤧 *Cough Management*
+
+*Home Remedies:*
+• Honey with warm water/tea
+• Steam inhalation
+• Stay well hydrated
+• Use humidifier
+
+*Medical Attention Needed For:*
+• Cough lasting >3 weeks
+• Difficulty breathing
+• Chest pain
+• Coughing up blood
+• High fever with cough
+
+💡 Avoid irritants like smoke and strong fumes"""
+        
+        elif 'pain' in matches:
+            return """😣 *Pain Management*
+
+*General Care:*
+• Rest the affected area
+• Use heat or cold therapy
+• Over-the-counter pain relief if appropriate
+• Gentle stretching if suitable
+
+*When to Seek Medical Care:*
+• Severe or worsening pain
+• Pain after injury or accident
+• Pain with fever or other symptoms
+• Persistent pain that doesn't improve
+
+🚨 *Emergency:* Chest pain, severe abdominal pain, or pain with difficulty breathing"""
+        
+        else:
+            return """🤒 *Symptom Information*
+
+*Common Symptoms & General Advice:*
+• Fever: Rest, hydrate, monitor temperature
+• Cough: Honey, steam inhalation, avoid irritants
+• Headache: Rest, hydration, avoid triggers
+• Always consult doctor for persistent symptoms
+
+🚨 *Seek immediate medical help for:*
+• Difficulty breathing
+• Chest pain
+• Severe headache
+• High fever (104°F/40°C+)
+
+💡 *Quick options:* Type 'common symptoms', 'emergency signs', or 'find doctor'"""
+    
+    # Emergency situations
+    elif 'emergency' in matches:
+        return """🚨 *MEDICAL EMERGENCY ALERT* 🚨
+
+If you are experiencing a medical emergency:
+
+• Call emergency services immediately (911/112/your local emergency number)
+• Go to the nearest hospital emergency department
+• Do not delay seeking medical attention
+
+Common emergency signs:
+• Chest pain or pressure
+• Difficulty breathing
+• Severe bleeding
+• Sudden weakness or confusion
+• Seizures
+
+Your health and safety are the top priority! 🏥"""
+    
+    # Exercise and Fitness
+    elif 'exercise' in matches:
+        return """💪 *Exercise Guidelines*
+
+*General Recommendations:*
+• 150 mins moderate or 75 mins vigorous exercise weekly
+• Strength training 2x/week
+• Include flexibility exercises
+• Stay active throughout day
+
+*Benefits:*
+• Weight management
+• Heart health improvement
+• Better mental health
+• Reduced disease risk
+
+💡 Start slowly and consult doctor if new to exercise"""
+    
+    # Sleep and Rest
+    elif 'sleep' in matches:
+        return """😴 *Sleep Health*
+
+*Recommended Duration:*
+• Adults: 7-9 hours
+• Teenagers: 8-10 hours
+• Children: 9-12 hours
+• Preschoolers: 10-13 hours
+
+*Sleep Hygiene:*
+• Consistent sleep schedule
+• Dark, quiet, cool bedroom
+• No screens before bed
+• Relaxing bedtime routine
+
+💡 Consult doctor for persistent sleep issues"""
+    
+    # Greetings
+    elif 'greeting' in matches:
+        return """👋 Hello! I'm your Health Assistant. I can help with:
+
+💉 Vaccine information
+🤒 Symptom checking  
+🥗 Diet & nutrition
+🛡 Disease prevention
+🏥 Health facilities
+
+What would you like to know?
+
+💡 Try: vaccines, symptoms, diet, or prevention"""
+    
+    # Default comprehensive response
+    else:
+        return """👋 **Health Assistant**
+
+I can help you with comprehensive health information including:
+
+💉 *Vaccines:* COVID-19, flu, MMR, HPV, travel vaccines
+🩺 *Diseases:* Diabetes, hypertension, asthma, heart conditions
+🥗 *Diets:* General healthy eating, weight management, meal plans, condition-specific diets
+🛡️ *Prevention:* Heart disease, cancer, diabetes prevention
+🤒 *Symptoms:* Fever, headache, cough, pain management
+💪 *Lifestyle:* Exercise, nutrition, sleep, stress management
+
+What specific health topic would you like to know about?"""
@@ -0,0 +1,72 @@
+"""
+Compare the rule table behind get_custom_health_response with the
+if-chain it replaced, on the replay corpus.
+
+Checks that both return the same reply for every message, then times
+them. No Django setup or running servers are needed.
+
+Usage (from the healthbot directory):
+    python -m benchmarks.rule_engine_bench
+    python -m benchmarks.rule_engine_bench --rounds 10 --limit 2000
+"""
+
+import argparse
+import itertools
+import statistics
+import sys
+import time
+
+from benchmarks.action_bench import load_user_turns
+from benchmarks.legacy_health_response import LEGACY_HEALTH_KEYWORDS, get_custom_health_response
+from sangibani.rule_engine import RULES_DIR, RuleEngine
+
+# Quick-reply and suggestion payloads the WhatsApp views send back
+BUTTON_PAYLOADS = [
+    'meal plans', 'weight management', 'diet for conditions', 'covid vaccine',
+    'child vaccines', 'travel vaccines', 'common symptoms', 'emergency signs',
+    'find doctor', 'disease prevention', 'vaccine prevention', 'healthy lifestyle',
+]
+
+
+def build_corpus(limit=None):
+    """User turns, button payloads and pairs of keywords to hit every rule overlap"""
+    keywords = sorted({k for words in LEGACY_HEALTH_KEYWORDS.values() for k in words})
+    pairs = [f"{a} {b}" for a, b in itertools.combinations(keywords, 2)]
+    return load_user_turns(limit=limit) + BUTTON_PAYLOADS + keywords + pairs
+
+
+def time_per_message(funcs, corpus, rounds):
+    """Median microseconds per message for each function; rounds are interleaved"""
+    timings = [[] for _ in funcs]
+    for _ in range(rounds):
+        for func, samples in zip(funcs, timings):
+            start = time.perf_counter()
+            for message in corpus:
+                func(message)
+            samples.append((time.perf_counter() - start) / len(corpus))
+    return [statistics.median(samples) * 1e6 for samples in timings]
+
+
+def main(args):
+    engine = RuleEngine.from_file(RULES_DIR / "health_responses.json")
+    corpus = build_corpus(args.limit)
+
+    mismatches = [m for m in corpus if engine.respond(m) != get_custom_health_response(m)]
+    print(f"Corpus: {len(corpus)} messages, {len(mismatches)} mismatches")
+    for message in mismatches[:10]:
+        print(f"  differs: {message!r}")
+
+    legacy_us, engine_us = time_per_message([get_custom_health_response, engine.respond], corpus, args.rounds)
+    info = engine.decide.cache_info()
+    print(f"\n{'implementation':<20} {'us/msg':>8}")
+    print(f"{'if-chain (legacy)':<20} {legacy_us:>8.2f}")
+    print(f"{'rule engine':<20} {engine_us:>8.2f}   ({legacy_us / engine_us:.2f}x)")
+    print(f"\nDecision memo: {info.currsize} group sets, {info.hits} hits, {info.misses} misses")
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rounds", type=int, default=5, help="timed passes over the corpus")
+    parser.add_argument("--limit", type=int, default=None, help="cap on replayed user turns")
+    sys.exit(main(parser.parse_args()))
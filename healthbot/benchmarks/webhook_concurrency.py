@@ -0,0 +1,116 @@
+"""
+Concurrency benchmark for the custom action server.
+
+Fires batches of simultaneous POSTs at the rasa_sdk ``/webhook`` endpoint
+and reports throughput and latency for each concurrency level.
+
+Usage (with ``rasa run actions`` listening on port 5055):
+    python -m benchmarks.webhook_concurrency --levels 1 16 64 256 --requests 2000
+"""
+
+import argparse
+import asyncio
+import itertools
+import statistics
+import time
+
+import aiohttp
+
+DEFAULT_URL = "http://localhost:5055/webhook"
+
+# (action, user text, entities) replayed round-robin
+SAMPLE_TURNS = [
+    ("action_vaccine_info", "tell me about the covid vaccine", []),
+    ("action_diet_advice", "what should I eat for diabetes", []),
+    ("action_disease_prevention", "how do I prevent heart disease", []),
+    ("action_symptom_checker", "I have fever and a headache",
+     [{"entity": "symptom", "value": "fever"}, {"entity": "symptom", "value": "headache"}]),
+    ("action_provide_medical_info", "I have a skin rash", [{"entity": "symptom", "value": "rash"}]),
+    ("action_emergency_check", "my father has chest pain", []),
+]
+
+
+def webhook_payload(action, text, entities, sender_id):
+    """Build the request body Rasa sends to the action server"""
+    return {
+        "next_action": action,
+        "sender_id": sender_id,
+        "tracker": {
+            "sender_id": sender_id,
+            "slots": {},
+            "latest_message": {"text": text, "entities": entities, "intent": {}},
+            "events": [],
+            "paused": False,
+            "followup_action": None,
+            "active_loop": {},
+            "latest_action_name": None,
+        },
+        "domain": {},
+        "version": "3.6.15",
+    }
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+async def run_level(session, url, concurrency, total):
+    """Send ``total`` requests with at most ``concurrency`` in flight"""
+    latencies = []
+    errors = 0
+    turns = itertools.cycle(SAMPLE_TURNS)
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(i):
+        nonlocal errors
+        action, text, entities = next(turns)
+        payload = webhook_payload(action, text, entities, f"bench_{i % concurrency}")
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                async with session.post(url, json=payload) as response:
+                    await response.read()
+                    if response.status != 200:
+                        errors += 1
+            except aiohttp.ClientError:
+                errors += 1
+            latencies.append(time.perf_counter() - start)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(total)))
+    elapsed = time.perf_counter() - started
+
+    return {
+        "concurrency": concurrency,
+        "requests": total,
+        "errors": errors,
+        "rps": total / elapsed,
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+        "mean_ms": statistics.mean(latencies) * 1000,
+    }
+
+
+async def main(url, levels, total):
+    connector = aiohttp.TCPConnector(limit=max(levels))
+    timeout = aiohttp.ClientTimeout(total=60)
+    async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
+        # Warm the server (imports, knowledge load, fragment cache)
+        await run_level(session, url, 1, len(SAMPLE_TURNS))
+
+        print(f"{'conc':>6} {'reqs':>7} {'err':>5} {'req/s':>9} {'p50 ms':>9} {'p99 ms':>9} {'mean ms':>9}")
+        for level in levels:
+            r = await run_level(session, url, level, total)
+            print(f"{r['concurrency']:>6} {r['requests']:>7} {r['errors']:>5} {r['rps']:>9.1f} "
+                  f"{r['p50_ms']:>9.2f} {r['p99_ms']:>9.2f} {r['mean_ms']:>9.2f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default=DEFAULT_URL)
+    parser.add_argument("--levels", type=int, nargs="+", default=[1, 8, 32, 128, 512])
+    parser.add_argument("--requests", type=int, default=1000, help="requests per concurrency level")
+    args = parser.parse_args()
+    asyncio.run(main(args.url, args.levels, args.requests))
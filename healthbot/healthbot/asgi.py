@@ -13,4 +13,30 @@ from django.core.asgi import get_asgi_application
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "healthbot.settings")
 
-application = get_asgi_application()
+django_application = get_asgi_application()
+
+# Build the facility index now rather than inside the first location message
+from actions.facility_index import build_facility_index_in_background  # noqa: E402
+
+build_facility_index_in_background()
+
+
+async def application(scope, receive, send):
+    """
+    Django's ASGI app plus the lifespan protocol: the pooled aiohttp
+    session to Rasa is opened at server startup and closed at shutdown.
+    """
+    if scope["type"] != "lifespan":
+        return await django_application(scope, receive, send)
+
+    from sangibani.rasa_client import get_async_rasa_client
+
+    while True:
+        message = await receive()
+        if message["type"] == "lifespan.startup":
+            await get_async_rasa_client().start()
+            await send({"type": "lifespan.startup.complete"})
+        elif message["type"] == "lifespan.shutdown":
+            await get_async_rasa_client().close()
+            await send({"type": "lifespan.shutdown.complete"})
+            return
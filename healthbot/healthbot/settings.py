@@ -146,3 +146,130 @@ TWILIO_ACCOUNT_SID = 'YOUR_SID'
 TWILIO_AUTH_TOKEN = 'YOUR_AUTH_TOKEN'
 
 TWILIO_WHATSAPP_NUMBER = 'WHATSAPP_NUMBER'
+
+# Twilio REST endpoint used by broadcasts; point at a local fake server
+# (benchmarks/fake_twilio_server.py) for load testing
+TWILIO_API_BASE_URL = os.environ.get('TWILIO_API_BASE_URL', 'https://api.twilio.com')
+
+# Broadcasts are sent in the background by `concurrency` workers sharing a
+# rate limit of `rate_per_second` messages. Throttled (429) and server
+# errors are retried up to `max_retries` times with exponential backoff.
+WHATSAPP_BROADCAST = {
+    'concurrency': 8,
+    'rate_per_second': 10,
+    'chunk_size': 100,
+    'max_retries': 3,
+    'backoff_base': 0.5,
+}
+
+
+# Rasa backends (one per `rasa run --enable-api` process). Each sender is
+# pinned to one backend by consistent hashing and fails over to the next
+# one on the ring while its breaker is open; point all replicas at a
+# shared tracker store so a failed-over conversation keeps its history.
+RASA_BACKENDS = [
+    'http://127.0.0.1:5005',
+]
+
+# Virtual nodes per backend on the hash ring
+RASA_VIRTUAL_NODES = 100
+
+# Keep-alive connections kept open per Rasa backend
+RASA_POOL_SIZE = 20
+
+# Connection limit of the aiohttp pool used by the async views (ASGI)
+RASA_ASYNC_POOL_SIZE = 200
+
+
+# Normalized-message cache for Rasa replies in front of chatbot_api.
+# backend 'local' keeps entries per process; 'django' shares them through
+# the CACHES alias (e.g. a Redis cache). Entries are invalidated when a
+# new model is trained or medical_knowledge.json changes.
+# Replies are shared by all senders, so a reply is stored only when the
+# sender's tracker shows a stateless turn: an intent listed below, answered
+# by utter_* responses alone, with no slot set and no session started.
+RESPONSE_CACHE = {
+    'enabled': True,
+    'backend': 'local',
+    'alias': 'default',
+    'ttl': 300,
+    'max_entries': 2048,
+    'stateless_intents': [
+        'medical_help',
+        'symptom_fever', 'symptom_headache', 'symptom_cough', 'symptom_pain',
+        'symptom_rash', 'symptom_dizziness',
+        'ask_vaccine', 'ask_covid_vaccine', 'ask_flu_vaccine', 'ask_hepatitis_vaccine',
+        'ask_vaccine_safety',
+        'ask_diet', 'ask_diabetes_diet', 'ask_heart_diet', 'ask_gluten_free', 'ask_diet_weight',
+        'ask_prevention', 'ask_medication',
+    ],
+}
+
+
+# Acknowledge-then-reply mode for the WhatsApp webhooks: Twilio gets an
+# empty TwiML response at once and `workers` background threads send the
+# reply through the REST API, so a slow Rasa cannot time out the webhook.
+# When `queue_size` messages are already waiting, new ones get a short
+# busy reply instead. Emergency replies are always sent inline.
+WHATSAPP_ASYNC_REPLY = {
+    'enabled': os.environ.get('WHATSAPP_ASYNC_REPLY', '0') == '1',
+    'workers': 4,
+    'queue_size': 1000,
+}
+
+
+# Twilio retries a webhook that answers slowly; MessageSids seen in the
+# last ttl seconds are acknowledged without running the pipeline again.
+# backend 'local' keeps up to max_entries per process. With several
+# workers use 'cache' and point alias at a store whose add() is atomic,
+# e.g. a 'django.core.cache.backends.redis.RedisCache' alias, or a
+# 'django.core.cache.backends.db.DatabaseCache' one after
+# `python manage.py createcachetable`.
+WHATSAPP_IDEMPOTENCY = {
+    'backend': 'local',
+    'alias': 'default',
+    'ttl': 600,
+    'max_entries': 50000,
+}
+
+
+# WhatsApp user sessions. backend 'local' keeps them per process (LRU,
+# max_entries); 'cache' stores them in the CACHES alias so every worker
+# shares them. Sessions expire ttl seconds after the last interaction.
+WHATSAPP_SESSIONS = {
+    'backend': 'local',
+    'alias': 'whatsapp_sessions',
+    'ttl': 1800,
+    'max_entries': 10000,
+}
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    # Shared by all workers on this host; swap for
+    # 'django.core.cache.backends.redis.RedisCache' with
+    # 'LOCATION': 'redis://127.0.0.1:6379' when running Redis
+    'whatsapp_sessions': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': BASE_DIR / 'cache' / 'whatsapp_sessions',
+        'TIMEOUT': 1800,
+        'OPTIONS': {'MAX_ENTRIES': 10000},
+    },
+}
+
+# Open a backend after this many consecutive failures, allow a trial
+# request after reset_timeout seconds, and probe every backend in the
+# background every probe_interval seconds
+RASA_BREAKER = {
+    'failure_threshold': 3,
+    'reset_timeout': 10.0,
+    'probe_interval': 5.0,
+}
+
+# (connect, read) timeouts in seconds per Rasa endpoint
+RASA_TIMEOUTS = {
+    'webhook': (3.05, 30),
+    'status': (3.05, 5),
+    'tracker': (3.05, 5),
+}
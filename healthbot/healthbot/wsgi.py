@@ -14,3 +14,8 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "healthbot.settings")
 
 application = get_wsgi_application()
+
+# Build the facility index now rather than inside the first location message
+from actions.facility_index import build_facility_index_in_background  # noqa: E402
+
+build_facility_index_in_background()
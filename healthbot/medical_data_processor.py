@@ -8,6 +8,9 @@ import json
 from pathlib import Path
 import ast
 
+from actions.knowledge_snapshot import snapshot_path_for, write_snapshot
+from sangibani.response_catalog import MESSAGES_DIR, load_message_files, validate_messages
+
 class MedicalDataProcessor:
     def __init__(self):
         self.base_dir = Path.cwd()
@@ -770,11 +773,26 @@ class MedicalDataProcessor:
         return rules_data
     
     def save_medical_knowledge(self):
-        """Save medical knowledge base to JSON"""
+        """Save medical knowledge base to JSON plus a precompiled snapshot"""
         knowledge_file = self.base_dir / "medical_knowledge.json"
         with open(knowledge_file, 'w', encoding='utf-8') as f:
             json.dump(self.medical_knowledge, f, indent=2)
         print(f"✅ Medical knowledge base saved to {knowledge_file}")
+
+        # Written after the JSON so it records the JSON's final mtime
+        snapshot_file = snapshot_path_for(knowledge_file)
+        digest = write_snapshot(self.medical_knowledge, snapshot_file, source_path=knowledge_file)
+        print(f"✅ Knowledge snapshot saved to {snapshot_file} (version {digest})")
+    
+    def validate_response_catalog(self):
+        """Check the multilingual message files the chat views load at startup"""
+        files = load_message_files(MESSAGES_DIR)
+        errors, warnings = validate_messages(files)
+        for warning in warnings:
+            print(f"⚠️ Response catalog: {warning}")
+        if errors:
+            raise ValueError("Invalid response catalog:\n" + "\n".join(errors))
+        print(f"✅ Response catalog valid ({', '.join(sorted(files))})")
     
     def process_all_data(self):
         """Main method to process all data and create Rasa training files"""
@@ -847,6 +865,9 @@ class MedicalDataProcessor:
         # Save medical knowledge
         self.save_medical_knowledge()
         
+        # Fail before training if a message file is broken
+        self.validate_response_catalog()
+        
         # Print summary
         print(f"\n" + "=" * 60)
         print(f"✅ PROCESSING COMPLETE!")
@@ -862,6 +883,7 @@ class MedicalDataProcessor:
         print(f"   - data/stories.yml")
         print(f"   - data/rules.yml")
         print(f"   - medical_knowledge.json")
+        print(f"   - medical_knowledge.snapshot")
         
         print(f"\n🎯 Your medical bot can now handle:")
         print(f"   💉 Vaccine information (COVID, flu, hepatitis B)")
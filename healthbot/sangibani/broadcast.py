@@ -0,0 +1,200 @@
+import random
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from django.conf import settings
+from django.db import connection
+from django.utils import timezone
+from requests.adapters import HTTPAdapter
+
+from .models import Broadcast, BroadcastRecipient
+
+_NUMBER_NOISE = re.compile(r"[\s\-().]")
+
+
+def normalize_number(raw):
+    """'whatsapp:+91 98765-43210' -> '+919876543210'"""
+    number = raw.strip()
+    if number.lower().startswith("whatsapp:"):
+        number = number[len("whatsapp:"):]
+    return _NUMBER_NOISE.sub("", number)
+
+
+def parse_recipients(text):
+    """Comma or newline separated numbers, normalized and deduplicated in order"""
+    seen = {}
+    for raw in re.split(r"[,\n]", text or ""):
+        number = normalize_number(raw)
+        if number:
+            seen.setdefault(number, None)
+    return list(seen)
+
+
+class TokenBucket:
+    """
+    Allows ``rate`` sends per second on average with bursts of ``capacity``
+    """
+
+    def __init__(self, rate, capacity=None):
+        self.rate = rate
+        self.capacity = capacity or max(1, rate)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+class SendError(Exception):
+    def __init__(self, message, retryable):
+        super().__init__(message)
+        self.retryable = retryable
+
+
+class TwilioHttpSender:
+    """
+    Sends WhatsApp messages through the Twilio REST Messages API over a
+    pooled session. ``base_url`` can point at a local fake Twilio server.
+    """
+
+    def __init__(self, base_url, account_sid, auth_token, from_number, pool_size=10, timeout=(3.05, 15)):
+        self.url = f"{base_url.rstrip('/')}/2010-04-01/Accounts/{account_sid}/Messages.json"
+        self.from_number = from_number
+        self.timeout = timeout
+        self.session = requests.Session()
+        self.session.auth = (account_sid, auth_token)
+        adapter = HTTPAdapter(pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def send(self, to_number, body):
+        """Return the message SID; raises SendError"""
+        try:
+            response = self.session.post(self.url, data={
+                "From": self.from_number,
+                "To": f"whatsapp:{to_number}",
+                "Body": body,
+            }, timeout=self.timeout)
+        except requests.exceptions.RequestException as e:
+            raise SendError(str(e), retryable=True)
+        if response.status_code in (200, 201):
+            return response.json().get("sid")
+        # Throttling and server errors are worth retrying; 4xx is the request itself
+        retryable = response.status_code == 429 or response.status_code >= 500
+        raise SendError(f"Twilio returned {response.status_code}: {response.text[:200]}", retryable)
+
+
+def send_with_retry(sender, bucket, number, body, max_retries, backoff_base):
+    """
+    Send one message, retrying retryable errors with exponential backoff
+    and jitter. Returns (status, sid, attempts, error).
+    """
+    attempts = 0
+    while True:
+        attempts += 1
+        bucket.acquire()
+        try:
+            return BroadcastRecipient.SENT, sender.send(number, body), attempts, None
+        except SendError as e:
+            if not e.retryable or attempts > max_retries:
+                return BroadcastRecipient.FAILED, None, attempts, str(e)
+            time.sleep(backoff_base * (2 ** (attempts - 1)) * (0.5 + random.random()))
+
+
+def create_sender(config):
+    return TwilioHttpSender(
+        settings.TWILIO_API_BASE_URL,
+        settings.TWILIO_ACCOUNT_SID,
+        settings.TWILIO_AUTH_TOKEN,
+        settings.TWILIO_WHATSAPP_NUMBER,
+        pool_size=config["concurrency"],
+    )
+
+
+def run_broadcast(broadcast_id, sender=None):
+    """
+    Send every pending recipient of a broadcast. Recipients are processed
+    in chunks; each chunk is sent by a bounded worker pool sharing one
+    rate limiter, and its results are written back in a single update.
+    """
+    config = settings.WHATSAPP_BROADCAST
+    broadcast = Broadcast.objects.get(pk=broadcast_id)
+    sender = sender or create_sender(config)
+    bucket = TokenBucket(config["rate_per_second"])
+
+    broadcast.status = Broadcast.RUNNING
+    broadcast.started_at = broadcast.started_at or timezone.now()
+    broadcast.save(update_fields=["status", "started_at"])
+
+    pending = broadcast.recipients.filter(status=BroadcastRecipient.PENDING).order_by("pk")
+    try:
+        with ThreadPoolExecutor(max_workers=config["concurrency"], thread_name_prefix="broadcast") as pool:
+            while True:
+                chunk = list(pending[:config["chunk_size"]])
+                if not chunk:
+                    break
+                results = pool.map(
+                    lambda r: send_with_retry(sender, bucket, r.number, broadcast.message,
+                                              config["max_retries"], config["backoff_base"]),
+                    chunk,
+                )
+                now = timezone.now()
+                for recipient, (status, sid, attempts, error) in zip(chunk, results):
+                    recipient.status = status
+                    recipient.message_sid = sid
+                    recipient.attempts += attempts
+                    recipient.error = error
+                    recipient.updated_at = now
+                BroadcastRecipient.objects.bulk_update(
+                    chunk, ["status", "message_sid", "attempts", "error", "updated_at"]
+                )
+                broadcast.update_counts()
+        broadcast.status = Broadcast.COMPLETED
+    except Exception as e:
+        print(f"Broadcast {broadcast_id} error: {str(e)}")
+        broadcast.status = Broadcast.FAILED
+    broadcast.finished_at = timezone.now()
+    broadcast.update_counts()
+    broadcast.save(update_fields=["status", "finished_at"])
+    return broadcast
+
+
+def resume_broadcasts(sender=None):
+    """
+    Finish broadcasts left QUEUED or RUNNING by a process that stopped, for
+    example a worker restart that killed the daemon thread. Only PENDING
+    recipients are sent, so a chunk that was in flight is sent again.
+    Run it while no other process is sending the same broadcasts.
+    """
+    resumed = []
+    unfinished = Broadcast.objects.filter(status__in=[Broadcast.QUEUED, Broadcast.RUNNING]).order_by("pk")
+    for broadcast_id in unfinished.values_list("pk", flat=True):
+        print(f"Resuming broadcast {broadcast_id}")
+        resumed.append(run_broadcast(broadcast_id, sender))
+    return resumed
+
+
+def start_broadcast(broadcast_id):
+    """Run a broadcast in a background thread so the request returns at once"""
+    def job():
+        try:
+            run_broadcast(broadcast_id)
+        finally:
+            connection.close()
+
+    thread = threading.Thread(target=job, name=f"broadcast-{broadcast_id}", daemon=True)
+    thread.start()
+    return thread
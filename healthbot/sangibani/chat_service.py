@@ -0,0 +1,173 @@
+import json
+from functools import partial
+
+import requests
+
+from actions.emergency import EmergencyPrescreen
+from actions.tracing import get_tracer, request_id_var
+from .rasa_client import get_async_rasa_client, get_rasa_client
+from .response_cache import get_response_cache
+from .response_catalog import get_response_catalog
+
+tracer = get_tracer()
+
+# Same keyword list as ActionEmergencyCheck, checked before any Rasa call
+emergency_prescreen = EmergencyPrescreen()
+
+# Texts for every language, loaded once from sangibani/messages
+response_catalog = get_response_catalog()
+
+GREETING_WORDS = ('hello', 'hi', 'hey', 'namaste', 'ନମସ୍କାର', 'नमस्ते')
+
+
+def generate_chat_reply(message, user_id="anonymous", language="en", request_id=None):
+    """
+    Answer one chat turn in-process: emergency pre-screen, then Rasa, then
+    the intelligent fallback. Shared by the REST API and the WhatsApp paths.
+    """
+    request_id = request_id or request_id_var.get()
+    try:
+        # Emergency fast lane: reply without waiting on NLU
+        emergency_reply = emergency_prescreen.check(message)
+        if emergency_reply:
+            return emergency_chat_reply(emergency_reply)
+
+        # Repeated stateless questions are answered without Rasa
+        cache = get_response_cache()
+        cached = cache.get(message, language) if cache else None
+        if cached:
+            return {**cached, "source": "cache"}
+
+        # Try each configured Rasa URL over the pooled session
+        try:
+            response = get_rasa_client().send_message(
+                f"user_{user_id}", message, rasa_metadata(user_id, language, request_id)
+            )
+        except requests.exceptions.RequestException:
+            response = None
+
+        ok = response is not None and response.status_code == 200
+        reply = rasa_chat_reply(message, language, response.text if ok else None)
+        if cache:
+            cache.set_later(message, language, reply, partial(rasa_tracker, f"user_{user_id}"))
+        return reply
+
+    except Exception as e:
+        print(f"Chatbot API error: {str(e)}")
+        return error_chat_reply()
+
+
+async def agenerate_chat_reply(message, user_id="anonymous", language="en", request_id=None):
+    """
+    Coroutine form of generate_chat_reply() for the async views; the
+    Rasa round trip does not hold a thread while it waits on NLU.
+    """
+    request_id = request_id or request_id_var.get()
+    try:
+        emergency_reply = emergency_prescreen.check(message)
+        if emergency_reply:
+            return emergency_chat_reply(emergency_reply)
+
+        cache = get_response_cache()
+        cached = await cache.aget(message, language) if cache else None
+        if cached:
+            return {**cached, "source": "cache"}
+
+        try:
+            status, body = await get_async_rasa_client().send_message(
+                f"user_{user_id}", message, rasa_metadata(user_id, language, request_id)
+            )
+        except requests.exceptions.RequestException:
+            status, body = None, None
+
+        reply = rasa_chat_reply(message, language, body if status == 200 else None)
+        if cache:
+            # The stateless-turn check and store run on the cache's writer threads
+            cache.set_later(message, language, reply, partial(rasa_tracker, f"user_{user_id}"))
+        return reply
+
+    except Exception as e:
+        print(f"Chatbot API error: {str(e)}")
+        return error_chat_reply()
+
+
+def rasa_metadata(user_id, language, request_id):
+    return {
+        "language": language,
+        "user_id": user_id,
+        "request_id": request_id
+    }
+
+
+def rasa_tracker(sender):
+    """The sender's tracker as a dict, or None if Rasa could not return it"""
+    try:
+        response = get_rasa_client().tracker(sender)
+        return response.json() if response.status_code == 200 else None
+    except (requests.exceptions.RequestException, ValueError) as e:
+        print(f"Rasa tracker error: {str(e)}")
+        return None
+
+
+def emergency_chat_reply(emergency_reply):
+    return {
+        "replies": [emergency_reply],
+        "source": "emergency_prescreen",
+        "status": "success"
+    }
+
+
+def error_chat_reply():
+    return {
+        "replies": get_intelligent_fallback_response("", "en"),
+        "source": "error_fallback",
+        "status": "error"
+    }
+
+
+def rasa_chat_reply(message, language, body):
+    """
+    Build the reply from a Rasa webhook body; ``body`` is None when Rasa
+    was unavailable
+    """
+    # Handle Rasa connection failure
+    if body is None:
+        return {
+            "replies": get_intelligent_fallback_response(message, language),
+            "source": "fallback",
+            "status": "rasa_unavailable"
+        }
+
+    # Parse Rasa response
+    try:
+        bot_responses = json.loads(body)
+        replies = [msg.get("text", "") for msg in bot_responses if "text" in msg]
+
+        if not replies:
+            replies = get_intelligent_fallback_response(message, language)
+            source = "fallback"
+        else:
+            source = "rasa"
+
+    except json.JSONDecodeError:
+        replies = get_intelligent_fallback_response(message, language)
+        source = "fallback"
+
+    return {
+        "replies": replies,
+        "source": source,
+        "status": "success"
+    }
+
+
+@tracer.traced("fallback")
+def get_intelligent_fallback_response(message, language):
+    """
+    Provide intelligent fallback responses when Rasa is unavailable
+    """
+    messages = response_catalog.messages(language)
+    
+    if any(word in message.lower() for word in GREETING_WORDS):
+        return [messages["intelligent_fallback.greeting"]]
+    else:
+        return [messages["intelligent_fallback.default"]]
@@ -0,0 +1,88 @@
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+
+# Shared cache backends whose add() is a single atomic operation
+ATOMIC_CACHE_BACKENDS = (
+    'django.core.cache.backends.redis.RedisCache',
+    'django.core.cache.backends.memcached.PyMemcacheCache',
+    'django.core.cache.backends.memcached.PyLibMCCache',
+    'django.core.cache.backends.db.DatabaseCache',
+)
+
+
+class LocalSeenSet:
+    """
+    Keys seen in the last ``ttl`` seconds, in this process only; the
+    oldest keys are dropped past ``max_entries``
+    """
+
+    def __init__(self, ttl=600, max_entries=50000):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.duplicates = 0
+        self._seen = OrderedDict()
+        self._lock = threading.Lock()
+
+    def claim(self, key):
+        """True the first time ``key`` is seen within the TTL"""
+        now = time.monotonic()
+        with self._lock:
+            # Insertion order is expiry order, so expired keys sit at the front
+            while self._seen:
+                oldest, seen_at = next(iter(self._seen.items()))
+                if len(self._seen) < self.max_entries and now - seen_at <= self.ttl:
+                    break
+                del self._seen[oldest]
+            if key in self._seen:
+                self.duplicates += 1
+                return False
+            self._seen[key] = now
+            return True
+
+    def stats(self):
+        return {'backend': 'local', 'tracked': len(self._seen), 'duplicates': self.duplicates}
+
+
+class CacheSeenSet:
+    """
+    Keys seen in the last ``ttl`` seconds, kept in a Django cache alias so
+    every worker process shares them. The alias must make cache.add()
+    atomic (Redis, Memcached, database); the file cache checks and then
+    writes, and can let a near-simultaneous retry through.
+    """
+
+    def __init__(self, alias='default', ttl=600, prefix='seen'):
+        self.alias = alias
+        self.ttl = ttl
+        self.prefix = prefix
+        self.duplicates = 0
+
+    @property
+    def cache(self):
+        from django.core.cache import caches
+        return caches[self.alias]
+
+    def claim(self, key):
+        """True the first time ``key`` is seen within the TTL"""
+        if self.cache.add(f"{self.prefix}:{key}", 1, self.ttl):
+            return True
+        self.duplicates += 1
+        return False
+
+    def stats(self):
+        return {'backend': 'cache', 'alias': self.alias, 'duplicates': self.duplicates}
+
+
+def create_seen_set():
+    """MessageSid set configured by the WHATSAPP_IDEMPOTENCY setting"""
+    config = settings.WHATSAPP_IDEMPOTENCY
+    if config['backend'] == 'cache':
+        alias = config.get('alias', 'default')
+        if settings.CACHES[alias]['BACKEND'] not in ATOMIC_CACHE_BACKENDS:
+            print(f"WHATSAPP_IDEMPOTENCY: cache alias '{alias}' is not an atomic shared store; "
+                  f"duplicate deliveries may be processed twice")
+        return CacheSeenSet(alias=alias, ttl=config['ttl'], prefix='whatsapp_sid')
+    return LocalSeenSet(ttl=config['ttl'], max_entries=config['max_entries'])
@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from sangibani.broadcast import resume_broadcasts
+
+
+class Command(BaseCommand):
+    help = "Send the pending recipients of broadcasts interrupted by a restart"
+
+    def handle(self, *args, **options):
+        resumed = resume_broadcasts()
+        for broadcast in resumed:
+            self.stdout.write(
+                f"Broadcast {broadcast.pk}: {broadcast.status}, "
+                f"{broadcast.sent} sent, {broadcast.failed} failed of {broadcast.total}"
+            )
+        if not resumed:
+            self.stdout.write("No interrupted broadcasts")
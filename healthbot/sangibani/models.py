@@ -51,4 +51,69 @@ def create_user_profile(sender, instance, created, **kwargs):
 @receiver(post_save, sender=User)
 def save_user_profile(sender, instance, **kwargs):
     if hasattr(instance, 'userprofile'):
-        instance.userprofile.save()
\ No newline at end of file
+        instance.userprofile.save()
+
+
+class Broadcast(models.Model):
+    QUEUED = 'queued'
+    RUNNING = 'running'
+    COMPLETED = 'completed'
+    FAILED = 'failed'
+    STATUS_CHOICES = [
+        (QUEUED, 'Queued'),
+        (RUNNING, 'Running'),
+        (COMPLETED, 'Completed'),
+        (FAILED, 'Failed'),
+    ]
+
+    created_by = models.ForeignKey(User, on_delete=models.SET_NULL, blank=True, null=True)
+    message = models.TextField()
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=QUEUED)
+
+    # Recipient counts, refreshed after every chunk
+    total = models.IntegerField(default=0)
+    sent = models.IntegerField(default=0)
+    failed = models.IntegerField(default=0)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(blank=True, null=True)
+    finished_at = models.DateTimeField(blank=True, null=True)
+
+    def update_counts(self):
+        counts = {
+            row['status']: row['n']
+            for row in self.recipients.values('status').annotate(n=models.Count('id'))
+        }
+        self.total = sum(counts.values())
+        self.sent = counts.get(BroadcastRecipient.SENT, 0)
+        self.failed = counts.get(BroadcastRecipient.FAILED, 0)
+        self.save(update_fields=['total', 'sent', 'failed'])
+
+    def __str__(self):
+        return f"Broadcast #{self.pk} ({self.status})"
+
+
+class BroadcastRecipient(models.Model):
+    PENDING = 'pending'
+    SENT = 'sent'
+    FAILED = 'failed'
+    STATUS_CHOICES = [
+        (PENDING, 'Pending'),
+        (SENT, 'Sent'),
+        (FAILED, 'Failed'),
+    ]
+
+    broadcast = models.ForeignKey(Broadcast, on_delete=models.CASCADE, related_name='recipients')
+    number = models.CharField(max_length=32)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=PENDING)
+    attempts = models.IntegerField(default=0)
+    message_sid = models.CharField(max_length=64, blank=True, null=True)
+    error = models.TextField(blank=True, null=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = ('broadcast', 'number')
+        indexes = [models.Index(fields=['broadcast', 'status'])]
+
+    def __str__(self):
+        return f"{self.number} ({self.status})"
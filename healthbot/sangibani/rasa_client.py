@@ -0,0 +1,393 @@
+import asyncio
+import bisect
+import hashlib
+import threading
+import time
+from contextlib import asynccontextmanager
+from urllib.parse import quote
+
+import requests
+from django.conf import settings
+from requests.adapters import HTTPAdapter
+
+from actions.tracing import get_tracer
+
+WEBHOOK_PATH = "/webhooks/rest/webhook"
+TRACKER_PATH = "/conversations/{sender}/tracker"
+
+
+class RasaUnavailable(requests.exceptions.ConnectionError):
+    """Every Rasa backend is open or unreachable"""
+
+
+class CircuitBreaker:
+    """
+    Closed -> open after ``failure_threshold`` consecutive failures.
+    Open -> half-open after ``reset_timeout`` seconds, letting one trial
+    request through; its outcome closes or re-opens the breaker.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold=3, reset_timeout=10.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    def allow(self):
+        """Whether a request may be sent to this backend now"""
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.OPEN and time.monotonic() - self.opened_at >= self.reset_timeout:
+                self.state = self.HALF_OPEN
+                self._trial_in_flight = False
+            if self.state == self.HALF_OPEN and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.state = self.CLOSED
+            self.failures = 0
+            self._trial_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                self.state = self.OPEN
+                self.opened_at = time.monotonic()
+            self._trial_in_flight = False
+
+
+class HashRing:
+    """
+    Consistent hash ring with ``replicas`` virtual nodes per backend.
+    Adding or removing a backend only moves the keys next to its points.
+    """
+
+    def __init__(self, nodes=(), replicas=100):
+        self.replicas = replicas
+        self._nodes = []
+        self._points = []
+        self._owners = []
+        for node in nodes:
+            self.add(node)
+
+    @staticmethod
+    def _hash(value):
+        return int.from_bytes(hashlib.blake2b(value.encode("utf-8"), digest_size=8).digest(), "big")
+
+    def add(self, node):
+        self._nodes.append(node)
+        for i in range(self.replicas):
+            point = self._hash(f"{node}#{i}")
+            index = bisect.bisect(self._points, point)
+            self._points.insert(index, point)
+            self._owners.insert(index, node)
+
+    def remove(self, node):
+        self._nodes.remove(node)
+        keep = [(p, o) for p, o in zip(self._points, self._owners) if o != node]
+        self._points = [p for p, _ in keep]
+        self._owners = [o for _, o in keep]
+
+    def nodes_for(self, key):
+        """Distinct nodes in ring order, starting with the owner of ``key``"""
+        if not self._points:
+            return []
+        start = bisect.bisect(self._points, self._hash(key))
+        seen = []
+        for i in range(len(self._owners)):
+            owner = self._owners[(start + i) % len(self._owners)]
+            if owner not in seen:
+                seen.append(owner)
+                if len(seen) == len(self._nodes):
+                    break
+        return seen
+
+
+class RasaBackend:
+    def __init__(self, url, failure_threshold, reset_timeout):
+        self.url = url.rstrip("/")
+        self.breaker = CircuitBreaker(failure_threshold, reset_timeout)
+
+
+class RasaClient:
+    """
+    Keep-alive client for a pool of Rasa backends shared by every view.
+    Senders are spread over the backends with a consistent hash ring so a
+    conversation's tracker stays on one replica. Backends whose breaker
+    is open are skipped, moving their senders to the next backend on the
+    ring, so an outage fails fast instead of waiting out the timeouts.
+    """
+
+    def __init__(self, base_urls, pool_size=10, timeouts=None,
+                 failure_threshold=3, reset_timeout=10.0, probe_interval=5.0,
+                 virtual_nodes=100):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.backends = {}
+        self.ring = HashRing(replicas=virtual_nodes)
+        self._lock = threading.Lock()
+        for url in base_urls:
+            self.add_backend(url)
+        self.timeouts = timeouts or {}
+        self.probe_interval = probe_interval
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=max(len(self.backends), 1), pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.tracer = get_tracer()
+        self._probe_thread = None
+
+    def add_backend(self, url):
+        """Join a replica; only the senders next to its ring points move to it"""
+        url = url.rstrip("/")
+        with self._lock:
+            if url in self.backends:
+                return
+            backends = dict(self.backends)
+            backends[url] = RasaBackend(url, self.failure_threshold, self.reset_timeout)
+            self.ring.add(url)
+            self.backends = backends
+
+    def remove_backend(self, url):
+        """Retire a replica; its senders move to the next backends on the ring"""
+        url = url.rstrip("/")
+        with self._lock:
+            if url not in self.backends:
+                return
+            backends = dict(self.backends)
+            del backends[url]
+            self.ring.remove(url)
+            self.backends = backends
+
+    def backends_for(self, key=None):
+        """Backends in the order to try them: ring order for a key, else config order"""
+        with self._lock:
+            backends = self.backends
+            urls = self.ring.nodes_for(key) if key is not None else list(backends)
+        return [backends[url] for url in urls]
+
+    def timeout(self, endpoint):
+        """(connect, read) timeout for an endpoint name"""
+        return self.timeouts.get(endpoint, (3.05, 30))
+
+    def request(self, method, path, endpoint, key=None, **kwargs):
+        """
+        Try each available backend in turn and return the first response
+        that is not a 5xx, else the last response. A 4xx is returned as is:
+        the backend received the turn, and sending it to another replica
+        would run it twice. Raises RasaUnavailable when no backend could be
+        reached or all of them are open.
+        """
+        response = None
+        error = None
+        for backend in self.backends_for(key):
+            if not backend.breaker.allow():
+                continue
+            url = backend.url + path
+            with self.tracer.span("rasa_attempt", url=url) as span:
+                try:
+                    response = self.session.request(method, url, timeout=self.timeout(endpoint), **kwargs)
+                    span["status_code"] = response.status_code
+                except requests.exceptions.RequestException as e:
+                    span["status"] = "error"
+                    backend.breaker.record_failure()
+                    error = e
+                    continue
+                if response.status_code >= 500:
+                    span["status"] = "error"
+                    backend.breaker.record_failure()
+                    continue
+                backend.breaker.record_success()
+                return response
+        if response is None:
+            self.tracer.record("rasa_fast_fail" if error is None else "rasa_unreachable", 0.0, status="error")
+            raise RasaUnavailable(str(error) if error else "All Rasa backends are open")
+        return response
+
+    def send_message(self, sender, message, metadata=None):
+        """POST a user message to the REST channel webhook"""
+        payload = {"sender": sender, "message": message}
+        if metadata:
+            payload["metadata"] = metadata
+        return self.request("POST", WEBHOOK_PATH, "webhook", key=sender, json=payload)
+
+    def tracker(self, sender):
+        """GET a sender's conversation tracker from the replica that holds it"""
+        return self.request("GET", TRACKER_PATH.format(sender=quote(sender, safe="")), "tracker", key=sender)
+
+    def status(self):
+        """GET the Rasa root endpoint"""
+        return self.request("GET", "/", "status")
+
+    def probe(self):
+        """Check every backend once and update its breaker"""
+        for backend in self.backends_for():
+            try:
+                response = self.session.get(backend.url + "/", timeout=self.timeout("status"))
+                ok = response.status_code < 500
+            except requests.exceptions.RequestException:
+                ok = False
+            if ok:
+                backend.breaker.record_success()
+            else:
+                backend.breaker.record_failure()
+
+    def start_probing(self):
+        """Probe the backends every ``probe_interval`` seconds in a daemon thread"""
+        if self._probe_thread or not self.probe_interval:
+            return
+
+        def loop():
+            while True:
+                time.sleep(self.probe_interval)
+                try:
+                    self.probe()
+                except Exception as e:
+                    print(f"Rasa probe error: {str(e)}")
+
+        self._probe_thread = threading.Thread(target=loop, name="rasa-probe", daemon=True)
+        self._probe_thread.start()
+
+    def backend_states(self):
+        return [
+            {"url": b.url, "state": b.breaker.state, "failures": b.breaker.failures}
+            for b in self.backends_for()
+        ]
+
+
+class AsyncRasaClient:
+    """
+    aiohttp front end for the async views. Shares the backends, hash ring
+    and breakers of a RasaClient, so both kinds of view see one pool.
+    """
+
+    def __init__(self, client, pool_size=100):
+        self.client = client
+        self.pool_size = pool_size
+        self._session = None
+        self._loop = None
+
+    def _new_session(self):
+        import aiohttp
+        return aiohttp.ClientSession(connector=aiohttp.TCPConnector(limit=self.pool_size))
+
+    async def start(self):
+        """Open the pooled session on the server's event loop (ASGI lifespan startup)"""
+        if self._session is None or self._session.closed:
+            self._session = self._new_session()
+            self._loop = asyncio.get_running_loop()
+
+    async def close(self):
+        """Close the pooled session (ASGI lifespan shutdown)"""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+        self._loop = None
+
+    @asynccontextmanager
+    async def _request_session(self):
+        # aiohttp sessions belong to one event loop. Only the loop opened by
+        # start() keeps a pooled session; any other loop (async views under
+        # WSGI get a new loop per request) uses one that is closed afterwards.
+        if self._loop is asyncio.get_running_loop() and not self._session.closed:
+            yield self._session
+            return
+        session = self._new_session()
+        try:
+            yield session
+        finally:
+            await session.close()
+
+    async def request(self, method, path, endpoint, key=None, **kwargs):
+        """
+        Same failover as RasaClient.request(); returns (status, body text).
+        """
+        import aiohttp
+
+        tracer = self.client.tracer
+        connect, read = self.client.timeout(endpoint)
+        timeout = aiohttp.ClientTimeout(sock_connect=connect, sock_read=read)
+        status = None
+        body = None
+        error = None
+        async with self._request_session() as session:
+            for backend in self.client.backends_for(key):
+                if not backend.breaker.allow():
+                    continue
+                url = backend.url + path
+                with tracer.span("rasa_attempt", url=url) as span:
+                    try:
+                        async with session.request(method, url, timeout=timeout, **kwargs) as response:
+                            status = response.status
+                            body = await response.text()
+                        span["status_code"] = status
+                    except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                        span["status"] = "error"
+                        backend.breaker.record_failure()
+                        error = e
+                        continue
+                    if status >= 500:
+                        span["status"] = "error"
+                        backend.breaker.record_failure()
+                        continue
+                    backend.breaker.record_success()
+                    return status, body
+        if status is None:
+            tracer.record("rasa_fast_fail" if error is None else "rasa_unreachable", 0.0, status="error")
+            raise RasaUnavailable(str(error) if error else "All Rasa backends are open")
+        return status, body
+
+    async def send_message(self, sender, message, metadata=None):
+        """POST a user message to the REST channel webhook"""
+        payload = {"sender": sender, "message": message}
+        if metadata:
+            payload["metadata"] = metadata
+        return await self.request("POST", WEBHOOK_PATH, "webhook", key=sender, json=payload)
+
+_client = None
+_async_client = None
+_client_lock = threading.Lock()
+
+
+def get_rasa_client():
+    """Process-wide client configured from the RASA_* settings"""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                breaker = settings.RASA_BREAKER
+                client = RasaClient(
+                    settings.RASA_BACKENDS,
+                    pool_size=settings.RASA_POOL_SIZE,
+                    timeouts=settings.RASA_TIMEOUTS,
+                    failure_threshold=breaker["failure_threshold"],
+                    reset_timeout=breaker["reset_timeout"],
+                    probe_interval=breaker["probe_interval"],
+                    virtual_nodes=settings.RASA_VIRTUAL_NODES,
+                )
+                client.start_probing()
+                _client = client
+    return _client
+
+
+def get_async_rasa_client():
+    """Process-wide async client over the same backend pool"""
+    global _async_client
+    if _async_client is None:
+        client = get_rasa_client()
+        with _client_lock:
+            if _async_client is None:
+                _async_client = AsyncRasaClient(client, pool_size=settings.RASA_ASYNC_POOL_SIZE)
+    return _async_client
@@ -0,0 +1,75 @@
+import contextvars
+import queue
+import threading
+
+from django.db import close_old_connections
+
+from .chat_service import tracer
+
+
+class ReplyQueue:
+    """
+    Bounded queue of inbound messages answered by background worker
+    threads, so a webhook can acknowledge at once and reply later.
+
+    Each job runs in a copy of the submitting request's context, which
+    keeps its request id on the trace spans the worker records.
+    """
+
+    def __init__(self, handler, workers=4, max_size=1000):
+        self.handler = handler
+        self.workers = workers
+        self._queue = queue.Queue(maxsize=max_size)
+        self._threads = []
+        self._lock = threading.Lock()
+        self._counts = {'processed': 0, 'failed': 0, 'rejected': 0}
+
+    def start(self):
+        # Threads are started on first use, not at import time
+        with self._lock:
+            if self._threads:
+                return
+            for i in range(self.workers):
+                thread = threading.Thread(target=self._work, name=f"whatsapp-reply-{i}", daemon=True)
+                thread.start()
+                self._threads.append(thread)
+
+    def submit(self, *args):
+        """Queue handler(*args); False when the queue is full"""
+        self.start()
+        try:
+            self._queue.put_nowait((contextvars.copy_context(), args))
+            return True
+        except queue.Full:
+            self._count('rejected')
+            return False
+
+    def join(self):
+        """Block until every queued job has been handled"""
+        self._queue.join()
+
+    def _work(self):
+        while True:
+            context, args = self._queue.get()
+            try:
+                context.run(self._handle, args)
+                self._count('processed')
+            except Exception as e:
+                print(f"WhatsApp reply worker error: {str(e)}")
+                self._count('failed')
+            finally:
+                # Worker threads outlive requests, so drop stale DB connections
+                close_old_connections()
+                self._queue.task_done()
+
+    def _handle(self, args):
+        with tracer.span("whatsapp_reply_worker", queue_depth=self._queue.qsize()):
+            self.handler(*args)
+
+    def _count(self, key):
+        with self._lock:
+            self._counts[key] += 1
+
+    def stats(self):
+        with self._lock:
+            return {'queued': self._queue.qsize(), 'workers': len(self._threads), **self._counts}
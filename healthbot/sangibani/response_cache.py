@@ -0,0 +1,256 @@
+import hashlib
+import re
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+
+from actions.knowledge_store import get_knowledge_store
+
+MODELS_DIR = Path(__file__).resolve().parent.parent / "models"
+
+_PUNCTUATION = re.compile(r"[!?.,;:'\"()\[\]]+")
+_WHITESPACE = re.compile(r"\s+")
+
+# Turns whose meaning depends on what the bot said before
+FOLLOW_UP_WORDS = {
+    'yes', 'yeah', 'yep', 'no', 'nope', 'ok', 'okay', 'sure', 'more', 'again',
+    'it', 'this', 'that', 'these', 'those', 'they', 'them', 'else', 'other',
+    'continue', 'next', 'previous', 'back', 'same', 'also',
+}
+FOLLOW_UP_MAX_WORDS = 4
+
+# Actions that only send a response and leave the tracker as it was
+STATELESS_ACTION_PREFIX = "utter_"
+
+
+def normalize_message(message):
+    """Lowercase, drop ASCII punctuation and collapse whitespace"""
+    return _WHITESPACE.sub(" ", _PUNCTUATION.sub(" ", message.lower())).strip()
+
+
+def is_conversation_dependent(normalized):
+    """Short follow-ups ("yes", "tell me more", "what about it") are never cached"""
+    words = normalized.split()
+    if not words or words[0].isdigit():
+        return True
+    return len(words) <= FOLLOW_UP_MAX_WORDS and any(word in FOLLOW_UP_WORDS for word in words)
+
+
+def is_stateless_turn(tracker, stateless_intents):
+    """
+    True if the tracker's latest turn can be replayed to any sender: its
+    intent is listed, it ran only utter_* actions, set no slot and did not
+    start a session (which sends the welcome text)
+    """
+    events = (tracker or {}).get("events") or []
+    users = [i for i, event in enumerate(events) if event.get("event") == "user"]
+    if not users:
+        return False
+    last = users[-1]
+    intent = ((events[last].get("parse_data") or {}).get("intent") or {}).get("name")
+    if intent not in stateless_intents:
+        return False
+    # Session start runs just before the first user message of a session
+    previous = users[-2] + 1 if len(users) > 1 else 0
+    for event in events[previous:]:
+        kind = event.get("event")
+        if kind in ("slot", "session_started", "restart", "reset_slots", "active_loop", "followup"):
+            return False
+        if kind == "action" and event.get("name") != "action_listen" and not (
+                event.get("name") or "").startswith(STATELESS_ACTION_PREFIX):
+            return False
+    return True
+
+
+class ResponseCache:
+    """
+    Normalized-message cache for Rasa replies with TTL and LRU eviction.
+
+    Keys carry a version built from the newest trained model and the
+    knowledge digest, so retraining or editing medical_knowledge.json
+    invalidates every entry. Entries live in an in-process OrderedDict, or
+    in a Django cache alias when ``backend`` is "django". Entries are
+    shared by all senders, so only stateless turns are stored; the check
+    needs the sender's tracker and runs on background writer threads.
+    """
+
+    def __init__(self, ttl=300, max_entries=2048, backend="local", alias="default",
+                 models_dir=MODELS_DIR, version_interval=1.0, stateless_intents=(),
+                 writers=2, max_pending=256):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.backend = backend
+        self.alias = alias
+        self.models_dir = Path(models_dir)
+        self.version_interval = version_interval
+        self.stateless_intents = frozenset(stateless_intents)
+        self._writer = ThreadPoolExecutor(max_workers=writers, thread_name_prefix="response_cache")
+        self._pending = threading.BoundedSemaphore(max_pending)
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._version = None
+        self._version_checked = 0.0
+        self.hits = 0
+        self.misses = 0
+        self.skipped = 0
+        self.stateful = 0
+
+    def _version_fresh(self, now):
+        return self._version is not None and now - self._version_checked < self.version_interval
+
+    def version(self):
+        """Model + knowledge version, re-read at most every ``version_interval`` seconds"""
+        now = time.monotonic()
+        if self._version_fresh(now):
+            return self._version
+        store = get_knowledge_store()
+        store.get()
+        try:
+            model_mtime = max((p.stat().st_mtime_ns for p in self.models_dir.glob("*.tar.gz")), default=0)
+        except OSError:
+            model_mtime = 0
+        version = hashlib.sha256(f"{model_mtime}:{store.digest}".encode()).hexdigest()[:12]
+        with self._lock:
+            if version != self._version:
+                self._entries.clear()
+                self._version = version
+            self._version_checked = now
+        return version
+
+    def key(self, message, language):
+        """Cache key for a turn, or None if the turn must not be cached"""
+        normalized = normalize_message(message)
+        if is_conversation_dependent(normalized):
+            return None
+        digest = hashlib.sha256(f"{language}:{normalized}".encode("utf-8")).hexdigest()
+        return f"chat_reply:{self.version()}:{digest}"
+
+    def get(self, message, language):
+        key = self.key(message, language)
+        if key is None:
+            with self._lock:
+                self.skipped += 1
+            return None
+        if self.backend == "django":
+            reply = self._django_cache().get(key)
+        else:
+            reply = self._local_get(key)
+        with self._lock:
+            if reply is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return reply
+
+    def wants(self, message, language, reply):
+        """True if a reply may be stored, pending the check of its turn"""
+        return reply.get("source") == "rasa" and self.key(message, language) is not None
+
+    def set(self, message, language, reply, tracker):
+        """Store a Rasa reply when ``tracker`` shows a stateless turn"""
+        if not self.wants(message, language, reply):
+            return
+        if not is_stateless_turn(tracker, self.stateless_intents):
+            with self._lock:
+                self.stateful += 1
+            return
+        key = self.key(message, language)
+        if self.backend == "django":
+            self._django_cache().set(key, reply, self.ttl)
+        else:
+            self._local_set(key, reply)
+
+    def set_later(self, message, language, reply, fetch_tracker):
+        """
+        Store a reply from a writer thread once ``fetch_tracker()`` shows a
+        stateless turn, so the request never waits on the tracker. Replies
+        are dropped while ``max_pending`` stores are already queued.
+        """
+        if reply.get("source") != "rasa" or not self._pending.acquire(blocking=False):
+            return
+        try:
+            self._writer.submit(self._store, message, language, reply, fetch_tracker)
+        except RuntimeError:
+            self._pending.release()
+
+    def _store(self, message, language, reply, fetch_tracker):
+        try:
+            if self.wants(message, language, reply):
+                self.set(message, language, reply, fetch_tracker())
+        except Exception as e:
+            print(f"Response cache store error: {str(e)}")
+        finally:
+            self._pending.release()
+
+    async def aget(self, message, language):
+        """
+        get() for async views; a Django cache alias, and re-reading the
+        version (knowledge store, model files), run off the event loop
+        """
+        if self.backend == "django" or not self._version_fresh(time.monotonic()):
+            return await sync_to_async(self.get, thread_sensitive=False)(message, language)
+        return self.get(message, language)
+
+    def _local_get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, reply = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return reply
+
+    def _local_set(self, key, reply):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, reply)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def _django_cache(self):
+        from django.core.cache import caches
+        return caches[self.alias]
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "skipped": self.skipped,
+                "stateful": self.stateful,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "entries": len(self._entries) if self.backend == "local" else None,
+                "version": self._version,
+            }
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_response_cache():
+    """Process-wide cache configured from the RESPONSE_CACHE setting, or None if disabled"""
+    global _cache
+    config = settings.RESPONSE_CACHE
+    if not config.get("enabled"):
+        return None
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = ResponseCache(
+                    ttl=config["ttl"],
+                    max_entries=config["max_entries"],
+                    backend=config["backend"],
+                    alias=config.get("alias", "default"),
+                    stateless_intents=config.get("stateless_intents", ()),
+                )
+    return _cache
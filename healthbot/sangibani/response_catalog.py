@@ -0,0 +1,123 @@
+import json
+import re
+import sys
+from pathlib import Path
+from types import MappingProxyType
+
+MESSAGES_DIR = Path(__file__).resolve().parent / "messages"
+
+DEFAULT_LANGUAGE = "en"
+
+_PLACEHOLDER = re.compile(r"\{(\w*)\}")
+
+
+def load_message_files(directory=MESSAGES_DIR):
+    """Raw {language: {'fallback': ..., 'messages': {...}}} from <lang>.json files"""
+    files = {}
+    for path in sorted(Path(directory).glob("*.json")):
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        files[data.get("language", path.stem)] = data
+    return files
+
+
+def _text(value):
+    # Long texts are stored as line lists to keep the JSON readable
+    return "\n".join(value) if isinstance(value, list) else value
+
+
+def fallback_chain(files, language):
+    """[language, its fallback, ...] ending at the default language"""
+    chain = [language]
+    while chain[-1] != DEFAULT_LANGUAGE:
+        parent = files[chain[-1]].get("fallback", DEFAULT_LANGUAGE)
+        if parent in chain or parent not in files:
+            raise ValueError(f"Bad fallback chain for {language!r}: {chain + [parent]}")
+        chain.append(parent)
+    return chain
+
+
+def validate_messages(files):
+    """
+    Check message files against the default language.
+    Returns (errors, warnings); missing translations are only warnings
+    since they resolve through the fallback chain.
+    """
+    errors, warnings = [], []
+    if DEFAULT_LANGUAGE not in files:
+        return [f"No messages for the default language {DEFAULT_LANGUAGE!r}"], warnings
+
+    base = files[DEFAULT_LANGUAGE]["messages"]
+    for language, data in files.items():
+        try:
+            fallback_chain(files, language)
+        except ValueError as e:
+            errors.append(str(e))
+
+        messages = data.get("messages", {})
+        for key, value in messages.items():
+            if isinstance(value, list) and not all(isinstance(line, str) for line in value):
+                errors.append(f"{language}.{key}: line lists may only hold strings")
+                continue
+            if not isinstance(value, (str, list)) or not _text(value).strip():
+                errors.append(f"{language}.{key}: empty or not text")
+                continue
+            if key not in base:
+                errors.append(f"{language}.{key}: not defined for {DEFAULT_LANGUAGE!r}")
+            elif set(_PLACEHOLDER.findall(_text(value))) != set(_PLACEHOLDER.findall(_text(base[key]))):
+                errors.append(f"{language}.{key}: placeholders differ from {DEFAULT_LANGUAGE!r}")
+
+        for key in base.keys() - messages.keys():
+            warnings.append(f"{language}.{key}: missing, falls back")
+    return errors, warnings
+
+
+class ResponseCatalog:
+    """
+    Read-only lookup of user-facing texts per language.
+
+    Fallback chains are resolved when the catalog is built, so every
+    language maps every key directly to its text; keys and texts are
+    interned and the tables are wrapped in MappingProxyType.
+    """
+
+    def __init__(self, files):
+        errors, _ = validate_messages(files)
+        if errors:
+            raise ValueError("Invalid response catalog: " + "; ".join(errors))
+
+        tables = {}
+        for language in files:
+            resolved = {}
+            for source in reversed(fallback_chain(files, language)):
+                for key, value in files[source]["messages"].items():
+                    resolved[sys.intern(key)] = sys.intern(_text(value))
+            tables[sys.intern(language)] = MappingProxyType(resolved)
+        self.tables = MappingProxyType(tables)
+        self.default = tables[DEFAULT_LANGUAGE]
+
+    @classmethod
+    def from_dir(cls, directory=MESSAGES_DIR):
+        return cls(load_message_files(directory))
+
+    @property
+    def languages(self):
+        return sorted(self.tables)
+
+    def messages(self, language):
+        """All texts for a language; unknown languages get the default"""
+        return self.tables.get(language, self.default)
+
+    def get(self, key, language=DEFAULT_LANGUAGE):
+        return self.tables.get(language, self.default)[key]
+
+
+_catalog = None
+
+
+def get_response_catalog():
+    """Return the shared ResponseCatalog, loaded on first use"""
+    global _catalog
+    if _catalog is None:
+        _catalog = ResponseCatalog.from_dir()
+    return _catalog
@@ -0,0 +1,76 @@
+import json
+from functools import lru_cache
+from pathlib import Path
+
+from actions.keyword_matcher import KeywordMatcher
+
+RULES_DIR = Path(__file__).resolve().parent / "rules"
+
+
+class Rule:
+    __slots__ = ("id", "priority", "all", "none", "response")
+
+    def __init__(self, id, priority, all, none, response):
+        self.id = id
+        self.priority = priority
+        self.all = frozenset(all)
+        self.none = frozenset(none)
+        self.response = response
+
+    def applies(self, matched):
+        return self.all <= matched and not (self.none & matched)
+
+
+class RuleEngine:
+    """
+    Declarative keyword rules compiled into a first-match decision table.
+
+    ``groups`` maps a group name to its keywords; one matcher pass over the
+    message yields the set of groups present. ``rules`` are tried from the
+    highest ``priority`` down (file order breaks ties); a rule applies when
+    all of its ``all`` groups and none of its ``none`` groups are present.
+    Decisions are memoized per group set, so repeated shapes of message
+    skip the rule walk entirely.
+    """
+
+    def __init__(self, groups, rules, responses):
+        for rule in rules:
+            unknown = (set(rule.get("all", ())) | set(rule.get("none", ()))) - set(groups)
+            if unknown:
+                raise ValueError(f"Rule {rule['id']!r} uses unknown groups: {sorted(unknown)}")
+            if rule["response"] not in responses:
+                raise ValueError(f"Rule {rule['id']!r} uses unknown response {rule['response']!r}")
+
+        self.matcher = KeywordMatcher(groups)
+        self.rules = sorted(
+            (Rule(r["id"], r.get("priority", 0), r.get("all", ()), r.get("none", ()), r["response"])
+             for r in rules),
+            key=lambda rule: -rule.priority,
+        )
+        # Responses are stored as line lists to keep the JSON readable
+        self.responses = {
+            key: "\n".join(value) if isinstance(value, list) else value
+            for key, value in responses.items()
+        }
+        self.decide = lru_cache(maxsize=4096)(self._decide)
+
+    @classmethod
+    def from_file(cls, path):
+        with open(path, encoding="utf-8") as f:
+            table = json.load(f)
+        return cls(table["groups"], table["rules"], table["responses"])
+
+    def _decide(self, matched):
+        for rule in self.rules:
+            if rule.applies(matched):
+                return rule
+        return None
+
+    def match(self, message):
+        """The rule that applies to ``message``, or None"""
+        return self.decide(self.matcher.match(message))
+
+    def respond(self, message):
+        """Response text of the applying rule, or None"""
+        rule = self.match(message)
+        return self.responses[rule.response] if rule else None
@@ -0,0 +1,89 @@
+import threading
+from collections import OrderedDict
+from datetime import datetime, timedelta
+
+from django.conf import settings
+
+
+class LocalSessionStore:
+    """
+    In-process sessions with LRU eviction past ``max_entries`` and expiry
+    ``ttl`` seconds after a session's last_interaction
+    """
+
+    def __init__(self, ttl=1800, max_entries=10000):
+        self.ttl = timedelta(seconds=ttl)
+        self.max_entries = max_entries
+        self._sessions = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _expired(self, session, now):
+        return now - session.get('last_interaction', now) > self.ttl
+
+    def get(self, user_id):
+        with self._lock:
+            session = self._sessions.get(user_id)
+            if session is None:
+                return None
+            if self._expired(session, datetime.now()):
+                del self._sessions[user_id]
+                return None
+            self._sessions.move_to_end(user_id)
+            return session
+
+    def set(self, user_id, session):
+        with self._lock:
+            self._sessions[user_id] = session
+            self._sessions.move_to_end(user_id)
+            # Least recently used first, so expired sessions sit at the front
+            now = datetime.now()
+            while self._sessions:
+                oldest_id, oldest = next(iter(self._sessions.items()))
+                if len(self._sessions) <= self.max_entries and not self._expired(oldest, now):
+                    break
+                del self._sessions[oldest_id]
+
+    def delete(self, user_id):
+        with self._lock:
+            self._sessions.pop(user_id, None)
+
+    def __len__(self):
+        return len(self._sessions)
+
+
+class CacheSessionStore:
+    """
+    Sessions in a Django cache alias, shared by every worker process that
+    uses the same cache (Redis, Memcached, file or database cache)
+    """
+
+    def __init__(self, alias='default', ttl=1800, prefix='whatsapp_session'):
+        self.alias = alias
+        self.ttl = ttl
+        self.prefix = prefix
+
+    @property
+    def cache(self):
+        from django.core.cache import caches
+        return caches[self.alias]
+
+    def _key(self, user_id):
+        return f"{self.prefix}:{user_id}"
+
+    def get(self, user_id):
+        return self.cache.get(self._key(user_id))
+
+    def set(self, user_id, session):
+        # Every save restarts the TTL, so it runs from the last interaction
+        self.cache.set(self._key(user_id), session, self.ttl)
+
+    def delete(self, user_id):
+        self.cache.delete(self._key(user_id))
+
+
+def create_session_store():
+    """Session store configured by the WHATSAPP_SESSIONS setting"""
+    config = settings.WHATSAPP_SESSIONS
+    if config['backend'] == 'cache':
+        return CacheSessionStore(alias=config.get('alias', 'default'), ttl=config['ttl'])
+    return LocalSessionStore(ttl=config['ttl'], max_entries=config['max_entries'])
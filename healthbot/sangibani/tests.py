@@ -1,3 +1,71 @@
-from django.test import TestCase
+from django.test import SimpleTestCase
 
-# Create your tests here.
+from actions.emergency import EmergencyPrescreen
+from actions.fuzzy_index import DISEASE_SYNONYMS, SYMPTOM_SYNONYMS, TrigramIndex, _terms
+
+
+class EmergencyPrescreenTests(SimpleTestCase):
+    def setUp(self):
+        self.prescreen = EmergencyPrescreen()
+
+    def test_question_words_elsewhere_do_not_cancel_an_emergency(self):
+        for message in [
+            "my dad is having a heart attack what is the first aid",
+            "chest pain what is happening to me",
+            "he is unconscious, tell me about cpr",
+        ]:
+            with self.subTest(message=message):
+                self.assertTrue(self.prescreen.is_emergency(message))
+
+    def test_qualified_phrases_are_left_to_nlu(self):
+        for message in [
+            "heart attack prevention",
+            "stroke prevention",
+            "stroke risk",
+            "how to prevent a heart attack",
+            "immediate care for fever",
+        ]:
+            with self.subTest(message=message):
+                self.assertFalse(self.prescreen.is_emergency(message))
+
+    def test_menu_payloads_are_not_emergencies(self):
+        for message in ["Emergency", "emergency signs"]:
+            with self.subTest(message=message):
+                self.assertFalse(self.prescreen.is_emergency(message))
+
+
+class TrigramIndexTests(SimpleTestCase):
+    def setUp(self):
+        self.symptoms = TrigramIndex(_terms(['fever', 'headache', 'cough', 'rash', 'pain', 'fatigue'],
+                                            SYMPTOM_SYNONYMS))
+        self.diseases = TrigramIndex(_terms(['diabetes', 'heart_disease', 'cancer', 'infections'],
+                                            DISEASE_SYNONYMS))
+
+    def test_unrelated_conditions_do_not_resolve(self):
+        for text in ["sore throat", "chest pain", "back pain", "joint pain", "dry skin"]:
+            with self.subTest(text=text):
+                self.assertIsNone(self.symptoms.resolve(text))
+        self.assertIsNone(self.diseases.resolve("high bp"))
+
+    def test_typos_and_modifiers_still_resolve(self):
+        self.assertEqual(self.symptoms.resolve("feverr"), "fever")
+        self.assertEqual(self.symptoms.resolve("severe coughing"), "cough")
+        self.assertEqual(self.symptoms.resolve("skin rashes"), "rash")
+        self.assertEqual(self.diseases.resolve("blood sugr"), "diabetes")
+
+
+class WhatsAppLanguageTests(SimpleTestCase):
+    def test_latin_script_sender_can_switch_language(self):
+        from sangibani.views import detect_user_language
+        user = "test-language-switch"
+        self.assertEqual(detect_user_language("I have a fever since yesterday", user), "en")
+        self.assertEqual(detect_user_language("mujhe bahut bukhar hai kya karna chahiye", user), "hi")
+        self.assertEqual(detect_user_language("ok", user), "hi")
+
+    def test_fallbacks_are_generic_in_every_language(self):
+        from sangibani.chat_service import get_intelligent_fallback_response
+        from sangibani.views import is_generic_response
+        for language in ["en", "hi", "or"]:
+            with self.subTest(language=language):
+                reply = get_intelligent_fallback_response("", language)[0]
+                self.assertTrue(is_generic_response(reply))
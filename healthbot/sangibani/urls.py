@@ -23,14 +23,19 @@ urlpatterns = [
 
     # API routes
     path('api/chatbot/', views.chatbot_api, name='chatbot_api'),
+    path('api/async/chatbot/', views.async_chatbot_api, name='async_chatbot_api'),
     path('api/register/', views.register_api, name='register_api'),
     path('api/health/', views.health_check, name='health_check'),
     path('api/test-chatbot/', views.test_chatbot_connection, name='test_chatbot'),
+    path('api/metrics/', views.metrics, name='metrics'),
 
 
     # WhatsApp routes
     path('whatsapp/webhook/', views.whatsapp_webhook, name='whatsapp_webhook'),
+    path('whatsapp/async/webhook/', views.async_whatsapp_webhook, name='async_whatsapp_webhook'),
     path('whatsapp/send-message/', views.send_whatsapp_message_view, name='send_whatsapp_message'),
     path('whatsapp/test/', views.whatsapp_test, name='whatsapp_test'),
     path('whatsapp/broadcast/', views.whatsapp_broadcast, name='whatsapp_broadcast'),
+    path('whatsapp/broadcast/<int:broadcast_id>/', views.whatsapp_broadcast_detail, name='whatsapp_broadcast_detail'),
+    path('whatsapp/broadcast/<int:broadcast_id>/status/', views.whatsapp_broadcast_status, name='whatsapp_broadcast_status'),
 ]
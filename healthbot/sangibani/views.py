@@ -11,11 +11,13 @@ import json
 import requests
 import traceback
 from .forms import UserRegisterForm, UserLoginForm, UserProfileForm, UserUpdateForm, PasswordChangeForm
-from .models import UserProfile
+from .models import UserProfile, Broadcast, BroadcastRecipient
 from django.db import transaction
 from django.contrib.auth import update_session_auth_hash
 from django.views.decorators.http import require_POST
 from datetime import datetime
+from functools import wraps
+import asyncio
 
 
 
@@ -25,6 +27,24 @@ from django.http import HttpResponse
 from django.views.decorators.csrf import csrf_exempt
 import json
 from django.conf import settings
+from asgiref.sync import sync_to_async
+
+from actions.keyword_matcher import KeywordMatcher
+from actions.knowledge_store import get_knowledge_store
+from actions.facility_index import facility_index_if_ready
+from actions.language_detect import MIN_CONFIDENCE, detect_language, dominant_script
+from actions.tracing import get_tracer, new_request_id, request_id_var
+from .chat_service import (
+    agenerate_chat_reply, emergency_prescreen, generate_chat_reply, get_intelligent_fallback_response,
+    response_catalog,
+)
+from .rasa_client import get_rasa_client
+from .response_cache import get_response_cache
+from .rule_engine import RULES_DIR, RuleEngine
+from .session_store import create_session_store
+from .broadcast import normalize_number, parse_recipients, start_broadcast
+from .reply_queue import ReplyQueue
+from .idempotency import create_seen_set
 
 
 
@@ -585,11 +605,82 @@ I can help with prevention of:
 What would you like to prevent?"""
 }
 
+# Words that route find_health_response to a category fallback, in priority order
+CATEGORY_KEYWORDS = {
+    'vaccine': ['vaccine', 'vaccination', 'immunization', 'shot'],
+    'disease': ['disease', 'illness', 'sickness', 'condition', 'disorder'],
+    'diet': ['diet', 'nutrition', 'food', 'eat', 'meal', 'dietary'],
+    'prevention': ['prevent', 'prevention', 'avoid', 'protection'],
+}
+
+# find_health_response index: knowledge base entries win in table order,
+# then the category fallbacks; the lowest rank among the matches is used
+HEALTH_RESPONSE_TABLES = {f"kb:{key}": [key] for key in HEALTH_KNOWLEDGE_BASE}
+HEALTH_RESPONSE_TABLES.update({f"category:{name}": words for name, words in CATEGORY_KEYWORDS.items()})
+health_response_matcher = KeywordMatcher(HEALTH_RESPONSE_TABLES)
+health_response_rank = {name: rank for rank, name in enumerate(HEALTH_RESPONSE_TABLES)}
+health_responses = {f"kb:{key}": info['response'] for key, info in HEALTH_KNOWLEDGE_BASE.items()}
+health_responses.update({f"category:{name}": CATEGORY_FALLBACKS[name] for name in CATEGORY_KEYWORDS})
+
+# Keyword tables for WhatsApp routing, compiled once into a single matcher
+HEALTH_KEYWORDS = {
+    # get_quick_suggestions, add_quick_replies, add_list_message
+    'vaccine': ['vaccine', 'vaccination', 'covid'],
+    'prevention': ['prevention', 'prevent', 'avoid'],
+    # get_quick_suggestions
+    'suggest.diet': ['diet', 'food', 'nutrition', 'eat', 'meal'],
+    'suggest.symptom': ['symptom', 'pain', 'fever', 'headache', 'cough'],
+    # add_quick_replies
+    'reply.diet': ['diet', 'food', 'nutrition', 'eat'],
+    'reply.symptom': ['symptom', 'pain', 'fever', 'headache'],
+    'reply.prevention': ['prevention', 'prevent'],
+}
+
+health_keyword_matcher = KeywordMatcher(HEALTH_KEYWORDS)
+
+# get_custom_health_response rules: keyword groups, priorities and replies
+health_rules = RuleEngine.from_file(RULES_DIR / "health_responses.json")
+
+tracer = get_tracer()
 
 
+def traced_view(stage):
+    """Give the request an ID (reusing X-Request-ID) and time the whole view"""
+    def decorator(view):
+        if asyncio.iscoroutinefunction(view):
+            @wraps(view)
+            async def async_wrapper(request, *args, **kwargs):
+                request.request_id = request.headers.get("X-Request-ID") or new_request_id()
+                token = request_id_var.set(request.request_id)
+                try:
+                    with tracer.span(stage) as span:
+                        response = await view(request, *args, **kwargs)
+                        span["status_code"] = response.status_code
+                finally:
+                    request_id_var.reset(token)
+                response["X-Request-ID"] = request.request_id
+                return response
+            return async_wrapper
+
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            request.request_id = request.headers.get("X-Request-ID") or new_request_id()
+            token = request_id_var.set(request.request_id)
+            try:
+                with tracer.span(stage) as span:
+                    response = view(request, *args, **kwargs)
+                    span["status_code"] = response.status_code
+            finally:
+                request_id_var.reset(token)
+            response["X-Request-ID"] = request.request_id
+            return response
+        return wrapper
+    return decorator
+
 
 # ---------- API Views ----------
 @csrf_exempt
+@traced_view("chatbot_api")
 def chatbot_api(request):
     """
     AI Chatbot API endpoint - communicates with Rasa
@@ -606,64 +697,39 @@ def chatbot_api(request):
             if not user_message:
                 return JsonResponse({"error": "No message provided."}, status=400)
 
-            # Rasa server URLs to try
-            rasa_urls = [
-                "http://127.0.0.1:5005/webhooks/rest/webhook",
-                "http://localhost:5005/webhooks/rest/webhook", 
-            ]
-            
-            response = None
-            
-            # Try each Rasa URL
-            for rasa_url in rasa_urls:
-                try:
-                    response = requests.post(
-                        rasa_url,
-                        json={
-                            "sender": f"user_{user_id}",
-                            "message": user_message,
-                            "metadata": {
-                                "language": language,
-                                "user_id": user_id
-                            }
-                        },
-                        timeout=30
-                    )
-                    if response.status_code == 200:
-                        break
-                except requests.exceptions.RequestException:
-                    continue
-
-            # Handle Rasa connection failure
-            if not response or response.status_code != 200:
-                fallback_replies = get_intelligent_fallback_response(user_message, language)
-                return JsonResponse({
-                    "replies": fallback_replies,
-                    "source": "fallback",
-                    "status": "rasa_unavailable"
-                }, status=200)
-
-            # Parse Rasa response
-            try:
-                bot_responses = response.json()
-                replies = [msg.get("text", "") for msg in bot_responses if "text" in msg]
-                
-                if not replies:
-                    replies = get_intelligent_fallback_response(user_message, language)
-                    source = "fallback"
-                else:
-                    source = "rasa"
-                    
-            except json.JSONDecodeError:
-                replies = get_intelligent_fallback_response(user_message, language)
-                source = "fallback"
+            reply = generate_chat_reply(user_message, user_id, language, request.request_id)
+            return JsonResponse({**reply, "request_id": request.request_id}, status=200)
 
+        except Exception as e:
+            print(f"Chatbot API error: {str(e)}")
             return JsonResponse({
-                "replies": replies,
-                "source": source,
-                "status": "success"
+                "replies": get_intelligent_fallback_response("", "en"),
+                "source": "error_fallback",
+                "status": "error"
             }, status=200)
 
+    return JsonResponse({"error": "Invalid request method."}, status=405)
+
+@csrf_exempt
+@traced_view("async_chatbot_api")
+async def async_chatbot_api(request):
+    """
+    Async variant of chatbot_api for ASGI deployments; the worker is free
+    while the turn waits on Rasa
+    """
+    if request.method == "POST":
+        try:
+            data = json.loads(request.body)
+            user_message = data.get("message", "").strip()
+            language = data.get("language", "en")
+            user_id = data.get("user_id", "anonymous")
+
+            if not user_message:
+                return JsonResponse({"error": "No message provided."}, status=400)
+
+            reply = await agenerate_chat_reply(user_message, user_id, language, request.request_id)
+            return JsonResponse({**reply, "request_id": request.request_id}, status=200)
+
         except Exception as e:
             print(f"Chatbot API error: {str(e)}")
             return JsonResponse({
@@ -676,53 +742,24 @@ def chatbot_api(request):
 
 def find_health_response(message):
     """Find response in comprehensive health knowledge base"""
-    message_lower = message.lower()
-    
-    # Check for exact matches first
-    for key, info in HEALTH_KNOWLEDGE_BASE.items():
-        if key in message_lower:
-            return info['response']
-    
-    # Check for category matches
-    if any(word in message_lower for word in ['vaccine', 'vaccination', 'immunization', 'shot']):
-        return CATEGORY_FALLBACKS['vaccine']
-    
-    elif any(word in message_lower for word in ['disease', 'illness', 'sickness', 'condition', 'disorder']):
-        return CATEGORY_FALLBACKS['disease']
-    
-    elif any(word in message_lower for word in ['diet', 'nutrition', 'food', 'eat', 'meal', 'dietary']):
-        return CATEGORY_FALLBACKS['diet']
-    
-    elif any(word in message_lower for word in ['prevent', 'prevention', 'avoid', 'protection']):
-        return CATEGORY_FALLBACKS['prevention']
-    
-    return None
+    matches = health_response_matcher.match(message)
+    if not matches:
+        return None
+    return health_responses[min(matches, key=health_response_rank.__getitem__)]
 
 def try_rasa_response(message, user_id):
     """Try to get response from Rasa with fallback"""
     try:
-        rasa_urls = [
-            "http://127.0.0.1:5005/webhooks/rest/webhook",
-            "http://localhost:5005/webhooks/rest/webhook", 
-        ]
+        response = get_rasa_client().send_message(
+            f"user_{user_id}",
+            message,
+            metadata={"request_id": request_id_var.get()}
+        )
         
-        for rasa_url in rasa_urls:
-            try:
-                response = requests.post(
-                    rasa_url,
-                    json={
-                        "sender": f"user_{user_id}",
-                        "message": message
-                    },
-                    timeout=10
-                )
-                
-                if response.status_code == 200:
-                    bot_responses = response.json()
-                    if bot_responses:
-                        return bot_responses[0].get("text", "")
-            except:
-                continue
+        if response.status_code == 200:
+            bot_responses = response.json()
+            if bot_responses:
+                return bot_responses[0].get("text", "")
                 
     except Exception as e:
         print(f"Rasa connection error: {str(e)}")
@@ -838,58 +875,31 @@ What specific health topic would you like to know about?"""
 
 
 
-def get_intelligent_fallback_response(message, language):
-    """
-    Provide intelligent fallback responses when Rasa is unavailable
-    """
-    message_lower = message.lower()
-    
-    healthcare_knowledge = {
-        "en": {
-            "greeting": [
-                "👋 Hello! I'm your AI Health Assistant specializing in vaccines, symptoms, and prevention. How can I help you today?"
-            ],
-            "default": [
-                "💊 I specialize in healthcare information including vaccines, symptoms, and prevention tips. What would you like to know?"
-            ]
-        },
-        "hi": {
-            "greeting": [
-                "👋 नमस्ते! मैं आपका AI स्वास्थ्य सहायक हूं। वैक्सीन, लक्षण और रोकथाम में विशेषज्ञता। आज मैं आपकी कैसे मदद कर सकता हूं?"
-            ],
-            "default": [
-                "💊 मैं स्वास्थ्य जानकारी में माहिर हूं including वैक्सीन, लक्षण और रोकथाम टिप्स। आप क्या जानना चाहेंगे?"
-            ]
-        },
-        "or": {
-            "greeting": [
-                "👋 ନମସ୍କାର! ମୁଁ ଆପଣଙ୍କର AI ସ୍ୱାସ୍ଥ୍ୟ ସହାୟକ। ଭାକ୍ସିନ୍, ଲକ୍ଷଣ ଏବଂ ପ୍ରତିଷେଧରେ ବିଶେଷଜ୍ଞତା। ଆଜି ମୁଁ ଆପଣଙ୍କୁ କିପରି ସାହାଯ୍ୟ କରିପାରିବି?"
-            ],
-            "default": [
-                "💊 ମୁଁ ସ୍ୱାସ୍ଥ୍ୟ ତଥ୍ୟରେ ବିଶେଷଜ୍ଞ including ଭାକ୍ସିନ୍, ଲକ୍ଷଣ ଏବଂ ପ୍ରତିଷେଧ ଟିପ୍ସ। ଆପଣ କ'ଣ ଜାନିବାକୁ ଚାହାଁନ୍ତି?"
-            ]
-        }
-    }
-    
-    lang_responses = healthcare_knowledge.get(language, healthcare_knowledge["en"])
-    
-    if any(word in message_lower for word in ['hello', 'hi', 'hey', 'namaste', 'ନମସ୍କାର', 'नमस्ते']):
-        return lang_responses.get("greeting", lang_responses["default"])
-    else:
-        return lang_responses["default"]
-
 @csrf_exempt
 def health_check(request):
     """
     Health check endpoint for monitoring
     """
     if request.method == "GET":
+        knowledge_store = get_knowledge_store()
+        knowledge_store.get()
+        details = {
+            "knowledge": {"version": knowledge_store.digest, "source": knowledge_store.source},
+            "emergency_prescreen": emergency_prescreen.stats(),
+            "rasa_backends": get_rasa_client().backend_states(),
+        }
+        response_cache = get_response_cache()
+        if response_cache:
+            details["response_cache"] = response_cache.stats()
+        details["whatsapp_idempotency"] = seen_message_sids.stats()
+        if settings.WHATSAPP_ASYNC_REPLY['enabled']:
+            details["whatsapp_replies"] = whatsapp_replies.stats()
         try:
-            response = requests.get("http://127.0.0.1:5005/", timeout=5)
+            response = get_rasa_client().status()
             rasa_status = "connected" if response.status_code == 200 else "disconnected"
-            return JsonResponse({"status": "healthy", "rasa_server": rasa_status, "django": "running"})
+            return JsonResponse({"status": "healthy", "rasa_server": rasa_status, "django": "running", **details})
         except:
-            return JsonResponse({"status": "healthy", "rasa_server": "disconnected", "django": "running"})
+            return JsonResponse({"status": "healthy", "rasa_server": "disconnected", "django": "running", **details})
     return JsonResponse({"error": "Method not allowed"}, status=405)
 
 @csrf_exempt
@@ -937,11 +947,7 @@ def test_chatbot_connection(request):
     """
     if request.method == "POST":
         try:
-            response = requests.post(
-                "http://127.0.0.1:5005/webhooks/rest/webhook",
-                json={"sender": "test_user", "message": "hello"},
-                timeout=10
-            )
+            response = get_rasa_client().send_message("test_user", "hello")
             
             if response.status_code == 200:
                 bot_responses = response.json()
@@ -969,6 +975,29 @@ def test_chatbot_connection(request):
     
     return JsonResponse({"error": "Method not allowed"}, status=405)
 
+@csrf_exempt
+def metrics(request):
+    """
+    Per-stage latency in Prometheus text format
+    """
+    if request.method == "GET":
+        body = tracer.prometheus()
+        response_cache = get_response_cache()
+        if response_cache:
+            stats = response_cache.stats()
+            body += (
+                "# TYPE healthbot_response_cache_lookups_total counter\n"
+                f'healthbot_response_cache_lookups_total{{result="hit"}} {stats["hits"]}\n'
+                f'healthbot_response_cache_lookups_total{{result="miss"}} {stats["misses"]}\n'
+                f'healthbot_response_cache_lookups_total{{result="skipped"}} {stats["skipped"]}\n'
+                "# TYPE healthbot_response_cache_hit_ratio gauge\n"
+                f"healthbot_response_cache_hit_ratio {stats['hit_rate']:.4f}\n"
+                "# TYPE healthbot_response_cache_stateful_total counter\n"
+                f"healthbot_response_cache_stateful_total {stats['stateful']}\n"
+            )
+        return HttpResponse(body, content_type="text/plain; version=0.0.4")
+    return JsonResponse({"error": "Method not allowed"}, status=405)
+
 # ---------- Utility Views ----------
 def handler404(request, exception):
     """
@@ -1059,12 +1088,41 @@ def profile_settings(request):
 # Initialize Twilio client
 twilio_client = Client(settings.TWILIO_ACCOUNT_SID, settings.TWILIO_AUTH_TOKEN)
 
+WHATSAPP_WELCOME_MESSAGE = """👋 Hello! I'm your Health Assistant. I can help you with:
+
+💉 Vaccine information
+🤒 Symptom checking
+🥗 Diet & nutrition
+🛡 Disease prevention
+🏥 Health facilities
+
+What would you like to know?
+
+💡 Try: vaccines, symptoms, diet, or prevention"""
+
+# Twilio redelivers a message when the webhook is slow; each MessageSid
+# is answered once (see WHATSAPP_IDEMPOTENCY in settings)
+seen_message_sids = create_seen_set()
+
+def is_duplicate_delivery(request):
+    """True for a redelivery of a MessageSid that was already handled"""
+    message_sid = request.POST.get('MessageSid')
+    if message_sid and not seen_message_sids.claim(message_sid):
+        print(f"Duplicate WhatsApp delivery ignored: {message_sid}")
+        return True
+    return False
+
+WHATSAPP_BUSY_MESSAGE = "⏳ I'm receiving a lot of messages right now. Please send your question again in a minute."
+
 @csrf_exempt
+@traced_view("whatsapp_webhook")
 def whatsapp_webhook(request):
     """
     Handle incoming WhatsApp messages via Twilio
     """
     if request.method == 'POST':
+        if is_duplicate_delivery(request):
+            return HttpResponse(str(MessagingResponse()))
         try:
             # Get incoming message details
             incoming_msg = request.POST.get('Body', '').strip()
@@ -1076,22 +1134,72 @@ def whatsapp_webhook(request):
             response = MessagingResponse()
             
             # Process the message
-            if incoming_msg:
-                bot_response = process_whatsapp_message(incoming_msg, from_number)
-                response.message(bot_response)
+            latitude, longitude = request.POST.get('Latitude'), request.POST.get('Longitude')
+            if latitude and longitude:
+                response.message(handle_location_message(latitude, longitude, from_number))
+            elif incoming_msg:
+                emergency_reply = emergency_prescreen.check(incoming_msg)
+                if emergency_reply:
+                    # WhatsApp bold is a single asterisk
+                    response.message(emergency_reply.replace("**", "*"))
+                    touch_user_session(from_number)
+                elif settings.WHATSAPP_ASYNC_REPLY['enabled']:
+                    # Acknowledge Twilio now; a worker sends the reply via the REST API
+                    if not whatsapp_replies.submit(from_number, incoming_msg):
+                        response.message(WHATSAPP_BUSY_MESSAGE)
+                else:
+                    bot_response = process_whatsapp_message(incoming_msg, from_number)
+                    response.message(bot_response)
             else:
-                welcome_msg = """👋 Hello! I'm your Health Assistant. I can help you with:
-
-💉 Vaccine information
-🤒 Symptom checking
-🥗 Diet & nutrition
-🛡 Disease prevention
-🏥 Health facilities
+                response.message(WHATSAPP_WELCOME_MESSAGE)
+            
+            return HttpResponse(str(response))
+            
+        except Exception as e:
+            print(f"WhatsApp webhook error: {str(e)}")
+            response = MessagingResponse()
+            response.message("Sorry, I'm having trouble processing your request. Please try again.")
+            return HttpResponse(str(response))
+    
+    return HttpResponse("GET request received")
 
-What would you like to know?
 
-💡 Try: vaccines, symptoms, diet, or prevention"""
-                response.message(welcome_msg)
+@csrf_exempt
+@traced_view("async_whatsapp_webhook")
+async def async_whatsapp_webhook(request):
+    """
+    Async variant of whatsapp_webhook for ASGI deployments
+    """
+    if request.method == 'POST':
+        # Idempotency, session and cache backends are sync; keep them off the event loop
+        if await sync_to_async(is_duplicate_delivery)(request):
+            return HttpResponse(str(MessagingResponse()))
+        try:
+            incoming_msg = request.POST.get('Body', '').strip()
+            from_number = request.POST.get('From', '')
+            
+            print(f"WhatsApp message from {from_number}: {incoming_msg}")
+            
+            response = MessagingResponse()
+            
+            latitude, longitude = request.POST.get('Latitude'), request.POST.get('Longitude')
+            if latitude and longitude:
+                response.message(await sync_to_async(handle_location_message)(latitude, longitude, from_number))
+            elif incoming_msg:
+                emergency_reply = emergency_prescreen.check(incoming_msg)
+                if emergency_reply:
+                    # WhatsApp bold is a single asterisk
+                    response.message(emergency_reply.replace("**", "*"))
+                    await sync_to_async(touch_user_session)(from_number)
+                elif settings.WHATSAPP_ASYNC_REPLY['enabled']:
+                    # Acknowledge Twilio now; a worker sends the reply via the REST API
+                    if not whatsapp_replies.submit(from_number, incoming_msg):
+                        response.message(WHATSAPP_BUSY_MESSAGE)
+                else:
+                    bot_response = await aprocess_whatsapp_message(incoming_msg, from_number)
+                    response.message(bot_response)
+            else:
+                response.message(WHATSAPP_WELCOME_MESSAGE)
             
             return HttpResponse(str(response))
             
@@ -1109,543 +1217,82 @@ def process_whatsapp_message(message, user_id):
     Process WhatsApp messages with clean, integrated responses
     """
     try:
-        # First, try to get response from Rasa
-        response = requests.post(
-            "http://127.0.0.1:8000/api/chatbot/",
-            json={
-                "message": message,
-                "user_id": f"whatsapp_{user_id}",
-                "language": "en"
-            },
-            timeout=10
-        )
-        
-        if response.status_code == 200:
-            data = response.json()
-            replies = data.get('replies', [])
+        # First, try to get response from Rasa (in-process, no HTTP hop)
+        language = detect_user_language(message, user_id)
+        replies = generate_chat_reply(message, f"whatsapp_{user_id}", language)["replies"]
+        return whatsapp_reply_text(message, replies)
             
-            # If Rasa has a good response, use it and add suggestions
-            if replies and not is_generic_response(replies[0]):
-                main_response = "\n".join(replies)
-                suggestions = get_quick_suggestions(message)  # Add suggestions here
-                return main_response + suggestions
-            else:
-                # If Rasa returns generic response, use our custom response
-                return get_custom_health_response(message)
-        else:
-            # If Rasa fails, use our custom response
-            return get_custom_health_response(message)
+    except Exception as e:
+        print(f"Chatbot processing error: {str(e)}")
+        return get_custom_health_response(message)
+
+
+async def aprocess_whatsapp_message(message, user_id):
+    """
+    Coroutine form of process_whatsapp_message for the async webhook
+    """
+    try:
+        language = await sync_to_async(detect_user_language)(message, user_id)
+        replies = (await agenerate_chat_reply(message, f"whatsapp_{user_id}", language))["replies"]
+        return whatsapp_reply_text(message, replies)
             
     except Exception as e:
         print(f"Chatbot processing error: {str(e)}")
         return get_custom_health_response(message)
 
 
+def whatsapp_reply_text(message, replies):
+    """Turn chat replies into the WhatsApp message text"""
+    # If Rasa has a good response, use it and add suggestions
+    if replies and not is_generic_response(replies[0]):
+        main_response = "\n".join(replies)
+        suggestions = get_quick_suggestions(message)  # Add suggestions here
+        return main_response + suggestions
+    else:
+        # If Rasa returns generic response, use our custom response
+        return get_custom_health_response(message)
+
+
+# Fallback texts of every catalog language; a reply containing one is generic
+GENERIC_RESPONSE_TEXTS = sorted({
+    response_catalog.get(key, language)
+    for language in response_catalog.languages
+    for key in ('fallback', 'intelligent_fallback.greeting', 'intelligent_fallback.default')
+})
+
 def is_generic_response(response):
-    """Check if the response is a generic fallback"""
+    """Check if the response is a generic fallback, in any language"""
     generic_phrases = [
         "I specialize in healthcare information",
         "What would you like to know",
         "I can help with healthcare information",
         "vaccines, symptoms, and prevention tips"
     ]
-    return any(phrase in response for phrase in generic_phrases)
+    return (any(phrase in response for phrase in generic_phrases)
+            or any(text in response for text in GENERIC_RESPONSE_TEXTS))
 
 
 
+@tracer.traced("whatsapp_fallback")
 def get_custom_health_response(message):
     """Provide custom health responses for WhatsApp"""
-    message_lower = message.lower()
-    
-    # Diet and Nutrition - CHECK FIRST with exclusions
-    diet_keywords = ['diet', 'food', 'nutrition', 'eat', 'meal', 'healthy eating']
-    symptom_keywords = ['pain', 'hurt', 'ache', 'symptom', 'fever', 'headache', 'cough']
-    
-    has_diet_keyword = any(word in message_lower for word in diet_keywords)
-    has_symptom_keyword = any(word in message_lower for word in symptom_keywords)
-    
-    if has_diet_keyword and not has_symptom_keyword:
-        if any(word in message_lower for word in ['general', 'basic', 'normal', 'regular', 'standard', 'healthy eating']):
-            return """🥗 *General Healthy Eating Guide*
-
-*Balanced Diet Principles:*
-• Fill half your plate with fruits & vegetables
-• Choose whole grains (brown rice, whole wheat)
-• Include lean proteins (chicken, fish, lentils)
-• Healthy fats (avocado, nuts, olive oil)
-• Limit processed foods and sugar
-• Stay hydrated with water
-
-*Daily Goals:*
-• 5+ servings of fruits/vegetables
-• Variety of colors for different nutrients
-• Moderate portion sizes
-• Regular meal timing
-
-💡 *Quick options:* Type 'meal plans', 'weight management', or 'diet for conditions'"""
-        
-        elif any(word in message_lower for word in ['weight', 'loss', 'slimming', 'obesity', 'weight management']):
-            return """⚖️ *Weight Management Diet*
-
-*Healthy Weight Loss Strategies:*
-• Calorie control with nutrient-dense foods
-• Regular physical activity (150 mins/week)
-• Portion control and mindful eating
-• High protein intake for satiety
-• Limit sugar and processed foods
-
-*Key Principles:*
-• 1-2 lbs weight loss per week is safe
-• Combine cardio and strength training
-• Stay hydrated (8-10 glasses water/day)
-• Get adequate sleep (7-9 hours)
-
-💡 *Sustainable changes work better than quick fixes*"""
-        
-        elif any(word in message_lower for word in ['gluten', 'celiac']):
-            return """🥗 *Gluten-Free Diet Information* 🌾
-
-*For:* Celiac disease, gluten sensitivity, wheat allergy
-
-*Naturally Gluten-Free Foods:*
-• Fruits and vegetables
-• Meat, poultry, fish (unbreaded)
-• Rice, quinoa, corn
-• Potatoes, sweet potatoes
-• Legumes, nuts, seeds
-
-*Foods to Avoid:*
-• Wheat, barley, rye
-• Most breads, pasta, cereals
-• Beer and malt beverages
-• Many processed foods
-
-*Important:* Read labels carefully, watch for cross-contamination
-
-⚠️ *Consult dietitian for complete gluten-free guidance*"""
-        
-        elif any(word in message_lower for word in ['meal plan', 'meal plans', 'daily meal', 'weekly meal', 'diet plan']):
-            return """📅 *Sample Healthy Meal Plan*
-
-*Breakfast Options:*
-• Oatmeal with berries and nuts
-• Whole grain toast with avocado and eggs
-• Greek yogurt with fruit and honey
-• Smoothie with spinach, banana, and protein
-
-*Lunch Options:*
-• Grilled chicken salad with mixed greens
-• Quinoa bowl with roasted vegetables
-• Whole grain wrap with hummus and veggies
-• Lentil soup with whole grain bread
-
-*Dinner Options:*
-• Baked salmon with sweet potato and broccoli
-• Stir-fried tofu with brown rice and vegetables
-• Lean beef with quinoa and asparagus
-• Chicken and vegetable skewers
-
-*Healthy Snacks:*
-• Apple slices with peanut butter
-• Carrot sticks with hummus
-• Handful of nuts and seeds
-• Greek yogurt with berries"""
-        
-        elif any(word in message_lower for word in ['condition', 'conditions', 'disease', 'medical']):
-            return """🏥 *Diet for Specific Health Conditions*
-
-I can provide dietary guidance for:
-
-*Heart Conditions:*
-• Low sodium, low saturated fat
-• High fiber, omega-3 fatty acids
-• DASH diet principles
-
-*Diabetes:*
-• Carbohydrate counting
-• Glycemic index awareness
-• Regular meal timing
-
-*Digestive Issues:*
-• High fiber for constipation
-• Low FODMAP for IBS
-• Gluten-free for celiac
-
-*Kidney Disease:*
-• Protein and potassium control
-• Phosphorus management
-• Fluid balance
-
-💡 *Please specify which condition you're interested in for detailed guidance.*"""
-        
-        else:
-            return """🥗 *Diet & Nutrition Guidance*
-
-I can help you with:
-• *General healthy eating* (type 'general healthy eating')
-• *Weight management diets* (type 'weight management')
-• *Meal planning* (type 'meal plans')
-• *Condition-specific diets* (type 'diet for conditions')
-• *Gluten-free eating* (type 'gluten free')
-
-What specific dietary information do you need?"""
-    
-    # Vaccine Information
-    elif any(word in message_lower for word in ['vaccine', 'vaccination', 'covid']):
-        if any(word in message_lower for word in ['covid', 'corona']):
-            return """💉 *COVID-19 Vaccine Information* 🦠
-
-*Available Vaccines:*
-• mRNA vaccines (Pfizer, Moderna)
-• Protein subunit vaccines (Novavax)
-• Vector vaccines (Johnson & Johnson)
-
-*Common Side Effects:*
-• Pain at injection site
-• Fatigue, headache
-• Muscle pain, fever
-• Chills, nausea
-
-*Effectiveness:* High protection against severe disease (90%+)
-
-*Booster Recommendation:* Stay updated as per health authority guidelines
-
-*Precautions:* Consult doctor if immunocompromised or have history of severe allergies"""
-        
-        elif any(word in message_lower for word in ['flu', 'influenza']):
-            return """💉 *Influenza (Flu) Vaccine* 🤧
-
-*Types Available:*
-• Standard quadrivalent
-• High-dose (for seniors)
-• Egg-free options
-• Nasal spray (LAIV)
-
-*When to Get:* Annually, before flu season (October-November)
-
-*Who Should Get:* Everyone 6 months and older
-
-*Effectiveness:* 40-60% effective in preventing flu
-
-*Special Groups:* Essential for pregnant women, seniors, children"""
-        
-        else:
-            return """💉 *Vaccine Information*
-
-*COVID-19 Vaccines:*
-• mRNA vaccines (Pfizer, Moderna)
-• Protein subunit (Novavax)
-• Vector vaccines (Johnson & Johnson)
-• High protection against severe disease
-
-*Other Vaccines:*
-• Flu shots (annual)
-• Childhood immunization schedule
-• Travel vaccines
-• HPV, Hepatitis, etc.
-
-💡 *Quick options:* Type 'covid vaccine', 'child vaccines', or 'travel vaccines'"""
-    
-    # Prevention - CHECK BEFORE SYMPTOMS
-    elif any(word in message_lower for word in ['prevention', 'prevent', 'avoid']):
-        if 'fever' in message_lower:
-            return """🛡️ *Fever Prevention Strategies*
-
-*General Prevention:*
-• Practice good hand hygiene regularly
-• Avoid close contact with sick individuals
-• Maintain a strong immune system through balanced nutrition
-• Stay hydrated throughout the day
-• Get adequate rest and sleep
-
-*Infection Prevention:*
-• Keep up with recommended vaccinations
-• Practice food safety and proper cooking
-• Avoid sharing personal items when sick
-• Clean and disinfect frequently touched surfaces
-
-*Immune Support:*
-• Eat a variety of fruits and vegetables
-• Include immune-supporting nutrients (Vitamin C, Zinc)
-• Engage in regular moderate exercise
-• Maintain healthy gut microbiome
-
-💡 *While fever itself isn't always preventable, these strategies reduce your risk of infections that commonly cause fever.*"""
-        
-        elif any(word in message_lower for word in ['heart', 'cardio']):
-            return """❤️ *Heart Disease Prevention*
-
-*Lifestyle Changes:*
-• No smoking, limit alcohol
-• Regular exercise (150 mins/week)
-• Healthy weight maintenance
-• Stress management
-
-*Dietary Recommendations:*
-• Limit saturated/trans fats
-• Increase fiber intake
-• Omega-3 fatty acids
-• Limit sodium, added sugars
-
-*Medical Management:*
-• Control blood pressure
-• Manage cholesterol
-• Control diabetes
-• Regular check-ups"""
-        
-        elif any(word in message_lower for word in ['cancer']):
-            return """🦀 *Cancer Prevention Strategies*
-
-*Lifestyle Factors:*
-• No tobacco in any form
-• Limit alcohol consumption
-• Maintain healthy weight
-• Regular physical activity
-
-*Dietary Recommendations:*
-• Fruits and vegetables
-• Whole grains, fiber
-• Limit processed meats
-• Balanced, varied diet
-
-*Early Detection:*
-• Regular screenings
-• Know family history
-• Self-examinations
-• Prompt medical attention"""
-        
-        else:
-            return """🛡️ *Disease Prevention*
-
-*General Prevention:*
-• Wash hands frequently
-• Balanced nutrition
-• Regular exercise
-• Adequate sleep (7-9 hours)
-• Stress management
-• Regular health check-ups
-
-*Specific Prevention:*
-• Vaccinations for preventable diseases
-• Mosquito control for dengue/malaria
-• Food safety practices
-• Personal hygiene
-
-💡 *Quick options:* Type 'disease prevention', 'vaccine prevention', or 'healthy lifestyle'"""
-    
-    # Symptom Checking - ONLY if no diet keywords
-    elif any(word in message_lower for word in ['symptom', 'pain', 'fever', 'headache', 'cough', 'hurt', 'ache']) and not has_diet_keyword:
-        # Check if it's about fever prevention specifically
-        if 'fever' in message_lower and any(word in message_lower for word in ['prevent', 'avoid', 'stop', 'prevention']):
-            return """🛡️ *Fever Prevention Strategies*
-
-*General Prevention:*
-• Practice good hand hygiene regularly
-• Avoid close contact with sick individuals
-• Maintain a strong immune system through balanced nutrition
-• Stay hydrated throughout the day
-• Get adequate rest and sleep
-
-*Infection Prevention:*
-• Keep up with recommended vaccinations
-• Practice food safety and proper cooking
-• Avoid sharing personal items when sick
-• Clean and disinfect frequently touched surfaces
-
-*Immune Support:*
-• Eat a variety of fruits and vegetables
-• Include immune-supporting nutrients (Vitamin C, Zinc)
-• Engage in regular moderate exercise
-• Maintain healthy gut microbiome
-
-💡 *While fever itself isn't always preventable, these strategies reduce your risk of infections that commonly cause fever.*"""
-        
-        elif any(word in message_lower for word in ['fever', 'temperature']):
-            return """🌡️ *Fever Information*
-
-*Self-Care:*
-• Rest and stay hydrated
-• Monitor temperature regularly
-• Use cool compresses
-• Over-the-counter fever reducers if needed
-
-*When to See Doctor:*
-• Fever above 102°F (39°C)
-• Lasts more than 3 days
-• Accompanied by rash, stiff neck, or confusion
-• In infants under 3 months
-
-💡 Always consult healthcare provider for persistent symptoms"""
-        
-        elif any(word in message_lower for word in ['headache', 'migraine']):
-            return """🤕 *Headache Relief*
-
-*Immediate Relief:*
-• Rest in quiet, dark room
-• Stay hydrated
-• Cold or warm compress
-• Gentle massage
-
-*Prevention:*
-• Regular sleep schedule
-• Stress management
-• Identify and avoid triggers
-• Regular meals
-
-🚨 Seek emergency care for sudden severe headache or with neurological symptoms"""
-        
-        elif any(word in message_lower for word in ['cough', 'coughing']):
-            return """🤧 *Cough Management*
-
-*Home Remedies:*
-• Honey with warm water/tea
-• Steam inhalation
-• Stay well hydrated
-• Use humidifier
-
-*Medical Attention Needed For:*
-• Cough lasting >3 weeks
-• Difficulty breathing
-• Chest pain
-• Coughing up blood
-• High fever with cough
-
-💡 Avoid irritants like smoke and strong fumes"""
-        
-        elif any(word in message_lower for word in ['pain', 'hurt', 'ache']):
-            return """😣 *Pain Management*
-
-*General Care:*
-• Rest the affected area
-• Use heat or cold therapy
-• Over-the-counter pain relief if appropriate
-• Gentle stretching if suitable
-
-*When to Seek Medical Care:*
-• Severe or worsening pain
-• Pain after injury or accident
-• Pain with fever or other symptoms
-• Persistent pain that doesn't improve
-
-🚨 *Emergency:* Chest pain, severe abdominal pain, or pain with difficulty breathing"""
-        
-        else:
-            return """🤒 *Symptom Information*
-
-*Common Symptoms & General Advice:*
-• Fever: Rest, hydrate, monitor temperature
-• Cough: Honey, steam inhalation, avoid irritants
-• Headache: Rest, hydration, avoid triggers
-• Always consult doctor for persistent symptoms
-
-🚨 *Seek immediate medical help for:*
-• Difficulty breathing
-• Chest pain
-• Severe headache
-• High fever (104°F/40°C+)
-
-💡 *Quick options:* Type 'common symptoms', 'emergency signs', or 'find doctor'"""
-    
-    # Emergency situations
-    elif any(word in message_lower for word in ['emergency', 'urgent', '911', 'help now']):
-        return """🚨 *MEDICAL EMERGENCY ALERT* 🚨
-
-If you are experiencing a medical emergency:
-
-• Call emergency services immediately (911/112/your local emergency number)
-• Go to the nearest hospital emergency department
-• Do not delay seeking medical attention
-
-Common emergency signs:
-• Chest pain or pressure
-• Difficulty breathing
-• Severe bleeding
-• Sudden weakness or confusion
-• Seizures
-
-Your health and safety are the top priority! 🏥"""
-    
-    # Exercise and Fitness
-    elif any(word in message_lower for word in ['exercise', 'workout', 'fitness', 'gym']):
-        return """💪 *Exercise Guidelines*
-
-*General Recommendations:*
-• 150 mins moderate or 75 mins vigorous exercise weekly
-• Strength training 2x/week
-• Include flexibility exercises
-• Stay active throughout day
-
-*Benefits:*
-• Weight management
-• Heart health improvement
-• Better mental health
-• Reduced disease risk
-
-💡 Start slowly and consult doctor if new to exercise"""
-    
-    # Sleep and Rest
-    elif any(word in message_lower for word in ['sleep', 'insomnia', 'tired', 'fatigue']):
-        return """😴 *Sleep Health*
-
-*Recommended Duration:*
-• Adults: 7-9 hours
-• Teenagers: 8-10 hours
-• Children: 9-12 hours
-• Preschoolers: 10-13 hours
-
-*Sleep Hygiene:*
-• Consistent sleep schedule
-• Dark, quiet, cool bedroom
-• No screens before bed
-• Relaxing bedtime routine
-
-💡 Consult doctor for persistent sleep issues"""
-    
-    # Greetings
-    elif any(word in message_lower for word in ['hello', 'hi', 'hey', 'namaste']):
-        return """👋 Hello! I'm your Health Assistant. I can help with:
-
-💉 Vaccine information
-🤒 Symptom checking  
-🥗 Diet & nutrition
-🛡 Disease prevention
-🏥 Health facilities
-
-What would you like to know?
-
-💡 Try: vaccines, symptoms, diet, or prevention"""
-    
-    # Default comprehensive response
-    else:
-        return """👋 **Health Assistant**
-
-I can help you with comprehensive health information including:
-
-💉 *Vaccines:* COVID-19, flu, MMR, HPV, travel vaccines
-🩺 *Diseases:* Diabetes, hypertension, asthma, heart conditions
-🥗 *Diets:* General healthy eating, weight management, meal plans, condition-specific diets
-🛡️ *Prevention:* Heart disease, cancer, diabetes prevention
-🤒 *Symptoms:* Fever, headache, cough, pain management
-💪 *Lifestyle:* Exercise, nutrition, sleep, stress management
-
-What specific health topic would you like to know about?"""
-
+    return health_rules.respond(message)
 
 
 def get_quick_suggestions(message):
     """Add text-based quick suggestions to responses"""
-    message_lower = message.lower()
+    matches = health_keyword_matcher.match(message)
     
-    if any(word in message_lower for word in ['diet', 'food', 'nutrition', 'eat', 'meal']):
+    if 'suggest.diet' in matches:
         return "\n\n💡 *Quick options:* Type 'meal plans', 'weight management', or 'diet for conditions'"
     
-    elif any(word in message_lower for word in ['vaccine', 'vaccination', 'covid']):
+    elif 'vaccine' in matches:
         return "\n\n💡 *Quick options:* Type 'covid vaccine', 'child vaccines', or 'travel vaccines'"
     
-    elif any(word in message_lower for word in ['symptom', 'pain', 'fever', 'headache', 'cough']):
+    elif 'suggest.symptom' in matches:
         return "\n\n💡 *Quick options:* Type 'common symptoms', 'emergency signs', or 'find doctor'"
     
-    elif any(word in message_lower for word in ['prevention', 'prevent', 'avoid']):
+    elif 'prevention' in matches:
         return "\n\n💡 *Quick options:* Type 'disease prevention', 'vaccine prevention', or 'healthy lifestyle'"
     
     else:
@@ -1688,6 +1335,20 @@ def send_whatsapp_message(to_number, message_body):
         print(f'Error sending WhatsApp message: {str(e)}')
         return None
 
+def reply_to_whatsapp_message(from_number, message):
+    """
+    Worker job for WHATSAPP_ASYNC_REPLY: build the reply and send it
+    """
+    bot_response = process_whatsapp_message(message, from_number)
+    if not send_whatsapp_message(normalize_number(from_number), bot_response):
+        raise RuntimeError(f"Reply to {from_number} was not sent")
+
+whatsapp_replies = ReplyQueue(
+    reply_to_whatsapp_message,
+    workers=settings.WHATSAPP_ASYNC_REPLY['workers'],
+    max_size=settings.WHATSAPP_ASYNC_REPLY['queue_size'],
+)
+
 @csrf_exempt
 @login_required
 def send_whatsapp_message_view(request):
@@ -1725,37 +1386,87 @@ def whatsapp_test(request):
 @login_required
 def whatsapp_broadcast(request):
     """
-    Send health alerts to multiple users
+    Send health alerts to multiple users. The broadcast is queued and sent
+    in the background; progress is shown on its detail page.
     """
     if request.method == 'POST':
-        message = request.POST.get('message')
-        numbers = request.POST.get('numbers', '').split(',')
-        
-        results = []
-        for number in numbers:
-            number = number.strip()
-            if number:
-                sid = send_whatsapp_message(number, message)
-                results.append({'number': number, 'status': 'success' if sid else 'failed'})
-        
-        messages.success(request, f'Broadcast sent to {len(results)} numbers')
-        return render(request, 'whatsapp_broadcast.html', {'results': results})
-    
-    return render(request, 'whatsapp_broadcast.html')
+        message = request.POST.get('message', '').strip()
+        numbers = parse_recipients(request.POST.get('numbers', ''))
+
+        if not message or not numbers:
+            messages.error(request, 'Please enter a message and at least one number')
+            return render(request, 'whatsapp_broadcast.html', {
+                'broadcasts': Broadcast.objects.order_by('-created_at')[:10],
+            })
+
+        with transaction.atomic():
+            broadcast = Broadcast.objects.create(created_by=request.user, message=message, total=len(numbers))
+            BroadcastRecipient.objects.bulk_create(
+                [BroadcastRecipient(broadcast=broadcast, number=number) for number in numbers],
+                batch_size=500,
+            )
+        start_broadcast(broadcast.pk)
+
+        messages.success(request, f'Broadcast queued for {len(numbers)} numbers')
+        return redirect('whatsapp_broadcast_detail', broadcast_id=broadcast.pk)
+
+    return render(request, 'whatsapp_broadcast.html', {
+        'broadcasts': Broadcast.objects.order_by('-created_at')[:10],
+    })
+
+@login_required
+def whatsapp_broadcast_detail(request, broadcast_id):
+    """
+    Progress and per-recipient results of one broadcast
+    """
+    broadcast = get_object_or_404(Broadcast, pk=broadcast_id)
+    return render(request, 'whatsapp_broadcast.html', {
+        'broadcast': broadcast,
+        'recipients': broadcast.recipients.order_by('pk')[:500],
+        'broadcasts': Broadcast.objects.order_by('-created_at')[:10],
+    })
+
+@login_required
+def whatsapp_broadcast_status(request, broadcast_id):
+    """
+    Broadcast progress as JSON, polled by the detail page
+    """
+    broadcast = get_object_or_404(Broadcast, pk=broadcast_id)
+    return JsonResponse({
+        'id': broadcast.pk,
+        'status': broadcast.status,
+        'total': broadcast.total,
+        'sent': broadcast.sent,
+        'failed': broadcast.failed,
+        'pending': broadcast.total - broadcast.sent - broadcast.failed,
+        'started_at': broadcast.started_at.isoformat() if broadcast.started_at else None,
+        'finished_at': broadcast.finished_at.isoformat() if broadcast.finished_at else None,
+    })
 
 # Feature 1: User Session Management
-user_sessions = {}
+# Bounded, expiring store; see WHATSAPP_SESSIONS in settings
+user_sessions = create_session_store()
 
 def get_user_session(user_id):
     """Get or create user session"""
-    if user_id not in user_sessions:
-        user_sessions[user_id] = {
+    session = user_sessions.get(user_id)
+    if session is None:
+        session = {
             'conversation_history': [],
             'preferences': {},
-            'language': 'en',
             'last_interaction': datetime.now()
         }
-    return user_sessions[user_id]
+        user_sessions.set(user_id, session)
+    return session
+
+def save_user_session(user_id, session):
+    """Write a session back and restart its expiry; needed for shared (cache) backends"""
+    session['last_interaction'] = datetime.now()
+    user_sessions.set(user_id, session)
+
+def touch_user_session(user_id):
+    """Restart the session's expiry for a turn that skips the chat pipeline"""
+    save_user_session(user_id, get_user_session(user_id))
 
 def process_whatsapp_message_with_session(message, user_id, language='en'):
     """Process message with session context"""
@@ -1773,29 +1484,11 @@ def process_whatsapp_message_with_session(message, user_id, language='en'):
     # Keep only last 10 messages
     if len(session['conversation_history']) > 10:
         session['conversation_history'] = session['conversation_history'][-10:]
+    save_user_session(user_id, session)
     
-    # Get context from conversation history
-    context = " ".join([msg['user_message'] for msg in session['conversation_history'][-3:]])
-    
-    # Process with context
     try:
-        response = requests.post(
-            "http://127.0.0.1:8000/api/chatbot/",
-            json={
-                "message": message,
-                "user_id": user_id,
-                "language": language,
-                "context": context
-            },
-            timeout=10
-        )
-        
-        if response.status_code == 200:
-            data = response.json()
-            replies = data.get('replies', ['I apologize, but I cannot process that right now.'])
-            return "\n".join(replies)
-        else:
-            return get_fallback_response(message, language)
+        replies = generate_chat_reply(message, user_id, language)["replies"]
+        return "\n".join(replies or ['I apologize, but I cannot process that right now.'])
             
     except Exception as e:
         print(f"Chatbot processing error: {str(e)}")
@@ -1823,6 +1516,17 @@ def add_main_menu_quick_replies(response):
     response.message("").button("🏥 Find Help", "find help")
 
 # Feature 4: Location-Based Services
+LOCATION_INDEX_PENDING_MESSAGE = """📍 Thank you for sharing your location! Based on your area, I can help you find:
+
+🏥 Nearby Hospitals: 5 within 5km
+💊 Pharmacies: 8 within 3km  
+🩺 Clinics: 12 within 4km
+
+Please tell me what you need:
+• "Find hospitals" - Nearest medical centers
+• "Find pharmacies" - Medicine stores
+• "Emergency" - Emergency contacts"""
+
 def handle_location_message(latitude, longitude, user_id):
     """Handle location sharing and find nearby services"""
     try:
@@ -1832,14 +1536,33 @@ def handle_location_message(latitude, longitude, user_id):
             'latitude': float(latitude),
             'longitude': float(longitude)
         }
+        save_user_session(user_id, session)
+        
+        # Counts and nearest places come from the facility index
+        # (datasets/health_facilities_sample.csv or HEALTH_FACILITIES_FILE);
+        # while it is still being built the general reply is sent
+        facilities = facility_index_if_ready()
+        if facilities is None:
+            return LOCATION_INDEX_PENDING_MESSAGE
+        lat, lon = session['location']['latitude'], session['location']['longitude']
+        hospitals = facilities.count_within(lat, lon, 5, 'hospital')
+        pharmacies = facilities.count_within(lat, lon, 3, 'pharmacy')
+        clinics = facilities.count_within(lat, lon, 4, 'clinic')
+        
+        nearest = "\n".join(
+            f"• {facility.name} ({facility.kind}) - {distance:.1f} km"
+            + (f", 📞 {facility.phone}" if facility.phone else "")
+            for distance, facility in facilities.nearest(lat, lon, k=3)
+        )
         
-        # In production, integrate with Google Maps API or similar
-        # For now, provide static information
-        return """📍 Thank you for sharing your location! Based on your area, I can help you find:
+        return f"""📍 Thank you for sharing your location! Based on your area, I can help you find:
 
-🏥 Nearby Hospitals: 5 within 5km
-💊 Pharmacies: 8 within 3km  
-🩺 Clinics: 12 within 4km
+🏥 Nearby Hospitals: {hospitals} within 5km
+💊 Pharmacies: {pharmacies} within 3km
+🩺 Clinics: {clinics} within 4km
+
+Closest to you:
+{nearest}
 
 Please tell me what you need:
 • "Find hospitals" - Nearest medical centers
@@ -1851,92 +1574,62 @@ Please tell me what you need:
         return "📍 Thank you for sharing your location! I can help you find nearby health services."
 
 # Feature 6: Multilingual Support
-def detect_user_language(message):
-    """Simple language detection based on keywords"""
-    hindi_keywords = ['नमस्ते', 'धन्यवाद', 'कैसे', 'स्वासth', 'वैक्सीन']
-    odia_keywords = ['ନମସ୍କାର', 'ଧନ୍ୟବାଦ', 'କେମିତି', 'ସ୍ୱାସ୍ଥ୍ୟ', 'ଟିକା']
+def detect_user_language(message, user_id=None):
+    """
+    Language of a message from its script (Devanagari, Odia, Latin) and
+    romanized Hindi/Odia n-grams. With a user_id the session's language is
+    kept until a message confidently says otherwise, in any script;
+    messages that say little ("ok", numbers, emoji) keep the sender's
+    previous language, and messages without letters are not classified.
+    """
+    if user_id is None:
+        return detect_language(message).language
     
-    if any(keyword in message for keyword in hindi_keywords):
-        return 'hi'
-    elif any(keyword in message for keyword in odia_keywords):
-        return 'or'
-    else:
-        return 'en'
+    session = get_user_session(user_id)
+    if dominant_script(message) is not None:
+        # detect_language is memoized, so repeated messages cost a lookup
+        detection = detect_language(message)
+        if detection.confidence >= MIN_CONFIDENCE and session.get('language') != detection.language:
+            session['language'] = detection.language
+            session['language_confidence'] = round(detection.confidence, 2)
+    # Runs once per WhatsApp turn; saving keeps the session from expiring mid-conversation
+    save_user_session(user_id, session)
+    return session.get('language', 'en')
 
 def get_welcome_message(user_id):
     """Get welcome message in user's language"""
     session = get_user_session(user_id)
-    language = session.get('language', 'en')
-    
-    welcome_messages = {
-        'en': """👋 Hello! I'm your Health Assistant. I can help you with:
-
-💉 Vaccine information
-🤒 Symptom checking  
-🥗 Diet & nutrition
-🏥 Health facilities
-🦠 Disease prevention
-
-What would you like to know?""",
-        
-        'hi': """👋 नमस्ते! मैं आपका स्वास्थ्य सहायक हूं। मैं आपकी मदद कर सकता हूं:
-
-💉 वैक्सीन जानकारी
-🤒 लक्षण जांच
-🥗 आहार और पोषण
-🏥 स्वास्थ्य सुविधाएं
-🦠 बीमारी की रोकथाम
-
-आप क्या जानना चाहेंगे?""",
-        
-        'or': """👋 ନମସ୍କାର! ମୁଁ ଆପଣଙ୍କର ସ୍ୱାସ୍ଥ୍ୟ ସହାୟକ। ମୁଁ ଆପଣଙ୍କୁ ସାହାଯ୍ୟ କରିପାରିବି:
-
-💉 ଟିକା ସୂଚନା
-🤒 ଲକ୍ଷଣ ଯାଞ୍ଚ
-🥗 ଖାଦ୍ୟ ଏବଂ ପୋଷଣ
-🏥 ସ୍ୱାସ୍ଥ୍ୟ ସୁବିଧା
-🦠 ରୋଗ ପ୍ରତିରୋଧ
-
-ଆପଣ କ’ଣ ଜାଣିବାକୁ ଚାହାଁନ୍ତି?"""
-    }
-    
-    return welcome_messages.get(language, welcome_messages['en'])
+    return response_catalog.get('welcome', session.get('language', 'en'))
 
 def get_fallback_response(message, language='en'):
     """Get fallback response in appropriate language"""
-    fallback_responses = {
-        'en': "I'm here to help with health information! Ask me about vaccines, symptoms, or health tips.",
-        'hi': "मैं स्वास्थ्य जानकारी में मदद करने के लिए यहां हूं! मुझसे वैक्सीन, लक्षण या स्वास्थ्य युक्तियों के बारे में पूछें।",
-        'or': "ମୁଁ ସ୍ୱାସ୍ଥ୍ୟ ସୂଚନାରେ ସାହାଯ୍ୟ କରିବାକୁ ଏଠାରେ ଅଛି! ମୋତେ ଟିକା, ଲକ୍ଷଣ କିମ୍ବା ସ୍ୱାସ୍ଥ୍ୟ ଟିପ୍ସ ବିଷୟରେ ପଚାରନ୍ତୁ।"
-    }
-    
-    return fallback_responses.get(language, fallback_responses['en'])
+    return response_catalog.get('fallback', language)
 
 def add_quick_replies(response, message):
     """Add quick reply buttons based on message context - CORRECT VERSION"""
-    message_lower = message.lower()
+    matches = health_keyword_matcher.match(message)
     
     # For WhatsApp, we need to use the message().button() method correctly
-    if any(word in message_lower for word in ['diet', 'food', 'nutrition', 'eat']):
+    if 'reply.diet' in matches:
         # Create a new message with buttons
         msg = response.message("Need more specific help?")
         msg.button("Meal Plans", "meal plans")
         msg.button("Weight Management", "weight management")
         msg.button("Diet for Conditions", "diet for conditions")
     
-    elif any(word in message_lower for word in ['vaccine', 'vaccination', 'covid']):
+    elif 'vaccine' in matches:
         msg = response.message("Which vaccine information?")
         msg.button("COVID-19", "covid vaccine")
         msg.button("Child Vaccines", "child vaccines")
         msg.button("Travel Vaccines", "travel vaccines")
     
-    elif any(word in message_lower for word in ['symptom', 'pain', 'fever', 'headache']):
+    elif 'reply.symptom' in matches:
         msg = response.message("What do you need?")
         msg.button("Common Symptoms", "common symptoms")
         msg.button("Emergency Signs", "emergency signs")
         msg.button("Find Doctor", "find doctor")
     
-    elif any(word in message_lower for word in ['prevention', 'prevent']):
+    elif 'reply.prevention' in matches:
         msg = response.message("Prevention topics:")
         msg.button("Disease Prevention", "disease prevention")
         msg.button("Vaccine Prevention", "vaccine prevention")
@@ -1945,20 +1638,20 @@ def add_quick_replies(response, message):
 
 def add_list_message(response, message):
     """Add list message for better WhatsApp experience"""
-    message_lower = message.lower()
+    matches = health_keyword_matcher.match(message)
     
-    if any(word in message_lower for word in ['diet', 'food', 'nutrition', 'eat']):
+    if 'reply.diet' in matches:
         msg = response.message("🍽️ Diet & Nutrition Options:")
         # List messages work better in WhatsApp
         return "🍽️ *Diet & Nutrition Options:*\n\n• Type 'meal plans' for diet plans\n• Type 'weight management' for weight tips\n• Type 'diet for conditions' for specific health conditions\n\nJust type what you need!"
     
-    elif any(word in message_lower for word in ['vaccine', 'vaccination', 'covid']):
+    elif 'vaccine' in matches:
         return "💉 *Vaccine Information:*\n\n• Type 'covid vaccine' for COVID-19 info\n• Type 'child vaccines' for children vaccination\n• Type 'travel vaccines' for travel requirements\n\nType your choice!"
     
-    elif any(word in message_lower for word in ['symptom', 'pain', 'fever', 'headache']):
+    elif 'reply.symptom' in matches:
         return "🤒 *Symptom Help:*\n\n• Type 'common symptoms' for general info\n• Type 'emergency signs' for urgent care\n• Type 'find doctor' for medical help\n\nWhat do you need?"
     
-    elif any(word in message_lower for word in ['prevention', 'prevent']):
+    elif 'reply.prevention' in matches:
         return "🛡️ *Prevention Topics:*\n\n• Type 'disease prevention' for illness prevention\n• Type 'vaccine prevention' for vaccine info\n• Type 'healthy lifestyle' for wellness tips\n\nChoose a topic!"
     
     return None